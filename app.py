@@ -1,39 +1,156 @@
-from flask import Flask, render_template, request, jsonify
-import pandas as pd
-import numpy as np
+import startup
+
+with startup.REPORT.phase("import", "flask"):
+    from flask import Flask, Response, render_template, request, jsonify, send_file
+with startup.REPORT.phase("import", "numpy"):
+    import numpy as np
 import pickle
 import os
+import json
+
+# pandas (and through the model pickle, scikit-learn) is imported on first
+# use: serving from a mapped player store needs neither (see startup.py)
+with startup.REPORT.phase("import", "app modules"):
+    import http_caching
+    import metrics
+    from player_store import StoredScaler
+    from response_cache import ResponseCache
 
 app = Flask(__name__)
+metrics.instrument_app(app)
+# GET routes whose responses change only with the data/model files: ETag +
+# 304s + Cache-Control; JSON/text bodies over 1 KB are gzip/brotli-compressed
+http_caching.install(app, lambda: data_version, routes=[
+    '/search_suggestions',
+    '/get_cluster_info/<float:cluster>',
+])
 
 # Global variables for your data and models
 final_df_transform = None
 models_by_cluster = None
 
+# Memory-mapped PlayerStore when running under serve.py (pre-fork workers)
+player_store = None
+
+# Content hashes of the loaded data/models; part of the response cache keys so
+# a reload with new files never serves stale predictions
+data_version = None
+model_version = None
+player_cache = ResponseCache("predict_player", maxsize=4096, ttl=600)
+manual_cache = ResponseCache("predict_manual", maxsize=4096, ttl=600)
+
+# Model versions scored side by side (the primary is models_by_cluster) and the
+# shadow scorer comparing live /predict_player results with the first candidate.
+# Candidates come from NCAAB_CANDIDATE_MODELS (comma-separated pickle paths);
+# the registry (and pandas with it) is only created when there are any.
+CANDIDATE_ENV = "NCAAB_CANDIDATE_MODELS"
+registry = None
+shadow = None
+
+# Class-year (Player_Encoded) probability adjustment applied to cluster 1.0
+CLASS_YEAR_ADJUSTMENT = {1: 0.07, 2: -0.04, 3: -0.09, 4: -0.13}
+# Largest grid /predict_sweep will evaluate in one request
+SWEEP_MAX_POINTS = 40000
+
+# Finished /export_rankings downloads, kept for Range/resume requests
+EXPORT_DIR = 'export_cache'
+EXPORT_CACHE_FILES = 32
+
+# NFL point-differential model and its per-(season, week, team) feature table
+NFL_MODEL_PATH = 'nfl_point_diff.cbm'
+NFL_FEATURES_PATH = 'nfl_team_week_features.csv'
+nfl_model = None
+nfl_team_index = None
+
 def load_data():
     """Load your exported data and models"""
-    global final_df_transform, models_by_cluster
+    global final_df_transform, models_by_cluster, data_version, model_version
     
     try:
         # Load your dataframe
-        final_df_transform = pd.read_csv('final_df_transform.csv')
+        pd = startup.lazy_import("pandas")
+        with startup.REPORT.phase("load", "final_df_transform"), metrics.timed_load("final_df_transform"):
+            final_df_transform = pd.read_csv('final_df_transform.csv')
         print(f"Loaded {len(final_df_transform)} players")
         
         # Load your models
-        with open('models_by_cluster.pkl', 'rb') as f:
-            models_by_cluster = pickle.load(f)
+        with startup.REPORT.phase("load", "models_by_cluster"), metrics.timed_load("models_by_cluster"):
+            with open('models_by_cluster.pkl', 'rb') as f:
+                models_by_cluster = pickle.load(f)
+        model_version = metrics.artifact_version('models_by_cluster.pkl')
+        data_version = f"{metrics.artifact_version('final_df_transform.csv')}-{model_version}"
+        metrics.set_model_version("models_by_cluster", model_version)
         print(f"Loaded models for clusters: {list(models_by_cluster.keys())}")
+        startup.REPORT.mark_ready()
+        load_candidates()
         
         return True
     except Exception as e:
         print(f"Error loading data: {e}")
         return False
 
+def attach_store(store):
+    """Serve from a player_store.PlayerStore instead of the CSV/pickle globals"""
+    global player_store, models_by_cluster, data_version, model_version
+    player_store = store
+    models_by_cluster = store.models
+    model_version = store.meta.get("version") or "unknown"
+    data_version = store.meta.get("data_version") or model_version
+    metrics.set_model_version("models_by_cluster", model_version)
+    startup.REPORT.mark_ready()
+    load_candidates()
+
+def ensure_data():
+    """Reuse the players/models already in memory (counted as hits), loading them on first use"""
+    if player_store is not None:
+        metrics.ARTIFACT_LOADS.inc("player_store", "hit")
+        return True
+    if final_df_transform is not None:
+        metrics.ARTIFACT_LOADS.inc("final_df_transform", "hit")
+        metrics.ARTIFACT_LOADS.inc("models_by_cluster", "hit")
+        return True
+    return load_data()
+
+def load_candidates(paths=None):
+    """Register candidate model pickles next to the primary and shadow live traffic against the first"""
+    global registry, shadow
+    if paths is None:
+        paths = [p for p in os.environ.get(CANDIDATE_ENV, "").split(",") if p.strip()]
+    if not paths or models_by_cluster is None:
+        return []
+    try:
+        import model_registry
+
+        if registry is None:
+            registry = model_registry.ModelRegistry()
+        if registry.primary != model_version:
+            registry.add(models_by_cluster, model_version, primary=True)
+        versions = [registry.load(p.strip()) for p in paths]
+        if shadow is None or (shadow.version, shadow.data_version) != (versions[0], data_version):
+            df = export_frame()
+            if shadow is not None:
+                shadow.stop()
+            shadow = model_registry.ShadowScorer.from_scores(
+                df, registry.score_table(df, data_version), versions[0], data_version=data_version)
+            print(f"Shadow-scoring /predict_player against candidate {versions[0]}")
+        return versions
+    except Exception as e:
+        print(f"Error loading candidate models: {e}")
+        return []
+
 # Your exact prediction functions from the notebook
 def show_clustered_player_prediction(player_name):
+    if player_store is not None:
+        result = player_store.player_prediction(player_name)
+        if result is None:
+            metrics.PLAYER_MISSES.inc()
+            return {"error": f"Player '{player_name}' not found."}
+        return result
+
     row = final_df_transform[final_df_transform["Name"] == player_name]
 
     if row.empty:
+        metrics.PLAYER_MISSES.inc()
         return {"error": f"Player '{player_name}' not found."}
 
     cluster = row["PlayStyleCluster"].iloc[0]
@@ -65,6 +182,17 @@ def show_clustered_player_prediction(player_name):
         "year": row["Year"].iloc[0] if "Year" in row.columns else ""
     }
 
+def scaler_input(scaler, X, features):
+    """
+    Rows to pass to a cluster's scaler.transform: the scikit-learn scalers were
+    fitted on named columns (a bare array warns), the store's StoredScaler
+    takes the array as is and needs no pandas.
+    """
+    if isinstance(scaler, StoredScaler):
+        return X
+    pd = startup.lazy_import("pandas")
+    return pd.DataFrame(X, columns=features)
+
 def explain_manual_prediction(cluster, raw_inputs):
     if cluster not in models_by_cluster:
         return {"error": f"No model found for cluster {cluster}"}
@@ -75,18 +203,17 @@ def explain_manual_prediction(cluster, raw_inputs):
     avg_coefs = model_data["avg_coefs"]
 
     # Build input vector
-    input_vector = {feat: raw_inputs.get(feat, 0.0) for feat in features}
-    df_input = pd.DataFrame([input_vector])
+    raw_values = np.array([[raw_inputs.get(feat, 0.0) for feat in features]], dtype=float)
 
     # Scale input and compute prediction
-    X_scaled = scaler.transform(df_input)[0]
+    X_scaled = scaler.transform(scaler_input(scaler, raw_values, features))[0]
     contributions = X_scaled * avg_coefs
     logit = np.sum(contributions)
     prob = 1 / (1 + np.exp(-logit))
 
     # Feature breakdown
     feature_breakdown = []
-    for feat, raw_val, scaled_val, coef, contrib in zip(features, df_input.iloc[0], X_scaled, avg_coefs, contributions):
+    for feat, raw_val, scaled_val, coef, contrib in zip(features, raw_values[0], X_scaled, avg_coefs, contributions):
         feature_breakdown.append({
             "feature": feat,
             "raw_value": float(raw_val),
@@ -106,8 +233,7 @@ def explain_manual_prediction(cluster, raw_inputs):
     # Apply class year adjustment for cluster 1.0
     if cluster == 1.0 and "Player_Encoded" in raw_inputs:
         player_encoded = raw_inputs["Player_Encoded"]
-        adjustment_map = {1: 0.07, 2: -0.04, 3: -0.09, 4: -0.13}
-        adjustment = adjustment_map.get(player_encoded, 0.0)
+        adjustment = CLASS_YEAR_ADJUSTMENT.get(player_encoded, 0.0)
         
         if prob > 0.9 and adjustment > 0:
             adjusted_prob = prob
@@ -119,9 +245,230 @@ def explain_manual_prediction(cluster, raw_inputs):
 
     return result
 
+def nfl_model_version():
+    """model_key from the export sidecar (nfl_training.export_model), else a content hash"""
+    try:
+        with open(f"{NFL_MODEL_PATH}.json") as f:
+            return json.load(f)["model_key"]
+    except (OSError, ValueError, KeyError):
+        return metrics.artifact_version(NFL_MODEL_PATH)
+
+def sweep_values(spec):
+    """Grid values for one swept feature, from "values" or "min"/"max"/"steps" """
+    if "values" in spec:
+        return np.asarray(spec["values"], dtype=float)
+    return np.linspace(float(spec["min"]), float(spec["max"]), int(spec.get("steps", 25)))
+
+def manual_sweep(cluster, raw_inputs, sweeps):
+    """
+    What-if grid around a manual input: vary one or two features over value
+    ranges, holding the rest at raw_inputs, and score every grid point in one
+    scaler.transform + matrix product.
+
+    sweeps: [{"feature": name, "values": [...]}] or
+            [{"feature": name, "min": lo, "max": hi, "steps": n}], one or two entries.
+
+    Returns probability (and, for cluster 1.0 with a class year, the
+    class-year adjusted probability) as a list for one feature or a
+    len(values_1) x len(values_2) nested list for two, matching
+    explain_manual_prediction() at every point.
+    """
+    if cluster not in models_by_cluster:
+        return {"error": f"No model found for cluster {cluster}"}
+    if not 1 <= len(sweeps) <= 2:
+        return {"error": "Sweep one or two features"}
+
+    model_data = models_by_cluster[cluster]
+    features = model_data["features"]
+    scaler = model_data["scaler"]
+    avg_coefs = model_data["avg_coefs"]
+
+    axes = []
+    for spec in sweeps:
+        feature = spec.get("feature")
+        if feature not in features:
+            return {"error": f"'{feature}' is not a feature of cluster {cluster}"}
+        try:
+            values = sweep_values(spec)
+        except (KeyError, TypeError, ValueError):
+            return {"error": f"Sweep for '{feature}' needs values, or min/max/steps"}
+        axes.append((feature, values))
+    if len(axes) == 2 and axes[0][0] == axes[1][0]:
+        return {"error": "Sweep two different features"}
+    shape = tuple(len(values) for _, values in axes)
+    if int(np.prod(shape)) > SWEEP_MAX_POINTS:
+        return {"error": f"Sweep grid is limited to {SWEEP_MAX_POINTS} points"}
+
+    # One row per grid point: the base input with the swept columns replaced
+    base = np.array([raw_inputs.get(feat, 0.0) for feat in features], dtype=float)
+    X = np.tile(base, (int(np.prod(shape)), 1))
+    grids = np.meshgrid(*[values for _, values in axes], indexing="ij")
+    for (feature, _), grid in zip(axes, grids):
+        X[:, features.index(feature)] = grid.ravel()
+
+    X_scaled = scaler.transform(scaler_input(scaler, X, features))
+    logit = X_scaled @ avg_coefs
+    prob = 1 / (1 + np.exp(-logit))
+
+    result = {
+        "cluster": cluster,
+        "features": [feature for feature, _ in axes],
+        "values": [values.tolist() for _, values in axes],
+        "probability": prob.reshape(shape).tolist(),
+        "success": True
+    }
+
+    # Same class-year adjustment as explain_manual_prediction, per grid point
+    swept = [feature for feature, _ in axes]
+    if cluster == 1.0 and ("Player_Encoded" in raw_inputs or "Player_Encoded" in swept):
+        encoded = X[:, features.index("Player_Encoded")] if "Player_Encoded" in features \
+            else np.full(len(X), raw_inputs["Player_Encoded"])
+        adjustment = np.zeros(len(X))
+        for year, value in CLASS_YEAR_ADJUSTMENT.items():
+            adjustment[encoded == year] = value
+        adjusted = np.where((prob > 0.9) & (adjustment > 0), prob, np.clip(prob + adjustment, 0.0, 1.0))
+        result["adjusted_probability"] = adjusted.reshape(shape).tolist()
+
+    return result
+
+def _is_success(result):
+    return "error" not in result
+
+def cached_player_prediction(player_name):
+    """show_clustered_player_prediction() through the (name, data version) cache"""
+    result = player_cache.get_or_compute(
+        (player_name, data_version),
+        lambda: show_clustered_player_prediction(player_name),
+        cacheable=_is_success,
+    )
+    if shadow is not None:
+        shadow.submit(player_name, result)
+    return result
+
+def manual_cache_key(cluster, raw_inputs):
+    """(cluster, model inputs, model version); inputs the model ignores don't split the cache"""
+    if models_by_cluster is None or cluster not in models_by_cluster:
+        return (cluster, None, model_version)
+    values = tuple(float(raw_inputs.get(feat, 0.0)) for feat in models_by_cluster[cluster]["features"])
+    # Only cluster 1.0 reads Player_Encoded beyond its features (class-year adjustment)
+    encoded = raw_inputs.get("Player_Encoded") if cluster == 1.0 else None
+    return (cluster, values, encoded, model_version)
+
+def cached_manual_prediction(cluster, raw_inputs):
+    """explain_manual_prediction() through the (cluster, inputs, model version) cache"""
+    return manual_cache.get_or_compute(
+        manual_cache_key(cluster, raw_inputs),
+        lambda: explain_manual_prediction(cluster, raw_inputs),
+        cacheable=_is_success,
+    )
+
+def load_nfl_model():
+    """Load the exported CatBoost model and team-week feature table once"""
+    global nfl_model, nfl_team_index
+
+    if nfl_model is not None:
+        metrics.ARTIFACT_LOADS.inc("nfl_model", "hit")
+        return True
+
+    try:
+        from catboost import CatBoostRegressor
+
+        with metrics.timed_load("nfl_model"):
+            model = CatBoostRegressor()
+            model.load_model(NFL_MODEL_PATH, format="cbm")
+        metrics.set_model_version("nfl_model", nfl_model_version())
+
+        # Index the table by (season, team) -> sorted weeks + feature rows so a
+        # game lookup is a dict hit plus a binary search
+        pd = startup.lazy_import("pandas")
+        with metrics.timed_load("nfl_team_week_features"):
+            table = pd.read_csv(NFL_FEATURES_PATH)
+        value_cols = [c for c in table.columns if c not in ("season", "week", "team")]
+        index = {}
+        for (season, team), group in table.groupby(["season", "team"], sort=False):
+            group = group.sort_values("week")
+            index[(int(season), team)] = (
+                group["week"].to_numpy(dtype=int),
+                group[value_cols].to_numpy(dtype=float),
+            )
+
+        nfl_team_index = {"columns": value_cols, "rows": index}
+        nfl_model = model
+        print(f"Loaded NFL model with {len(index)} team-seasons of features")
+        return True
+    except Exception as e:
+        print(f"Error loading NFL model: {e}")
+        return False
+
+def parse_game_id(game_id):
+    """'2024_01_ARI_BUF' -> (2024, 1, away 'ARI', home 'BUF')"""
+    season, week, away, home = game_id.split('_')
+    return int(season), int(week), away, home
+
+def _team_week_row(season, week, team):
+    """Latest feature row for a team at or before the given week"""
+    entry = nfl_team_index["rows"].get((season, team))
+    if entry is None:
+        return None
+    weeks, values = entry
+    pos = np.searchsorted(weeks, week, side='right') - 1
+    if pos < 0:
+        return None
+    return values[pos]
+
+def predict_nfl_games(matchups):
+    """
+    Predict home point differential for a batch of matchups in one model call.
+
+    matchups: list of dicts with season, week, home_team, away_team (and
+    optionally game_id). Unknown teams/weeks get an error entry instead.
+    """
+    from nfl_features import matchup_features
+
+    columns = nfl_team_index["columns"]
+    results = [None] * len(matchups)
+    home_rows, away_rows, weeks, ok = [], [], [], []
+
+    for i, game in enumerate(matchups):
+        home = _team_week_row(game["season"], game["week"], game["home_team"])
+        away = _team_week_row(game["season"], game["week"], game["away_team"])
+        if home is None or away is None:
+            missing = game["home_team"] if home is None else game["away_team"]
+            results[i] = {**game, "success": False,
+                          "error": f"No features for {missing} in {game['season']} week {game['week']}"}
+            continue
+        home_rows.append(home)
+        away_rows.append(away)
+        weeks.append(game["week"])
+        ok.append(i)
+
+    if ok:
+        pd = startup.lazy_import("pandas")
+        home_df = pd.DataFrame(home_rows, columns=columns)
+        away_df = pd.DataFrame(away_rows, columns=columns)
+        features = matchup_features(home_df, away_df, weeks)
+
+        feature_names = nfl_model.feature_names_
+        missing = [f for f in feature_names if f not in features.columns]
+        if missing:
+            # Never let the model predict from NaN-filled columns
+            error = f"Feature table lacks model features: {', '.join(missing)}"
+            for i in ok:
+                results[i] = {**matchups[i], "success": False, "error": error}
+            return results
+        X = features[feature_names].copy()
+        if "is_playoff" in X.columns:
+            X["is_playoff"] = X["is_playoff"].astype(int)
+        preds = nfl_model.predict(X)
+
+        for i, pred in zip(ok, preds):
+            results[i] = {**matchups[i], "pred_point_diff": float(pred), "success": True}
+
+    return results
+
 @app.route('/')
 def index():
-    if not load_data():
+    if not ensure_data():
         return "Error: Could not load data. Make sure to export your models first."
     return """
     <!DOCTYPE html>
@@ -153,6 +500,13 @@ def index():
     </html>
     """
 
+@app.route('/readyz')
+def readyz():
+    """Readiness probe: 200 with the startup report once predictions can be served, else 503"""
+    ready = player_store is not None or models_by_cluster is not None or load_data()
+    return jsonify({"ready": bool(ready), "data_version": data_version,
+                    "startup": startup.REPORT.as_dict()}), 200 if ready else 503
+
 @app.route('/predict_player', methods=['POST'])
 def predict_player():
     data = request.json
@@ -161,7 +515,7 @@ def predict_player():
     if not player_name:
         return jsonify({"success": False, "error": "Player name required"})
     
-    result = show_clustered_player_prediction(player_name)
+    result = cached_player_prediction(player_name)
     return jsonify(result)
 
 @app.route('/predict_manual', methods=['POST'])
@@ -178,13 +532,38 @@ def predict_manual():
             except:
                 raw_inputs[key] = 0.0
     
-    result = explain_manual_prediction(cluster, raw_inputs)
+    result = cached_manual_prediction(cluster, raw_inputs)
     return jsonify(result)
 
+@app.route('/predict_sweep', methods=['POST'])
+def predict_sweep():
+    data = request.json or {}
+    try:
+        cluster = float(data.get('cluster', 1.0))
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "cluster must be a number"})
+
+    # Base inputs: {"inputs": {...}}, converted like /predict_manual
+    raw_inputs = {}
+    for key, value in (data.get('inputs') or {}).items():
+        try:
+            raw_inputs[key] = float(value)
+        except (TypeError, ValueError):
+            raw_inputs[key] = 0.0
+
+    sweeps = data.get('sweep') or []
+    if isinstance(sweeps, dict):
+        sweeps = [sweeps]
+    return jsonify(manual_sweep(cluster, raw_inputs, sweeps))
+
 @app.route('/search_suggestions')
 def search_suggestions():
     query = request.args.get('q', '')
-    if len(query) < 2 or final_df_transform is None:
+    if len(query) < 2:
+        return jsonify([])
+    if player_store is not None:
+        return jsonify(player_store.suggestions(query))
+    if final_df_transform is None:
         return jsonify([])
     
     matches = final_df_transform[
@@ -192,6 +571,144 @@ def search_suggestions():
     ]["Name"].head(10).tolist()
     return jsonify(matches)
 
+def export_frame():
+    """Player frame for exports; under serve.py the store has no feature columns, so read the CSV"""
+    global final_df_transform
+    if final_df_transform is not None:
+        metrics.ARTIFACT_LOADS.inc("final_df_transform", "hit")
+    else:
+        if player_store is None:
+            load_data()
+        else:
+            pd = startup.lazy_import("pandas")
+            with metrics.timed_load("final_df_transform"):
+                final_df_transform = pd.read_csv('final_df_transform.csv')
+    return final_df_transform
+
+@app.route('/export_rankings')
+def export_rankings():
+    """
+    Every scored player with rank/percentile, streamed as CSV, NDJSON or Arrow.
+
+    ?format=csv|ndjson|arrow&years=2019-2025&clusters=0,2&picks=1-14&contributions=1&compress=gzip|br
+
+    The first request streams while spooling to EXPORT_DIR; once complete the
+    file is served with Range/If-Range support, so interrupted downloads resume.
+    """
+    import rankings_export
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in rankings_export.FORMATS:
+        return jsonify({"success": False, "error": f"format must be one of {', '.join(rankings_export.FORMATS)}"}), 400
+    compression = request.args.get('compress') or None
+    if compression not in (None, *rankings_export.COMPRESSIONS):
+        return jsonify({"success": False,
+                        "error": f"compress must be one of {', '.join(rankings_export.COMPRESSIONS)}"}), 400
+    try:
+        query = {
+            "years": rankings_export.parse_years(request.args.get('years')),
+            "clusters": rankings_export.parse_clusters(request.args.get('clusters')),
+            "picks": rankings_export.parse_span(request.args.get('picks'), "picks"),
+            "contributions": request.args.get('contributions', '').lower() in ('1', 'true', 'yes'),
+        }
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    df = export_frame()
+    if df is None or models_by_cluster is None:
+        return jsonify({"success": False, "error": "Data not loaded"}), 503
+
+    media_type, ext = rankings_export.output_type(fmt, compression)
+    key = rankings_export.export_key({**query, "format": fmt, "compress": compression}, data_version)
+    path = os.path.join(EXPORT_DIR, f"rankings-{key}.{ext}")
+    download_name = f"rankings.{ext}"
+
+    if not os.path.exists(path):
+        try:
+            export = rankings_export.RankingsExport(df, models_by_cluster, **query)
+            parts = rankings_export.spool(rankings_export.encode(export, fmt, compression), path)
+        except ImportError as e:
+            return jsonify({"success": False, "error": str(e)}), 501
+        if request.range is None:
+            # Stream straight through; the spool file backs later resumes
+            rankings_export.prune_spool(EXPORT_DIR, EXPORT_CACHE_FILES)
+            response = Response(parts, mimetype=media_type)
+            response.headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+            response.headers["Accept-Ranges"] = "bytes"
+            response.set_etag(key)
+            return response
+        # A resume for an export that is no longer spooled: rebuild it, then serve the range
+        for _ in parts:
+            pass
+
+    os.utime(path)
+    return send_file(os.path.abspath(path), mimetype=media_type, as_attachment=True,
+                     download_name=download_name, conditional=True, etag=key)
+
+@app.route('/models')
+def list_models():
+    if registry is None:
+        return jsonify({"primary": model_version, "versions": []})
+    return jsonify({"primary": registry.primary or model_version, "versions": registry.describe()})
+
+@app.route('/model_comparison')
+def model_comparison():
+    """Per-cluster probability deltas and rank shifts: ?candidate=<version>&base=<version>&years=2019-2025&top=10"""
+    if registry is None:
+        return jsonify({"success": False, "error": "No candidate models registered"})
+    candidate = request.args.get('candidate') or (registry.candidates[0] if registry.candidates else None)
+    if candidate is None:
+        return jsonify({"success": False, "error": "No candidate models registered"})
+    import rankings_export
+
+    try:
+        years = rankings_export.parse_years(request.args.get('years'))
+        top = int(request.args.get('top', 10))
+        df = export_frame()
+        report = registry.compare(df, candidate, request.args.get('base'), years=years, top=top,
+                                  data_key=data_version)
+    except (KeyError, ValueError) as e:
+        return jsonify({"success": False, "error": e.args[0] if e.args else str(e)})
+    return jsonify({"success": True, **report})
+
+@app.route('/shadow_report')
+def shadow_report():
+    if shadow is None:
+        return jsonify({"success": False, "error": "Shadow scoring is off (set NCAAB_CANDIDATE_MODELS)"})
+    return jsonify({"success": True, "primary": model_version, **shadow.report()})
+
+@app.route('/predict_game', methods=['POST'])
+def predict_game():
+    if not load_nfl_model():
+        return jsonify({"success": False, "error": "NFL model not available"})
+
+    data = request.json or {}
+    matchups = []
+
+    # Scheduled games by id: {"game_ids": ["2024_01_ARI_BUF", ...]} or {"game_id": "..."}
+    game_ids = data.get('game_ids') or ([data['game_id']] if data.get('game_id') else [])
+    for game_id in game_ids:
+        try:
+            season, week, away, home = parse_game_id(game_id)
+        except ValueError:
+            return jsonify({"success": False, "error": f"Invalid game_id '{game_id}'"})
+        matchups.append({"game_id": game_id, "season": season, "week": week,
+                         "home_team": home, "away_team": away})
+
+    # Hypothetical matchups: {"games": [{"home_team", "away_team", "season", "week"}, ...]}
+    for game in data.get('games', []):
+        try:
+            matchups.append({"season": int(game['season']), "week": int(game['week']),
+                             "home_team": str(game['home_team']).upper(),
+                             "away_team": str(game['away_team']).upper()})
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"success": False, "error": "Each game needs home_team, away_team, season and week"})
+
+    if not matchups:
+        return jsonify({"success": False, "error": "game_id(s) or games required"})
+
+    return jsonify({"success": True, "predictions": predict_nfl_games(matchups)})
+
 @app.route('/get_cluster_info/<float:cluster>')
 def get_cluster_info(cluster):
     if models_by_cluster is None or cluster not in models_by_cluster:
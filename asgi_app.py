@@ -0,0 +1,315 @@
+"""
+Async (ASGI) variant of the app.py prediction API, on Starlette.
+
+Same routes and JSON shapes as app.py:
+  POST /predict_player             {"player_name": ...} or {"player_names": [...]} (batch)
+  POST /predict_manual             {"cluster": ..., <feature>: <value>, ...}
+  POST /predict_sweep              {"cluster": ..., "inputs": {...}, "sweep": [...]}
+  GET  /search_suggestions?q=...
+  GET  /get_cluster_info/<cluster>
+  GET  /readyz                     readiness, with the startup report (startup.py)
+  GET  /metrics
+
+Autocomplete and cluster info carry ETag/Cache-Control (304 on a matching
+If-None-Match, as in app.py); responses over 1 KB are gzip-compressed.
+
+The data is loaded once at startup into a player_store.PlayerStore (the
+shared one for the current data version when it exists, see serve.load_store), so
+autocomplete and cluster lookups are cheap enough to answer on the event
+loop; no thread is held per connection. Scoring (single and batch player
+predictions, manual predictions) runs on a bounded thread pool:
+
+  NCAAB_SCORING_THREADS   pool size (default: CPU count, at most 8)
+  NCAAB_MAX_PENDING       scoring jobs allowed to queue beyond that; when full,
+                          requests get 503 + Retry-After instead of piling up
+  NCAAB_REQUEST_TIMEOUT   seconds per request, including reading the body;
+                          slower requests get 504
+  NCAAB_MAX_BATCH         names per batch request (default 1000)
+  NCAAB_STORE             existing store directory to map instead of building one
+
+Usage:
+    uvicorn asgi_app:app --port 8080 --limit-concurrency 10000
+    python asgi_app.py
+"""
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse as _JSONResponse, Response
+from starlette.routing import Route
+
+import app as flask_app
+import http_caching
+import metrics
+import startup
+from player_store import PlayerStore
+from serve import load_store
+
+SCORING_THREADS = int(os.environ.get("NCAAB_SCORING_THREADS", min(8, os.cpu_count() or 1)))
+MAX_PENDING = int(os.environ.get("NCAAB_MAX_PENDING", 64))
+REQUEST_TIMEOUT = float(os.environ.get("NCAAB_REQUEST_TIMEOUT", 10))
+MAX_BATCH = int(os.environ.get("NCAAB_MAX_BATCH", 1000))
+
+
+class JSONResponse(_JSONResponse):
+    """JSON via http_caching.dumps (orjson when installed, numpy-aware)"""
+
+    def render(self, content):
+        return http_caching.dumps(content)
+
+
+class Overloaded(Exception):
+    pass
+
+
+class BoundedExecutor:
+    """
+    Thread pool that refuses work instead of queueing without limit.
+
+    A slot is held until the job actually finishes, even if the request that
+    submitted it timed out, so the limit reflects real pool load.
+    """
+
+    def __init__(self, workers, max_pending):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scoring")
+        self.capacity = workers + max_pending
+        self.in_use = 0
+
+    def _release(self, _):
+        self.in_use -= 1
+
+    async def run(self, fn, *args):
+        # Only touched from the event loop thread, so no lock is needed
+        if self.in_use >= self.capacity:
+            raise Overloaded()
+        self.in_use += 1
+        future = asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.shield(future)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+executor = None
+
+
+def _error(message, status=200, **headers):
+    return JSONResponse({"success": False, "error": message}, status_code=status, headers=headers or None)
+
+
+def guarded(handler):
+    """Apply the request timeout and turn overload into 503"""
+    @functools.wraps(handler)
+    async def wrapper(request):
+        try:
+            return await asyncio.wait_for(handler(request), REQUEST_TIMEOUT)
+        except asyncio.TimeoutError:
+            return _error("Request timed out", 504)
+        except Overloaded:
+            return _error("Server busy, retry shortly", 503, **{"Retry-After": "1"})
+    return wrapper
+
+
+async def _json_body(request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+# ======================
+# Routes
+# ======================
+
+def _predict_players(names):
+    return [flask_app.cached_player_prediction(name) for name in names]
+
+
+@guarded
+async def predict_player(request):
+    data = await _json_body(request) or {}
+
+    names = data.get("player_names")
+    if names is not None:
+        if not isinstance(names, list) or not names:
+            return _error("player_names must be a non-empty list")
+        if len(names) > MAX_BATCH:
+            return _error(f"At most {MAX_BATCH} names per request", 413)
+        names = [str(n).strip() for n in names]
+        return JSONResponse({"success": True, "predictions": await executor.run(_predict_players, names)})
+
+    player_name = str(data.get("player_name", "")).strip()
+    if not player_name:
+        return _error("Player name required")
+    return JSONResponse(await executor.run(flask_app.cached_player_prediction, player_name))
+
+
+@guarded
+async def predict_manual(request):
+    data = await _json_body(request) or {}
+    try:
+        cluster = float(data.get("cluster", 1.0))
+    except (TypeError, ValueError):
+        return _error("cluster must be a number")
+
+    raw_inputs = {}
+    for key, value in data.items():
+        if key != "cluster":
+            try:
+                raw_inputs[key] = float(value)
+            except (TypeError, ValueError):
+                raw_inputs[key] = 0.0
+
+    return JSONResponse(await executor.run(flask_app.cached_manual_prediction, cluster, raw_inputs))
+
+
+@guarded
+async def predict_sweep(request):
+    data = await _json_body(request) or {}
+    try:
+        cluster = float(data.get("cluster", 1.0))
+    except (TypeError, ValueError):
+        return _error("cluster must be a number")
+
+    raw_inputs = {}
+    for key, value in (data.get("inputs") or {}).items():
+        try:
+            raw_inputs[key] = float(value)
+        except (TypeError, ValueError):
+            raw_inputs[key] = 0.0
+
+    sweeps = data.get("sweep") or []
+    if isinstance(sweeps, dict):
+        sweeps = [sweeps]
+    return JSONResponse(await executor.run(flask_app.manual_sweep, cluster, raw_inputs, sweeps))
+
+
+def _cache_headers():
+    version = flask_app.data_version
+    headers = {"Cache-Control": http_caching.cache_control()}
+    if version is not None:
+        headers["ETag"] = http_caching.etag(version)
+    return headers
+
+
+def _not_modified(request):
+    """304 for a request that already has the current data version, else None"""
+    if http_caching.matches(request.headers.get("if-none-match"), flask_app.data_version):
+        return Response(status_code=304, headers=_cache_headers())
+    return None
+
+
+async def search_suggestions(request):
+    query = request.query_params.get("q", "")
+    if len(query) < 2 or flask_app.player_store is None:
+        return JSONResponse([])
+    return _not_modified(request) or JSONResponse(flask_app.player_store.suggestions(query),
+                                                  headers=_cache_headers())
+
+
+async def get_cluster_info(request):
+    cluster = request.path_params["cluster"]
+    models_by_cluster = flask_app.models_by_cluster
+    if models_by_cluster is None or cluster not in models_by_cluster:
+        return JSONResponse({"error": "Cluster not found"})
+    cached = _not_modified(request)
+    if cached is not None:
+        return cached
+
+    descriptions = {
+        0.0: "Big Men/Centers - High blocks and rebounds",
+        1.0: "Forwards - Balanced stats, good defense",
+        2.0: "Guards - High assists and three-point shooting"
+    }
+    return JSONResponse({
+        "cluster": cluster,
+        "description": descriptions.get(cluster, "Unknown"),
+        "features": models_by_cluster[cluster]["features"],
+    }, headers=_cache_headers())
+
+
+async def readyz(request):
+    ready = flask_app.player_store is not None
+    return JSONResponse({"ready": ready, "data_version": flask_app.data_version,
+                         "startup": startup.REPORT.as_dict()}, status_code=200 if ready else 503)
+
+
+async def metrics_endpoint(request):
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+# ======================
+# App
+# ======================
+
+class MetricsMiddleware:
+    """Per-route counts, latency and in-flight gauge, as metrics.instrument_app does for Flask"""
+
+    def __init__(self, asgi_app):
+        self.app = asgi_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        metrics.IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            metrics.LATENCY.observe(time.perf_counter() - start, route)
+            metrics.REQUESTS.inc(route, scope["method"], status[0])
+
+
+@asynccontextmanager
+async def lifespan(_):
+    global executor
+    store_dir = os.environ.get("NCAAB_STORE")
+    loop = asyncio.get_running_loop()
+    if store_dir:
+        with startup.REPORT.phase("load", "player store"):
+            store = PlayerStore(store_dir)
+    else:
+        store = await loop.run_in_executor(None, load_store)
+    flask_app.attach_store(store)
+    executor = BoundedExecutor(SCORING_THREADS, MAX_PENDING)
+    print(f"Serving {len(store)} players; {SCORING_THREADS} scoring threads, "
+          f"{MAX_PENDING} pending, {REQUEST_TIMEOUT:g}s timeout")
+    try:
+        yield
+    finally:
+        executor.shutdown()
+
+
+app = Starlette(routes=[
+    Route("/predict_player", predict_player, methods=["POST"]),
+    Route("/predict_manual", predict_manual, methods=["POST"]),
+    Route("/predict_sweep", predict_sweep, methods=["POST"]),
+    Route("/search_suggestions", search_suggestions),
+    Route("/get_cluster_info/{cluster:float}", get_cluster_info),
+    Route("/readyz", readyz),
+    Route("/metrics", metrics_endpoint),
+], lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=http_caching.COMPRESS_MIN_BYTES)
+app.add_middleware(MetricsMiddleware)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8080)
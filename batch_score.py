@@ -0,0 +1,242 @@
+"""
+Score a raw prospect CSV from the command line, in chunks, across processes.
+
+The input has the scraped/raw columns the notebook starts from (Name, Team,
+Year, Player class year, Pick, Height, Role, OR, DR, Stl, FT%, Usg, Ast, DBPM,
+Close 2 Raw). Each chunk goes through the notebook's feature steps,
+vectorized:
+
+  Height_in        "6-9" -> 81
+  REB              OR + DR
+  Player_Encoded   Fr/So/Jr/Sr -> 1-4
+  DraftValue       (1 - Pick/60) / Pick**0.1
+  close_makes      makes from "Close 2 Raw" ("m-a")
+  Usg/Ast          Usg / Ast
+  Log<x>           log1p(x) for every Log feature a model uses
+  PlayStyleCluster assign_cluster_by_role(): OR < 3.3 -> guards, DR >= 27 ->
+                   centers, else by Role, with guards 6'5"+ moved to wings
+
+Columns already in the input (e.g. final_df_transform.csv itself) are
+recomputed the same way, so rescoring the exported table reproduces it.
+Chunks are scored with score_players() on a process pool with a bounded
+number of chunks in flight, and results are appended to the output in input
+order with the score table's columns (player_store.SCORE_COLUMNS), so memory
+stays flat however large the input is.
+
+Usage:
+    python batch_score.py prospects.csv -o scores.csv
+    python batch_score.py big.csv -o scores.csv --workers 8 --chunk-size 200000
+"""
+import argparse
+import os
+import pickle
+import resource
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from player_scoring import score_players
+from player_store import SCORE_COLUMNS
+
+CHUNK_SIZE = 100_000
+CLASS_YEARS = {"Fr": 1, "So": 2, "Jr": 3, "Sr": 4}
+CENTER_ROLES = ["C", "PF/C"]
+WING_ROLES = ["Stretch 4", "Wing F"]
+RAW_COLUMNS = ["Name", "Team", "Year", "Player", "Pick", "Height", "Role", "OR", "DR", "Stl", "FT%",
+               "Usg", "Ast", "DBPM", "Close 2 Raw"]
+
+
+# ======================
+# Feature transforms
+# ======================
+
+def height_inches(height):
+    """'6-9' -> 81.0 (NaN if unparseable)"""
+    parts = height.astype(str).str.split("-", n=1, expand=True)
+    if parts.shape[1] < 2:
+        return pd.Series(np.nan, index=height.index)
+    return pd.to_numeric(parts[0], errors="coerce") * 12 + pd.to_numeric(parts[1], errors="coerce")
+
+
+def assign_clusters(role, height_in, offensive_rebounds, defensive_rebounds):
+    """Vectorized assign_cluster_by_role() from the notebook"""
+    role = role.astype(str).str.strip()
+    cluster = np.where(role.isin(CENTER_ROLES), 0.0, np.where(role.isin(WING_ROLES), 1.0, 2.0))
+    cluster = np.where((cluster == 2.0) & (height_in >= 77), 1.0, cluster)
+    # Rebounding overrides, lowest priority first
+    cluster = np.where(defensive_rebounds >= 27, 0.0, cluster)
+    cluster = np.where(offensive_rebounds < 3.3, 2.0, cluster)
+    return cluster
+
+
+def transform_prospects(raw, features):
+    """
+    Raw prospect rows -> model features and PlayStyleCluster.
+
+    Parameters:
+        raw (pd.DataFrame): Rows with (a subset of) RAW_COLUMNS.
+        features (list): Model feature columns to produce.
+
+    Returns:
+        pd.DataFrame: raw plus Height_in, REB, Player_Encoded, DraftValue,
+        close_makes, Usg/Ast, the Log features and PlayStyleCluster.
+    """
+    df = raw.copy()
+    cols = set(df.columns)
+
+    def num(col):
+        return pd.to_numeric(df[col], errors="coerce") if col in df.columns else pd.Series(np.nan, index=df.index)
+
+    # Each derived column only when its inputs are present
+    if "Height" in cols:
+        df["Height_in"] = height_inches(df["Height"])
+    if {"OR", "DR"} <= cols:
+        df["REB"] = num("OR") + num("DR")
+    if "Player" in cols:
+        df["Player_Encoded"] = df["Player"].astype(str).str.strip().map(CLASS_YEARS)
+    if "Pick" in cols:
+        pick = num("Pick")
+        df["DraftValue"] = (1 - pick / 60) * (1 / (pick ** 0.1))
+    if "Close 2 Raw" in cols:
+        df["close_makes"] = pd.to_numeric(df["Close 2 Raw"].astype(str).str.split("-").str[0], errors="coerce")
+    if {"Usg", "Ast"} <= cols:
+        df["Usg/Ast"] = num("Usg") / num("Ast")
+    for feature in features:
+        if feature.startswith("Log") and feature[3:] in df.columns:
+            df[feature] = np.log1p(num(feature[3:]))
+    role = df["Role"] if "Role" in cols else pd.Series("", index=df.index)
+    df["PlayStyleCluster"] = assign_clusters(role, num("Height_in"), num("OR"), num("DR"))
+    return df
+
+
+def model_features(models_by_cluster):
+    cols = []
+    for model_data in models_by_cluster.values():
+        cols.extend(f for f in model_data["features"] if f not in cols)
+    return cols
+
+
+# ======================
+# Scoring
+# ======================
+
+_models = None
+
+
+def _init_worker(models_by_cluster):
+    global _models
+    _models = models_by_cluster
+
+
+def score_chunk(raw, models_by_cluster=None):
+    """Score table rows (SCORE_COLUMNS) for one chunk of raw prospects"""
+    models = models_by_cluster if models_by_cluster is not None else _models
+    df = transform_prospects(raw, model_features(models))
+    out = pd.DataFrame({
+        "Name": df["Name"].to_numpy() if "Name" in df.columns else "",
+        "Team": df["Team"].to_numpy() if "Team" in df.columns else "",
+        "Year": df["Year"].to_numpy() if "Year" in df.columns else 0,
+        "PlayStyleCluster": df["PlayStyleCluster"].to_numpy(),
+        "Probability": score_players(df, models).to_numpy(),
+    })
+    return out[SCORE_COLUMNS]
+
+
+def read_chunks(path, chunk_size, features):
+    """Raw CSV in chunks, reading only the columns the transforms use"""
+    header = pd.read_csv(path, nrows=0).columns
+    # Log features are always recomputed from their base column
+    wanted = set(RAW_COLUMNS) | {f[3:] for f in features if f.startswith("Log")} | {
+        f for f in features if not f.startswith("Log")}
+    usecols = [c for c in header if c in wanted]
+    return pd.read_csv(path, usecols=usecols, chunksize=chunk_size)
+
+
+def score_file(path, models_by_cluster, out, workers=1, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Score every row of a raw CSV into out (a path), in input order.
+
+    At most 2 x workers chunks are read ahead of the writer, so memory is
+    bounded by chunk_size rather than the file size.
+
+    Returns:
+        dict: rows, seconds, rows_per_sec, peak RSS (MB) of this process and the workers
+    """
+    start = time.perf_counter()
+    chunks = read_chunks(path, chunk_size, model_features(models_by_cluster))
+    rows = 0
+    tmp = f"{out}.tmp"
+
+    with open(tmp, "w", newline="") as f:
+        def write(result):
+            nonlocal rows
+            result.to_csv(f, index=False, header=(rows == 0))
+            rows += len(result)
+            if progress:
+                progress(rows, time.perf_counter() - start)
+
+        if workers <= 1:
+            for raw in chunks:
+                write(score_chunk(raw, models_by_cluster))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(models_by_cluster,)) as pool:
+                pending = deque()
+                for raw in chunks:
+                    pending.append(pool.submit(score_chunk, raw))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+        if rows == 0:
+            f.write(",".join(SCORE_COLUMNS) + "\n")
+    os.replace(tmp, out)
+
+    seconds = time.perf_counter() - start
+    # ru_maxrss is KB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds else 0.0,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20,
+        "worker_peak_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 2**20,
+    }
+
+
+# ======================
+# CLI
+# ======================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a raw prospect CSV with the cluster models")
+    parser.add_argument("input", help="Raw prospect CSV")
+    parser.add_argument("-o", "--out", required=True, help="Output CSV (score table columns)")
+    parser.add_argument("--models", default="models_by_cluster.pkl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--quiet", action="store_true", help="No progress lines")
+    args = parser.parse_args(argv)
+
+    with open(args.models, "rb") as f:
+        models_by_cluster = pickle.load(f)
+
+    last = [0.0]
+
+    def progress(rows, seconds):
+        if seconds - last[0] >= 2:
+            last[0] = seconds
+            print(f"  {rows:,} rows, {rows / seconds:,.0f} rows/s", file=sys.stderr)
+
+    stats = score_file(args.input, models_by_cluster, args.out, workers=args.workers,
+                       chunk_size=args.chunk_size, progress=None if args.quiet else progress)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.1f}s ({stats['rows_per_sec']:,.0f} rows/s, "
+          f"{args.workers} workers) -> {args.out}; peak RSS {stats['peak_rss_mb']:.0f} MB "
+          f"(workers {stats['worker_peak_rss_mb']:.0f} MB)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Artifact load time (final_df_transform.csv + models_by_cluster.pkl) and batch CSV scoring"""
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from conftest import ARTIFACT_SIZES, ROOT
+from batch_score import score_file
+from synthetic import make_models, make_players, write_raw_prospects
+
+
+@pytest.fixture(scope="module", params=ARTIFACT_SIZES, ids=lambda n: f"size={n}")
+def artifacts(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp(f"artifacts_{request.param}")
+    df = make_players(request.param, wide=True)
+    df.to_csv(path / "final_df_transform.csv", index=False)
+    with open(path / "models_by_cluster.pkl", "wb") as f:
+        pickle.dump(make_models(df), f)
+    return path
+
+
+@pytest.mark.benchmark(group="load_artifacts")
+def bench_load_synthetic_artifacts(benchmark, artifacts):
+    def load():
+        df = pd.read_csv(artifacts / "final_df_transform.csv")
+        with open(artifacts / "models_by_cluster.pkl", "rb") as f:
+            models = pickle.load(f)
+        return df, models
+
+    df, models = benchmark(load)
+    assert len(models) == 3
+
+
+@pytest.mark.benchmark(group="load_artifacts")
+def bench_app_load_data(benchmark, monkeypatch):
+    """app.load_data() on the real artifacts shipped in the repo"""
+    import app
+
+    monkeypatch.chdir(ROOT)
+    assert benchmark(app.load_data)
+    assert os.path.exists(os.path.join(ROOT, "final_df_transform.csv"))
+
+
+@pytest.fixture(scope="module", params=ARTIFACT_SIZES, ids=lambda n: f"size={n}")
+def raw_prospects(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp(f"prospects_{request.param}") / "prospects.csv"
+    write_raw_prospects(path, request.param)
+    return request.param, path
+
+
+@pytest.mark.benchmark(group="batch_score")
+def bench_batch_score_file(benchmark, raw_prospects, tmp_path):
+    n, path = raw_prospects
+    models = make_models(make_players(1000))
+    stats = benchmark(score_file, path, models, tmp_path / "scores.csv", chunk_size=50_000)
+    assert stats["rows"] == n
@@ -0,0 +1,69 @@
+"""app.py hot paths: single-player prediction, manual prediction, name search, explanations"""
+import pytest
+
+from player_scoring import DriverIndex, explain_players, search_players
+
+
+def _pick_name(df):
+    # A player from the middle of the frame, so lookups scan about half of it
+    return df["Name"].iloc[len(df) // 2]
+
+
+@pytest.mark.benchmark(group="predict_player")
+def bench_show_clustered_player_prediction(benchmark, app_module, dataset):
+    _, df, _ = dataset
+    name = _pick_name(df)
+    result = benchmark(app_module.show_clustered_player_prediction, name)
+    assert result["success"]
+
+
+@pytest.mark.benchmark(group="predict_player")
+def bench_unknown_player(benchmark, app_module):
+    result = benchmark(app_module.show_clustered_player_prediction, "Nobody Atall")
+    assert "error" in result
+
+
+@pytest.mark.benchmark(group="predict_manual")
+def bench_explain_manual_prediction(benchmark, app_module):
+    inputs = {"LogUsg/Ast": 1.2, "DraftValue": 0.3, "LogREB": 3.1, "LogStl": 0.8,
+              "LogFT%": 0.55, "Player_Encoded": 2}
+    result = benchmark(app_module.explain_manual_prediction, 1.0, inputs)
+    assert len(result["feature_breakdown"]) == 6
+
+
+@pytest.mark.benchmark(group="search")
+def bench_search_suggestions_route(benchmark, app_module):
+    client = app_module.app.test_client()
+    response = benchmark(client.get, "/search_suggestions?q=jal")
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="search")
+def bench_search_suggestions_not_modified(benchmark, app_module):
+    # Repeat request from a client holding the current ETag: answered before the view runs
+    client = app_module.app.test_client()
+    etag = client.get("/search_suggestions?q=jal").headers["ETag"]
+    response = benchmark(client.get, "/search_suggestions?q=jal", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.benchmark(group="search")
+def bench_search_players(benchmark, dataset):
+    _, df, _ = dataset
+    matches = benchmark(search_players, df, "smith")
+    assert len(matches) > 0
+
+
+@pytest.mark.benchmark(group="explain")
+def bench_explain_players(benchmark, dataset):
+    _, df, models = dataset
+    contribs = benchmark(explain_players, df, models)
+    assert sum(len(c) for c in contribs.values()) > 0
+
+
+@pytest.mark.benchmark(group="explain")
+def bench_driven_by_query(benchmark, dataset):
+    _, df, models = dataset
+    index = DriverIndex(df, models, years=None)
+    top = benchmark(index.driven_by, "DraftValue", 20)
+    assert len(top) > 0
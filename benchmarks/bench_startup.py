@@ -0,0 +1,45 @@
+"""
+Cold start of app.py in a fresh interpreter (startup.py), against the startup budget.
+
+The fast path maps a prebuilt player store; it must finish within
+NCAAB_STARTUP_BUDGET (default 1s) without importing pandas or scikit-learn.
+"""
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+
+def cold_start(*args):
+    """startup.py's JSON report from a new process"""
+    out = subprocess.run([sys.executable, "startup.py", "--json", *args], cwd=ROOT,
+                         capture_output=True, text=True)
+    return out.returncode, json.loads(out.stdout)
+
+
+@pytest.fixture(scope="module")
+def store_dir(tmp_path_factory):
+    """A store for the shipped artifacts, built once like the first server start does"""
+    path = str(tmp_path_factory.mktemp("startup") / "store")
+    code, report = cold_start("--store-dir", path, "--budget", "1e9")
+    assert code == 0 and report["totals"]["index"] > 0
+    return path
+
+
+@pytest.mark.benchmark(group="startup")
+def bench_cold_start_from_store(benchmark, store_dir):
+    code, report = benchmark.pedantic(cold_start, args=("--store-dir", store_dir, "--forbid", "pandas,sklearn"),
+                                      rounds=5, iterations=1)
+    assert code == 0, report["problems"]
+    assert report["totals"]["index"] == 0 and report["heavy_modules"] == []
+
+
+@pytest.mark.benchmark(group="startup")
+def bench_cold_start_plain(benchmark):
+    """python app.py's path (CSV + pickle), for comparison; not held to the budget"""
+    code, report = benchmark.pedantic(cold_start, args=("--plain", "--budget", "1e9"), rounds=3, iterations=1)
+    assert code == 0 and report["ready"]
+    assert "sklearn" in report["heavy_modules"]
@@ -0,0 +1,57 @@
+"""Per-tab Streamlit computations (player_scoring)"""
+import pytest
+
+from model_registry import score_versions
+from player_scoring import (
+    draft_class, draft_steals, lottery_picks, player_rankings, position_rank,
+    rated_players, score_players,
+)
+
+
+@pytest.mark.benchmark(group="score_all")
+def bench_score_players(benchmark, dataset):
+    _, df, models = dataset
+    pred = benchmark(score_players, df, models)
+    assert pred.notna().all()
+
+
+@pytest.mark.benchmark(group="player_search_tab")
+def bench_position_rank(benchmark, dataset):
+    _, df, models = dataset
+    player = df[df["Year"] >= 19].iloc[0]
+    info = benchmark(position_rank, df, models, player)
+    assert info["rank"] is not None
+
+
+@pytest.mark.benchmark(group="rankings_tab")
+def bench_lottery_and_steals(benchmark, dataset):
+    _, df, models = dataset
+
+    def run():
+        all_preds = rated_players(df, models)
+        return lottery_picks(all_preds), draft_steals(all_preds, min_rating=0.3).head(25)
+
+    lottery, steals = benchmark(run)
+    assert len(lottery) > 0
+
+
+@pytest.mark.benchmark(group="draft_class_tab")
+def bench_draft_class(benchmark, dataset):
+    _, df, models = dataset
+    year_df = benchmark(draft_class, df, models, 22)
+    assert year_df["Pick"].is_monotonic_increasing
+
+
+@pytest.mark.benchmark(group="player_rankings_tab")
+def bench_player_rankings(benchmark, dataset):
+    _, df, models = dataset
+    rankings = benchmark(player_rankings, df, models, 22)
+    assert rankings["Rating"].is_monotonic_decreasing
+
+
+@pytest.mark.benchmark(group="score_all")
+def bench_score_three_versions(benchmark, dataset):
+    # Primary plus two candidates in one pass (model_registry.score_versions)
+    _, df, models = dataset
+    table = benchmark(score_versions, df, {"primary": models, "a": models, "b": models})
+    assert table.notna().all().all()
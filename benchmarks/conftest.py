@@ -0,0 +1,69 @@
+"""
+Benchmark fixtures.
+
+Run from this directory (pytest.ini here collects bench_*.py and stores JSON
+results under .benchmarks/):
+
+    pip install -r ../requirements-dev.txt
+    pytest --benchmark-save=baseline                 # record a baseline
+    pytest --benchmark-compare                       # compare to the latest saved run
+    BENCH_SIZES=750,10000 pytest                     # quick subset
+
+With --benchmark-compare, any benchmark whose mean is more than
+BENCH_FAIL_THRESHOLD (default 15%) slower than the baseline fails the run.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import make_models, make_players  # noqa: E402
+
+SIZES = [int(s) for s in os.environ.get("BENCH_SIZES", "750,10000,100000,1000000").split(",")]
+# Writing/reading 119-column CSVs beyond this is dominated by disk, not our code
+ARTIFACT_SIZES = [n for n in SIZES if n <= int(os.environ.get("BENCH_ARTIFACT_MAX", "100000"))]
+FAIL_THRESHOLD = os.environ.get("BENCH_FAIL_THRESHOLD", "mean:15%")
+
+
+def pytest_configure(config):
+    # Default regression threshold whenever a comparison is requested
+    if config.getoption("benchmark_compare", None) and not config.getoption("benchmark_compare_fail", None):
+        from pytest_benchmark.utils import parse_compare_fail
+
+        config.option.benchmark_compare_fail = [parse_compare_fail(FAIL_THRESHOLD)]
+
+
+_frames = {}
+
+
+def players(n):
+    """Synthetic frame + models for size n, built once per session"""
+    if n not in _frames:
+        df = make_players(n)
+        _frames[n] = (df, make_models(df))
+    return _frames[n]
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"size={n}")
+def dataset(request):
+    df, models = players(request.param)
+    return request.param, df, models
+
+
+@pytest.fixture
+def app_module(dataset):
+    """app.py with its globals pointed at the synthetic data"""
+    import app
+
+    n, df, models = dataset
+    app.final_df_transform = df
+    app.models_by_cluster = models
+    # Distinct per size: keys the response caches and the ETags
+    app.data_version = app.model_version = f"synthetic-{n}"
+    yield app
+    app.final_df_transform = None
+    app.models_by_cluster = None
+    app.data_version = app.model_version = None
@@ -0,0 +1,147 @@
+"""
+Fixed synthetic fixtures shaped like final_df_transform.csv and models_by_cluster.pkl.
+
+Same seed -> same frame, so timings are comparable across runs and machines
+only differ by hardware. Feature columns follow the real per-cluster model
+feature lists; `wide=True` pads the frame to the real file's 119 columns for
+artifact load benchmarks.
+"""
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+SEED = 20250101
+
+CLUSTER_FEATURES = {
+    0.0: ["Player_Encoded", "DraftValue", "LogDR", "DBPM"],
+    1.0: ["LogUsg/Ast", "DraftValue", "LogREB", "LogStl", "LogFT%", "Player_Encoded"],
+    2.0: ["LogFT%", "DraftValue", "Logclose_makes"],
+}
+REAL_COLUMNS = 119
+
+FIRST_NAMES = [
+    "Jalen", "Marcus", "Tyler", "Jaylen", "Cameron", "Devin", "Zion", "Ja", "Cade", "Paolo",
+    "Jabari", "Keegan", "Evan", "Scoot", "Amen", "Brandon", "Jarace", "Anthony", "Shai", "Tre",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis", "Garcia", "Wilson",
+    "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Thompson", "White",
+    "Harris", "Clark", "Lewis", "Walker", "Young", "Allen", "King",
+]
+TEAMS = [
+    "Duke", "Kentucky", "Kansas", "North Carolina", "Gonzaga", "Villanova", "UCLA", "Purdue",
+    "Baylor", "Houston", "Arizona", "Michigan St.", "Texas", "Alabama", "Auburn", "Tennessee",
+]
+
+
+def feature_columns():
+    cols = []
+    for features in CLUSTER_FEATURES.values():
+        cols.extend(f for f in features if f not in cols)
+    return cols
+
+
+def make_players(n, seed=SEED, wide=False):
+    """n synthetic player rows (names are unique; ~10% missing feature values)"""
+    rng = np.random.default_rng(seed)
+    idx = np.arange(n)
+    first = np.array(FIRST_NAMES)[idx % len(FIRST_NAMES)]
+    last = np.array(LAST_NAMES)[(idx // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    suffix = idx // (len(FIRST_NAMES) * len(LAST_NAMES))
+    names = pd.Series(first).str.cat(pd.Series(last), sep=" ")
+    names = names.where(suffix == 0, names + " " + pd.Series(suffix).astype(str))
+
+    pick = rng.integers(1, 61, n).astype(float)
+    pick[rng.random(n) < 0.4] = np.nan
+
+    df = pd.DataFrame({
+        "Name": names.to_numpy(),
+        "Team": np.array(TEAMS)[rng.integers(0, len(TEAMS), n)],
+        "Year": rng.integers(10, 26, n),
+        "Pick": pick,
+        "PlayStyleCluster": rng.integers(0, 3, n).astype(float),
+        "Height": np.array(["6-3", "6-6", "6-9", "7-0"])[rng.integers(0, 4, n)],
+        "BPM": rng.normal(6, 4, n),
+        "Ast": rng.gamma(4, 4, n),
+        "REB": rng.gamma(6, 3, n),
+        "Blk": rng.gamma(2, 1.5, n),
+        "Actual": (rng.random(n) < 0.2).astype(int),
+    })
+    for col in feature_columns():
+        values = rng.normal(0, 1, n) if col != "Player_Encoded" else rng.integers(1, 5, n).astype(float)
+        values[rng.random(n) < 0.1] = np.nan
+        df[col] = values
+
+    if wide:
+        for i in range(REAL_COLUMNS - df.shape[1]):
+            df[f"stat_{i}"] = rng.normal(0, 1, n)
+    return df
+
+
+def make_models(df, seed=SEED):
+    """models_by_cluster-shaped dict fitted on the synthetic frame"""
+    rng = np.random.default_rng(seed + 1)
+    models = {}
+    for cluster, features in CLUSTER_FEATURES.items():
+        rows = df[df["PlayStyleCluster"] == cluster]
+        X = rows[features].fillna(0)
+        scaler = StandardScaler().fit(X)
+        coefs = rng.normal(0, 1, len(features))
+        preds = 1 / (1 + np.exp(-(scaler.transform(X) @ coefs)))
+        models[cluster] = {
+            "features": features,
+            "scaler": scaler,
+            "avg_coefs": coefs,
+            "df_with_predictions": rows[["Name", "Year", "Actual"]].head(300).assign(
+                Predicted=preds[:300], Cluster=cluster,
+            ),
+        }
+    return models
+
+
+ROLES = ["PG", "Combo G", "Wing G", "Wing F", "Stretch 4", "PF/C", "C"]
+
+
+def make_raw_prospects(n, seed=SEED, start=0):
+    """
+    n raw (pre-transform) prospect rows, as batch_score.py reads them.
+
+    `start` offsets the row numbers, so a large file can be written in
+    chunks with unique names: make_raw_prospects(k, seed + i, start=i * k).
+    """
+    rng = np.random.default_rng(seed)
+    idx = np.arange(start, start + n)
+    makes = rng.integers(0, 150, n)
+    pick = rng.integers(1, 61, n).astype(float)
+    pick[rng.random(n) < 0.4] = np.nan
+    return pd.DataFrame({
+        "Name": [f"Prospect {i}" for i in idx],
+        "Team": np.array(TEAMS)[rng.integers(0, len(TEAMS), n)],
+        "Year": rng.integers(10, 26, n),
+        "Player": np.array(["Fr", "So", "Jr", "Sr"])[rng.integers(0, 4, n)],
+        "Pick": pick,
+        "Height": np.array(["6-1", "6-3", "6-5", "6-7", "6-9", "6-11", "7-1"])[rng.integers(0, 7, n)],
+        "Role": np.array(ROLES)[rng.integers(0, len(ROLES), n)],
+        "OR": rng.gamma(3, 1.7, n).round(1),
+        "DR": rng.gamma(6, 2.8, n).round(1),
+        "Stl": rng.gamma(3, 0.7, n).round(1),
+        "FT%": rng.beta(7, 3, n).round(3),
+        "Usg": rng.normal(22, 4, n).round(1),
+        "Ast": rng.gamma(3, 5, n).round(1),
+        "DBPM": rng.normal(2, 1.5, n).round(1),
+        "Close 2 Raw": [f"{m}-{m + a}" for m, a in zip(makes, rng.integers(1, 120, n))],
+    })
+
+
+def write_raw_prospects(path, n, chunk=250_000, seed=SEED):
+    """Write n raw prospect rows to a CSV without holding them all in memory"""
+    for i, start in enumerate(range(0, n, chunk)):
+        rows = make_raw_prospects(min(chunk, n - start), seed + i, start=start)
+        rows.to_csv(path, index=False, mode="w" if i == 0 else "a", header=(i == 0))
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python benchmarks/synthetic.py prospects.csv 2000000
+    write_raw_prospects(sys.argv[1], int(sys.argv[2]))
@@ -0,0 +1,229 @@
+"""
+HTTP caching, compression and fast JSON for app.py (and asgi_app.py).
+
+install(app, version, routes) adds to a Flask app:
+
+  * a JSON provider that serializes with orjson when it is installed (numpy
+    arrays and scalars natively), else the stdlib encoder with a numpy-aware
+    default, so jsonify() accepts int64/float64 values from the frames
+  * weak ETags for GET routes whose body only changes with the data/model
+    version (W/"<version>"), checked *before* the view runs: a matching
+    If-None-Match is answered 304 without doing any work
+  * Cache-Control: public, max-age=<max_age> on those routes
+  * gzip or brotli (when the brotli package is installed and the client
+    prefers it) for buffered text/JSON responses of at least min_size bytes
+
+Streamed and file responses (the /export_rankings downloads) are left as is;
+compressing them would break Range requests, so exports offer compressed
+variants as separate resources instead (compress_stream()).
+"""
+import gzip
+import json
+import zlib
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CACHE_MAX_AGE = 300
+COMPRESS_MIN_BYTES = 1024
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4      # well below the max; dynamic responses are compressed per request
+
+
+# ======================
+# JSON
+# ======================
+
+def _default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """Compact, key-sorted JSON bytes; numpy values are converted"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, default=_default, separators=(",", ":"), sort_keys=True).encode()
+
+
+def json_provider(app):
+    """Flask JSON provider using dumps()"""
+    from flask.json.provider import DefaultJSONProvider
+
+    class FastJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s) if orjson is not None else json.loads(s)
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(dumps(obj) + b"\n", mimetype=self.mimetype)
+
+    return FastJSONProvider(app)
+
+
+# ======================
+# Conditional requests
+# ======================
+
+def etag(version):
+    """Weak ETag value for a data/model version (weak: same data in any content encoding)"""
+    return f'W/"{version}"'
+
+
+def matches(if_none_match, version):
+    """Does an If-None-Match header (raw string) match this version? Weak comparison."""
+    if not if_none_match or version is None:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == f'"{version}"' for t in tags)
+
+
+def cache_control(max_age=CACHE_MAX_AGE):
+    return f"public, max-age={max_age}"
+
+
+# ======================
+# Compression
+# ======================
+
+def _accepted(accept_encoding):
+    """{coding: q} from an Accept-Encoding header"""
+    out = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        out[coding.strip().lower()] = q
+    return out
+
+
+def choose_encoding(accept_encoding):
+    """'br', 'gzip' or None; br only when the brotli package is installed"""
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    options = [("br", accepted.get("br", wildcard)) if brotli is not None else ("br", 0.0),
+               ("gzip", accepted.get("gzip", wildcard))]
+    coding, q = max(options, key=lambda o: o[1])
+    return coding if q > 0 else None
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compressible(mimetype):
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress_stream(parts, encoding):
+    """
+    Compress a byte-chunk stream incrementally ('gzip' or 'br').
+
+    Output is deterministic for the same input (gzip mtime=0), so a
+    compressed export can still be resumed by byte offset.
+    """
+    if encoding == "br":
+        if brotli is None:
+            raise ImportError("Brotli compression needs the brotli package (pip install brotli)")
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for part in parts:
+            out = compressor.process(part)
+            if out:
+                yield out
+        yield compressor.finish()
+        return
+    # wbits=31: gzip container; the header zlib writes has mtime 0
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for part in parts:
+        out = compressor.compress(part)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+# ======================
+# Flask
+# ======================
+
+def install(app, version, routes, max_age=CACHE_MAX_AGE, min_size=COMPRESS_MIN_BYTES):
+    """
+    Install the JSON provider, conditional GETs for `routes` and response compression.
+
+    Parameters:
+        app (Flask): The app.
+        version (callable): Returns the current data/model version, or None
+            while nothing is loaded (no ETag is sent then).
+        routes (iterable): URL rules (as in app.url_map) whose GET responses
+            depend only on the version and the URL.
+        max_age (int): Cache-Control max-age for those routes, in seconds.
+        min_size (int): Smallest body worth compressing.
+    """
+    from flask import request
+
+    routes = set(routes)
+    app.json = json_provider(app)
+
+    def _versioned():
+        rule = request.url_rule
+        return request.method in ("GET", "HEAD") and rule is not None and rule.rule in routes
+
+    @app.before_request
+    def _not_modified():
+        if not _versioned():
+            return None
+        current = version()
+        if matches(request.headers.get("If-None-Match"), current):
+            response = app.response_class(status=304)
+            response.headers["ETag"] = etag(current)
+            response.headers["Cache-Control"] = cache_control(max_age)
+            response.vary.add("Accept-Encoding")
+            return response
+        return None
+
+    @app.after_request
+    def _cache_and_compress(response):
+        if response.status_code == 200 and _versioned() and version() is not None:
+            response.headers["ETag"] = etag(version())
+            response.headers["Cache-Control"] = cache_control(max_age)
+
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or "Content-Encoding" in response.headers or not compressible(response.mimetype)):
+            return response
+        response.vary.add("Accept-Encoding")
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"))
+        if encoding is None:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    return app
@@ -0,0 +1,331 @@
+"""
+Load test for the app.py endpoints.
+
+Starts app.py locally (or targets --url), then replays a weighted traffic mix
+at increasing concurrency. Each stage runs closed-loop workers (one keep-alive
+connection each) for a fixed duration and reports throughput, p50/p95/p99
+latency and error rate per endpoint, so you can see where each route stops
+scaling.
+
+Traffic kinds:
+  player   POST /predict_player with a real name from final_df_transform.csv
+           (a --miss-rate share are misspelt, exercising the not-found path)
+  suggest  GET /search_suggestions keystroke by keystroke while "typing" a name
+  manual   POST /predict_manual with a feature vector taken from a real player
+           of the chosen cluster
+  cluster  GET /get_cluster_info/<cluster>
+
+A response is an error when its status is >= 400 or its JSON body has an
+"error" (app.py answers most failures with 200), except the not-found answer
+to a misspelt name.
+
+Usage:
+    python loadtest.py                                   # start app.py, default ramp
+    python loadtest.py --concurrency 1,4,16,64 --duration 20
+    python loadtest.py --mix player=5,suggest=3,manual=1,cluster=1
+    python loadtest.py --url http://staging:8080 --out loadtest_v2.json --baseline loadtest_v1.json
+"""
+import argparse
+import http.client
+import json
+import os
+import pickle
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MIX = {"player": 4, "suggest": 3, "manual": 2, "cluster": 1}
+DEFAULT_CONCURRENCY = [1, 2, 4, 8, 16, 32]
+ENDPOINTS = ["/predict_player", "/predict_manual", "/search_suggestions", "/get_cluster_info/<cluster>"]
+# Throughput gain below this between stages counts as saturated
+SATURATION_GAIN = 0.05
+# app.py answers errors as 200 {"error": ...}; the only expected one is the
+# not-found answer to the misspelt names the player traffic sends
+EXPECTED_ERRORS = {"/predict_player": " not found"}
+
+
+# ======================
+# Traffic
+# ======================
+
+class TrafficMix:
+    """Draws requests from the dataset according to the mix weights"""
+
+    def __init__(self, players, models_by_cluster, weights, miss_rate=0.05, seed=0):
+        self.names = players["Name"].dropna().astype(str).tolist()
+        self.kinds = list(weights)
+        self.weights = [weights[k] for k in self.kinds]
+        self.miss_rate = miss_rate
+        self.seed = seed
+        self.clusters = sorted(models_by_cluster)
+
+        # Manual-entry vectors: each cluster's features from its real players
+        self.vectors = {}
+        for cluster, model_data in models_by_cluster.items():
+            rows = players.loc[players["PlayStyleCluster"] == cluster, model_data["features"]].fillna(0)
+            self.vectors[cluster] = rows.to_dict("records") or [dict.fromkeys(model_data["features"], 0.0)]
+
+    def rng(self, worker):
+        return random.Random(self.seed * 1000003 + worker)
+
+    def next_requests(self, rng):
+        """One user action as a list of (endpoint, method, path, body)"""
+        kind = rng.choices(self.kinds, self.weights)[0]
+        if kind == "player":
+            name = rng.choice(self.names)
+            if rng.random() < self.miss_rate:
+                name = name[::-1]
+            return [("/predict_player", "POST", "/predict_player", {"player_name": name})]
+        if kind == "suggest":
+            name = rng.choice(self.names)
+            typed = name[:rng.randint(2, max(2, min(len(name), 12)))]
+            return [("/search_suggestions", "GET",
+                     "/search_suggestions?" + urllib.parse.urlencode({"q": typed[:i]}), None)
+                    for i in range(1, len(typed) + 1)]
+        if kind == "manual":
+            cluster = rng.choice(self.clusters)
+            vector = {k: float(v) for k, v in rng.choice(self.vectors[cluster]).items()}
+            return [("/predict_manual", "POST", "/predict_manual", {"cluster": cluster, **vector})]
+        if kind == "cluster":
+            cluster = rng.choice(self.clusters)
+            return [("/get_cluster_info/<cluster>", "GET", f"/get_cluster_info/{float(cluster)}", None)]
+        raise ValueError(f"Unknown traffic kind '{kind}'")
+
+
+def parse_mix(text):
+    """'player=4,suggest=3' -> {'player': 4.0, 'suggest': 3.0}"""
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in DEFAULT_MIX:
+            raise ValueError(f"Unknown traffic kind '{kind}' (expected one of {list(DEFAULT_MIX)})")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+# ======================
+# Running a stage
+# ======================
+
+def response_ok(endpoint, status, body):
+    """Success unless the status is >= 400 or a JSON body has an unexpected error message"""
+    if status >= 400:
+        return False
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return True
+    if not isinstance(data, dict) or "error" not in data:
+        return True
+    expected = EXPECTED_ERRORS.get(endpoint)
+    return expected is not None and expected in str(data["error"])
+
+
+def _worker(host, port, mix, worker, stop_at, samples):
+    """Closed loop: send, wait for the response, send the next"""
+    rng = mix.rng(worker)
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    while time.perf_counter() < stop_at:
+        for endpoint, method, path, body in mix.next_requests(rng):
+            payload = json.dumps(body).encode() if body is not None else None
+            headers = {"Content-Type": "application/json"} if payload else {}
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                ok = response_ok(endpoint, response.status, response.read())
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+            samples.append((endpoint, time.perf_counter() - start, ok))
+    conn.close()
+
+
+def run_stage(url, mix, concurrency, duration):
+    """Run `concurrency` workers for `duration` seconds; returns raw samples"""
+    parsed = urllib.parse.urlsplit(url)
+    stop_at = time.perf_counter() + duration
+    per_worker = [[] for _ in range(concurrency)]
+    threads = [
+        threading.Thread(target=_worker, args=(parsed.hostname, parsed.port or 80, mix, i, stop_at, per_worker[i]))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return [s for samples in per_worker for s in samples], elapsed
+
+
+def summarize(samples, elapsed):
+    """Per-endpoint and overall throughput, latency percentiles (ms) and error rate"""
+    frame = pd.DataFrame(samples, columns=["endpoint", "seconds", "ok"])
+    groups = [(endpoint, frame[frame["endpoint"] == endpoint]) for endpoint in ENDPOINTS]
+    groups.append(("all", frame))
+    out = {}
+    for endpoint, rows in groups:
+        if rows.empty:
+            continue
+        ms = rows["seconds"].to_numpy() * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        out[endpoint] = {
+            "requests": int(len(rows)),
+            "rps": len(rows) / elapsed,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "error_rate": float(1 - rows["ok"].mean()),
+        }
+    return out
+
+
+def find_saturation(stages):
+    """First concurrency whose total throughput gained < SATURATION_GAIN over the previous stage"""
+    for prev, stage in zip(stages, stages[1:]):
+        before, after = prev["endpoints"]["all"]["rps"], stage["endpoints"]["all"]["rps"]
+        if after < before * (1 + SATURATION_GAIN):
+            return prev["concurrency"]
+    return None
+
+
+# ======================
+# App process
+# ======================
+
+def start_app(port):
+    """Run app.py (no debug reloader) on a local port and wait until it serves"""
+    code = f"import app; app.app.run(host='127.0.0.1', port={port}, threaded=True)"
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("app.py exited during startup")
+        try:
+            urllib.request.urlopen(url + "/get_cluster_info/0.0", timeout=2).read()
+            return proc, url
+        except OSError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError(f"app.py did not start on port {port}")
+
+
+def warm_up(url):
+    """GET / makes app.py load its data and models"""
+    body = urllib.request.urlopen(url + "/", timeout=120).read().decode()
+    if body.startswith("Error"):
+        raise RuntimeError(body)
+
+
+# ======================
+# Reporting
+# ======================
+
+def print_table(stages):
+    print(f"{'conc':>5} {'endpoint':<28} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err %':>6}")
+    for stage in stages:
+        for endpoint, s in stage["endpoints"].items():
+            print(f"{stage['concurrency']:>5} {endpoint:<28} {s['requests']:>7} {s['rps']:>8.1f} "
+                  f"{s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f} {s['error_rate'] * 100:>6.2f}")
+        print()
+
+
+def print_comparison(stages, baseline):
+    """Throughput and p95 change vs a previous run, for matching concurrency/endpoint"""
+    previous = {(s["concurrency"], e): v for s in baseline["stages"] for e, v in s["endpoints"].items()}
+    print(f"vs baseline ({baseline.get('git_rev', '?')}):")
+    print(f"{'conc':>5} {'endpoint':<28} {'rps':>9} {'p95':>9}")
+    for stage in stages:
+        for endpoint, s in stage["endpoints"].items():
+            old = previous.get((stage["concurrency"], endpoint))
+            if old is None:
+                continue
+            rps = (s["rps"] / old["rps"] - 1) * 100 if old["rps"] else float("nan")
+            p95 = (s["p95_ms"] / old["p95_ms"] - 1) * 100 if old["p95_ms"] else float("nan")
+            print(f"{stage['concurrency']:>5} {endpoint:<28} {rps:>+8.1f}% {p95:>+8.1f}%")
+
+
+def git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Target a running app instead of starting app.py")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the locally started app.py")
+    parser.add_argument("--concurrency", default=",".join(map(str, DEFAULT_CONCURRENCY)))
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency stage")
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()))
+    parser.add_argument("--miss-rate", type=float, default=0.05, help="Share of unknown player names")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", default=os.path.join(ROOT, "final_df_transform.csv"))
+    parser.add_argument("--models", default=os.path.join(ROOT, "models_by_cluster.pkl"))
+    parser.add_argument("--out", default="loadtest_results.json")
+    parser.add_argument("--baseline", help="Earlier --out file to compare against")
+    args = parser.parse_args(argv)
+
+    players = pd.read_csv(args.data)
+    with open(args.models, "rb") as f:
+        models_by_cluster = pickle.load(f)
+    mix = TrafficMix(players, models_by_cluster, parse_mix(args.mix), args.miss_rate, args.seed)
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_app(args.port)
+    try:
+        warm_up(url)
+        stages = []
+        for concurrency in levels:
+            samples, elapsed = run_stage(url, mix, concurrency, args.duration)
+            stages.append({"concurrency": concurrency, "seconds": elapsed,
+                           "endpoints": summarize(samples, elapsed)})
+            total = stages[-1]["endpoints"].get("all", {})
+            print(f"concurrency {concurrency}: {total.get('rps', 0):.1f} req/s, "
+                  f"p99 {total.get('p99_ms', 0):.1f} ms", file=sys.stderr)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    saturation = find_saturation(stages)
+    result = {
+        "git_rev": git_rev(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "url": url if args.url else "local app.py",
+        "mix": parse_mix(args.mix),
+        "miss_rate": args.miss_rate,
+        "duration": args.duration,
+        "saturation_concurrency": saturation,
+        "stages": stages,
+    }
+    print_table(stages)
+    print(f"Saturates at concurrency {saturation}" if saturation else "No saturation within the tested range")
+    if args.baseline:
+        with open(args.baseline) as f:
+            print_comparison(stages, json.load(f))
+    with open(args.out, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Wrote {args.out}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Minimal Prometheus-style instrumentation for app.py (no extra dependencies).
+
+Counters, gauges and histograms keep their values in plain dicts keyed by
+label tuples behind one lock each; recording is a dict update plus, for
+histograms, a bisect into the bucket bounds. render() produces the Prometheus
+text exposition format served at /metrics.
+
+instrument_app(app) adds:
+  ncaab_http_requests_total{route,method,status}
+  ncaab_http_request_duration_seconds{route}      (histogram)
+  ncaab_http_requests_in_flight
+and the /metrics route. Routes are labelled by their URL rule
+(e.g. /get_cluster_info/<float:cluster>) so label cardinality stays fixed.
+"""
+import bisect
+import hashlib
+import os
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOAD_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(v) for v in labels)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, *labels):
+        return self.values.get(self._key(labels), 0)
+
+    def render(self):
+        with self.lock:
+            items = list(self.values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                # per-bucket (non-cumulative) counts, +Inf last, then sum
+                state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][i] += 1
+            state[1] += value
+
+    def render(self):
+        with self.lock:
+            items = [(k, list(counts), total) for k, (counts, total) in self.values.items()]
+        lines = self.header()
+        for key, counts, total in items:
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {running}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {running}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.counter(
+    "ncaab_http_requests_total", "HTTP requests by route, method and status.",
+    ["route", "method", "status"])
+LATENCY = REGISTRY.histogram(
+    "ncaab_http_request_duration_seconds", "Request latency by route.", ["route"])
+IN_FLIGHT = REGISTRY.gauge(
+    "ncaab_http_requests_in_flight", "Requests currently being handled.")
+PLAYER_MISSES = REGISTRY.counter(
+    "ncaab_player_lookup_misses_total", "Player lookups that found no matching name.")
+ARTIFACT_LOADS = REGISTRY.counter(
+    "ncaab_artifact_loads_total",
+    "Data/model load attempts: hit (already in memory), miss (read from disk) or error.",
+    ["artifact", "result"])
+ARTIFACT_LOAD_SECONDS = REGISTRY.histogram(
+    "ncaab_artifact_load_duration_seconds", "Time spent reading data/model artifacts from disk.",
+    ["artifact"], buckets=LOAD_BUCKETS)
+RESPONSE_CACHE = REGISTRY.counter(
+    "ncaab_response_cache_total",
+    "Response cache lookups and evictions: hit, miss, coalesced, evicted_size, evicted_ttl.",
+    ["cache", "result"])
+SHADOW_PREDICTIONS = REGISTRY.counter(
+    "ncaab_shadow_predictions_total",
+    "Live predictions shadow-scored against a candidate model: compared, missing or dropped (queue full).",
+    ["version", "result"])
+SHADOW_DELTA = REGISTRY.histogram(
+    "ncaab_shadow_probability_delta", "Absolute candidate - primary probability difference on live traffic.",
+    ["version"], buckets=(0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5))
+MODEL_INFO = REGISTRY.gauge(
+    "ncaab_model_info", "Loaded model versions (value is always 1).", ["model", "version"])
+
+
+def file_version(path):
+    """Short content hash of an artifact, used as its version label"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+def artifact_version(path):
+    """file_version() if the file exists, else 'missing'"""
+    return file_version(path) if os.path.exists(path) else "missing"
+
+
+def set_model_version(model, version):
+    """Record the loaded version of a model, dropping any previous version label"""
+    with MODEL_INFO.lock:
+        for key in [k for k in MODEL_INFO.values if k[0] == model]:
+            del MODEL_INFO.values[key]
+    MODEL_INFO.set(1, model, version)
+
+
+class timed_load:
+    """
+    Context manager for artifact loads: counts a miss (or error) and records
+    the load duration.
+
+        with timed_load("final_df_transform"):
+            df = pd.read_csv(...)
+    """
+
+    def __init__(self, artifact):
+        self.artifact = artifact
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ARTIFACT_LOAD_SECONDS.observe(time.perf_counter() - self.start, self.artifact)
+        ARTIFACT_LOADS.inc(self.artifact, "error" if exc_type else "miss")
+        return False
+
+
+def instrument_app(app, registry=REGISTRY, path="/metrics"):
+    """Install per-request timing hooks and the /metrics route on a Flask app"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+        IN_FLIGHT.inc()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+            LATENCY.observe(time.perf_counter() - start, route)
+            REQUESTS.inc(route, request.method, response.status_code)
+        return response
+
+    @app.teardown_request
+    def _end_request(exc):
+        IN_FLIGHT.dec()
+
+    @app.route(path)
+    def metrics():
+        return Response(registry.render(), content_type=CONTENT_TYPE)
+
+    return app
@@ -0,0 +1,370 @@
+"""
+Several versions of the cluster models side by side: batch scoring,
+rank-shift / probability-delta reports, and shadow scoring of live traffic.
+
+Retraining overwrites models_by_cluster.pkl in place, so a candidate is
+registered from its own file (its version is the file's content hash, as in
+metrics.artifact_version). score_versions() scores every player under every
+registered version in one pass per cluster: each model's scaler is folded
+into its coefficients (w = coef / scale, b = mean . w), the per-version
+weight vectors are stacked into one matrix, and a single X @ W yields all
+versions' logits.
+
+compare() reports, per cluster, how a candidate moves probabilities and
+in-cluster ranks relative to a base version. ShadowScorer compares live
+/predict_player results with a candidate off the request path.
+
+Usage:
+    python model_registry.py models_by_cluster.pkl candidate.pkl --years 2019-2025
+"""
+import argparse
+import json
+import os
+import pickle
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from rankings_export import parse_years
+
+
+# ======================
+# Batch scoring
+# ======================
+
+def _folded(model_data, features):
+    """(w, b) with sigmoid(X[features] @ w - b) == predict_proba(); zero weight for unused features"""
+    scaler = model_data["scaler"]
+    w = np.zeros(len(features))
+    at = [features.index(f) for f in model_data["features"]]
+    w[at] = np.asarray(model_data["avg_coefs"], dtype=float) / np.asarray(scaler.scale_, dtype=float)
+    b = float(np.dot(np.asarray(scaler.mean_, dtype=float), w[at]))
+    return w, b
+
+
+def score_versions(df, models_by_version):
+    """
+    Probability for every row under every model version.
+
+    Parameters:
+        df (pd.DataFrame): Player frame with PlayStyleCluster and the model features.
+        models_by_version (dict): Version -> models_by_cluster.
+
+    Returns:
+        pd.DataFrame: One column per version, indexed like df (NaN where a
+        version has no model for the row's cluster).
+    """
+    versions = list(models_by_version)
+    out = np.full((len(df), len(versions)), np.nan)
+    clusters = df["PlayStyleCluster"].to_numpy()
+    all_clusters = {c for models in models_by_version.values() for c in models}
+    for cluster in sorted(all_clusters):
+        mask = clusters == cluster
+        if not mask.any():
+            continue
+        have = [j for j, v in enumerate(versions) if cluster in models_by_version[v]]
+        features = []
+        for j in have:
+            features.extend(f for f in models_by_version[versions[j]][cluster]["features"] if f not in features)
+        W = np.empty((len(features), len(have)))
+        b = np.empty(len(have))
+        for k, j in enumerate(have):
+            W[:, k], b[k] = _folded(models_by_version[versions[j]][cluster], features)
+        X = df.loc[mask, features].fillna(0).to_numpy(dtype=float)
+        out[np.ix_(mask, have)] = 1 / (1 + np.exp(-(X @ W - b)))
+    return pd.DataFrame(out, index=df.index, columns=versions)
+
+
+class ModelRegistry:
+    """Named model versions, one of them primary, with a cached score table per data version"""
+
+    def __init__(self):
+        self.models = {}        # version -> models_by_cluster
+        self.paths = {}
+        self.primary = None
+        self._file_versions = {}    # path -> ((size, mtime), version) of files already loaded
+        self._scores = (None, None)
+        self._lock = threading.Lock()
+
+    def add(self, models_by_cluster, version, path=None, primary=False):
+        with self._lock:
+            self.models[version] = models_by_cluster
+            self.paths[version] = path
+            if primary or self.primary is None:
+                self.primary = version
+            self._scores = (None, None)
+        return version
+
+    def load(self, path, primary=False):
+        """
+        Register a pickled models_by_cluster under its content hash; returns the version.
+
+        Files already registered are skipped: an unchanged path (same size and
+        mtime) isn't re-hashed, and a known version isn't unpickled again.
+        """
+        st = os.stat(path)
+        stamp = (st.st_size, st.st_mtime_ns)
+        cached = self._file_versions.get(path)
+        version = cached[1] if cached is not None and cached[0] == stamp else metrics.artifact_version(path)
+        self._file_versions[path] = (stamp, version)
+        if version in self.models:
+            if primary:
+                self.primary = version
+            return version
+        with metrics.timed_load("candidate_models"):
+            with open(path, "rb") as f:
+                models_by_cluster = pickle.load(f)
+        return self.add(models_by_cluster, version, path, primary)
+
+    @property
+    def candidates(self):
+        return [v for v in self.models if v != self.primary]
+
+    def describe(self):
+        return [{"version": v, "primary": v == self.primary, "path": self.paths[v],
+                 "clusters": [float(c) for c in self.models[v]]} for v in self.models]
+
+    def score_table(self, df, data_key=None):
+        """score_versions() for every registered version, reused while data_key and the versions are unchanged"""
+        key = (data_key if data_key is not None else id(df), tuple(self.models))
+        cached_key, table = self._scores
+        if cached_key == key:
+            return table
+        table = score_versions(df, dict(self.models))
+        self._scores = (key, table)
+        return table
+
+    def compare(self, df, candidate, base=None, years=None, top=10, data_key=None):
+        """compare_versions() between two registered versions (base defaults to primary)"""
+        base = base or self.primary
+        for version in (base, candidate):
+            if version not in self.models:
+                raise KeyError(f"Unknown model version {version!r}")
+        return compare_versions(df, self.score_table(df, data_key), base, candidate, years=years, top=top)
+
+
+# ======================
+# Reports
+# ======================
+
+def _movers(frame, column, n, ascending):
+    rows = frame.sort_values(column, ascending=ascending, kind="stable").head(n)
+    return [{"name": r.Name, "year": int(r.Year), "base": float(r.base), "candidate": float(r.candidate),
+             "delta": float(r.delta), "rank_shift": int(r.rank_shift)} for r in rows.itertuples()]
+
+
+def compare_versions(df, scores, base, candidate, years=None, top=10):
+    """
+    Probability deltas and in-cluster rank shifts of candidate vs base.
+
+    Ranks are 1 = highest probability within the player's cluster (and year
+    span); rank_shift > 0 means the candidate ranks the player higher.
+
+    Returns:
+        dict: {"base", "candidate", "overall": {...}, "clusters": {cluster: {...}}}
+    """
+    frame = pd.DataFrame({
+        "Name": df["Name"].to_numpy(), "Year": df["Year"].to_numpy(),
+        "cluster": df["PlayStyleCluster"].to_numpy(dtype=float),
+        "base": scores[base].to_numpy(), "candidate": scores[candidate].to_numpy(),
+    }, index=df.index).dropna(subset=["base", "candidate"])
+    if years is not None:
+        lo, hi = years
+        if lo is not None:
+            frame = frame[frame["Year"] >= lo]
+        if hi is not None:
+            frame = frame[frame["Year"] <= hi]
+    frame = frame.copy()
+    frame["delta"] = frame["candidate"] - frame["base"]
+    by_cluster = frame.groupby("cluster")
+    frame["base_rank"] = by_cluster["base"].rank(ascending=False, method="first")
+    frame["candidate_rank"] = by_cluster["candidate"].rank(ascending=False, method="first")
+    frame["rank_shift"] = (frame["base_rank"] - frame["candidate_rank"]).astype(int)
+
+    def summary(group):
+        delta, shift = group["delta"].abs(), group["rank_shift"].abs()
+        n = len(group)
+        return {
+            "players": n,
+            "mean_delta": float(group["delta"].mean()) if n else 0.0,
+            "mean_abs_delta": float(delta.mean()) if n else 0.0,
+            "max_abs_delta": float(delta.max()) if n else 0.0,
+            "mean_abs_rank_shift": float(shift.mean()) if n else 0.0,
+            "max_abs_rank_shift": int(shift.max()) if n else 0,
+            # Players whose prediction crosses 0.5 between the two versions
+            "flips": int(((group["base"] >= 0.5) != (group["candidate"] >= 0.5)).sum()),
+            "rank_correlation": (float(np.corrcoef(group["base_rank"], group["candidate_rank"])[0, 1])
+                                 if n > 1 else 1.0),
+        }
+
+    clusters = {}
+    for cluster, group in frame.groupby("cluster"):
+        clusters[float(cluster)] = {
+            **summary(group),
+            "top_risers": _movers(group[group["rank_shift"] > 0], "rank_shift", top, ascending=False),
+            "top_fallers": _movers(group[group["rank_shift"] < 0], "rank_shift", top, ascending=True),
+        }
+    overall = summary(frame)
+    overall.pop("rank_correlation")
+    return {"base": base, "candidate": candidate, "overall": overall, "clusters": clusters}
+
+
+# ======================
+# Shadow scoring
+# ======================
+
+class ShadowScorer:
+    """
+    Compare live predictions with a candidate version off the request path.
+
+    submit() only enqueues (dropping when the queue is full), so the primary
+    response never waits on the candidate. A background thread looks the
+    player up in the candidate's precomputed score table and records the
+    delta in metrics.SHADOW_* and per-cluster running totals. The thread is
+    (re)started lazily in each process, so this survives serve.py's fork.
+    """
+
+    def __init__(self, version, probabilities, data_version=None, max_queue=1024):
+        self.version = version
+        self.data_version = data_version
+        self.probabilities = probabilities  # name -> candidate probability
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self.stats = {}
+        self.counts = dict.fromkeys(("compared", "missing", "dropped"), 0)
+
+    @classmethod
+    def from_scores(cls, df, scores, version, **kwargs):
+        """Candidate lookup by name (first row per name, as show_clustered_player_prediction matches)"""
+        table = pd.Series(scores[version].to_numpy(), index=df["Name"].to_numpy())
+        table = table[~table.index.duplicated()].dropna()
+        return cls(version, table.to_dict(), **kwargs)
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(self.max_queue)
+                threading.Thread(target=self._run, args=(self._queue,), name="shadow", daemon=True).start()
+                self._pid = os.getpid()
+
+    def _count(self, result):
+        with self._lock:
+            self.counts[result] += 1
+        metrics.SHADOW_PREDICTIONS.inc(self.version, result)
+
+    def submit(self, player_name, result):
+        """Queue a successful primary result for comparison; never blocks"""
+        if "probability" not in result:
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((player_name, result.get("cluster"), result["probability"]))
+        except queue.Full:
+            self._count("dropped")
+
+    def _run(self, jobs):
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            try:
+                self._compare(*job)
+            finally:
+                jobs.task_done()
+
+    def _compare(self, name, cluster, primary):
+        candidate = self.probabilities.get(name)
+        if candidate is None:
+            self._count("missing")
+            return
+        delta = candidate - primary
+        metrics.SHADOW_DELTA.observe(abs(delta), self.version)
+        with self._lock:
+            s = self.stats.setdefault(cluster, {"compared": 0, "sum_delta": 0.0, "sum_abs_delta": 0.0,
+                                                "max_abs_delta": 0.0, "flips": 0})
+            s["compared"] += 1
+            s["sum_delta"] += delta
+            s["sum_abs_delta"] += abs(delta)
+            s["max_abs_delta"] = max(s["max_abs_delta"], abs(delta))
+            s["flips"] += (candidate >= 0.5) != (primary >= 0.5)
+        self._count("compared")
+
+    def drain(self, timeout=5.0):
+        """Wait until queued comparisons are recorded; False on timeout"""
+        jobs = self._queue
+        if jobs is None or self._pid != os.getpid():
+            return True
+        deadline = time.monotonic() + timeout
+        with jobs.all_tasks_done:
+            while jobs.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                jobs.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self):
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.put(None)
+
+    def report(self):
+        with self._lock:
+            clusters = {
+                cluster: {"compared": s["compared"], "mean_delta": s["sum_delta"] / s["compared"],
+                          "mean_abs_delta": s["sum_abs_delta"] / s["compared"],
+                          "max_abs_delta": s["max_abs_delta"], "flips": int(s["flips"])}
+                for cluster, s in self.stats.items()
+            }
+            return {"candidate": self.version, "data_version": self.data_version, **self.counts,
+                    "clusters": clusters}
+
+
+# ======================
+# CLI
+# ======================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare model versions across every player")
+    parser.add_argument("base", help="Base models_by_cluster pickle (e.g. production)")
+    parser.add_argument("candidates", nargs="+", help="Candidate pickles")
+    parser.add_argument("--data", default="final_df_transform.csv")
+    parser.add_argument("--years", help="e.g. 2019-2025")
+    parser.add_argument("--top", type=int, default=10, help="Risers/fallers listed per cluster")
+    parser.add_argument("--json", action="store_true", help="Print the full reports as JSON")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.data)
+    registry = ModelRegistry()
+    base = registry.load(args.base, primary=True)
+    versions = [registry.load(path) for path in args.candidates]
+    reports = [registry.compare(df, v, base, years=parse_years(args.years), top=args.top) for v in versions]
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+    for path, report in zip(args.candidates, reports):
+        o = report["overall"]
+        print(f"\n{path} ({report['candidate']}) vs {args.base} ({base}): {o['players']} players, "
+              f"mean |dp| {o['mean_abs_delta']:.4f}, max |dp| {o['max_abs_delta']:.4f}, {o['flips']} flips")
+        print(f"{'cluster':>8} {'players':>8} {'mean dp':>9} {'mean |dp|':>10} {'max |dp|':>9} "
+              f"{'mean |shift|':>13} {'max |shift|':>12} {'rank corr':>10}")
+        for cluster, c in sorted(report["clusters"].items()):
+            print(f"{cluster:>8g} {c['players']:>8} {c['mean_delta']:>9.4f} {c['mean_abs_delta']:>10.4f} "
+                  f"{c['max_abs_delta']:>9.4f} {c['mean_abs_rank_shift']:>13.2f} {c['max_abs_rank_shift']:>12} "
+                  f"{c['rank_correlation']:>10.4f}")
+            for label, movers in (("up", c["top_risers"]), ("down", c["top_fallers"])):
+                for m in movers[:3]:
+                    print(f"{'':>10}{label:>5} {m['rank_shift']:+4d}  {m['name']} ({2000 + m['year']}) "
+                          f"{m['base']:.3f} -> {m['candidate']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
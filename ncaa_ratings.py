@@ -0,0 +1,203 @@
+"""
+Sparse least-squares team ratings from scraped NCAA games.
+
+Each game in ncaa_games_{SEASON}.csv becomes one row of a sparse design matrix
+with +1 in the team's column, -1 in the opponent's column and a home-court
+column (+1 home, -1 away, 0 neutral):
+
+    margin = rating[team] - rating[opponent] + hca * site
+
+The system is solved with scipy's LSMR. A nightly update re-solves warm-started
+from the previous ratings, so only a handful of iterations are needed. An
+optional Bradley-Terry model fits win probabilities on the same matrix.
+
+Ratings are centred at zero, so strength_of_schedule() (mean opponent rating)
+can be joined onto the player tables as a feature.
+
+Usage:
+    from ncaa_ratings import solve_ratings
+    ratings = solve_ratings(pd.read_csv("ncaa_games_2025.csv"))
+    ratings = solve_ratings(updated_games, previous=ratings)     # warm start
+"""
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+SITE_SIGN = {"home": 1.0, "away": -1.0, "neutral": 0.0}
+DAMP = 1e-3
+
+
+def clean_team_name(name):
+    """Drop AP ranks and non-breaking spaces: 'Duke\\xa0(5)' -> 'Duke'"""
+    return re.sub(r"\s*\(\d+\)$", "", str(name).replace("\xa0", " ")).strip()
+
+
+def played_games(games):
+    """Completed games with cleaned names, numeric margin and site sign"""
+    out = pd.DataFrame({
+        "team": games["team"].map(clean_team_name),
+        "opponent": games["opponent"].map(clean_team_name),
+        "team_pts": pd.to_numeric(games["team_pts"], errors="coerce"),
+        "opp_pts": pd.to_numeric(games["opp_pts"], errors="coerce"),
+        "site": games["site"].map(SITE_SIGN).fillna(0.0),
+    })
+    out = out.dropna(subset=["team_pts", "opp_pts"])
+    out["margin"] = out["team_pts"] - out["opp_pts"]
+    return out.reset_index(drop=True)
+
+
+def design_matrix(games, teams=None):
+    """
+    Sparse (n_games x n_teams+1) CSR matrix and the team index.
+
+    `teams` fixes the column order (e.g. to line up with previous ratings);
+    teams not in it are appended.
+    """
+    from scipy import sparse
+
+    names = pd.Index(teams if teams is not None else [])
+    new = pd.Index(pd.unique(np.concatenate([games["team"].to_numpy(), games["opponent"].to_numpy()])))
+    names = names.append(new.difference(names, sort=False)) if len(names) else new
+
+    n = len(games)
+    t = names.get_indexer(games["team"])
+    o = names.get_indexer(games["opponent"])
+    hca_col = len(names)
+
+    rows = np.repeat(np.arange(n), 3)
+    cols = np.column_stack([t, o, np.full(n, hca_col)]).ravel()
+    vals = np.column_stack([np.ones(n), -np.ones(n), games["site"].to_numpy(dtype=float)]).ravel()
+    X = sparse.csr_matrix((vals, (rows, cols)), shape=(n, hca_col + 1))
+    return X, names
+
+
+def solve_ratings(games, previous=None, damp=DAMP, atol=1e-8, btol=1e-8, maxiter=None, verbose=True):
+    """
+    Margin-based ratings via sparse least squares.
+
+    Parameters:
+        games (pd.DataFrame): Scraped games (team, opponent, team_pts, opp_pts, site).
+        previous (pd.DataFrame): Earlier solve_ratings() output to warm start from.
+        damp (float): Ridge damping; keeps teams with few games near zero.
+
+    Returns:
+        pd.DataFrame indexed by team with rating, games and sos columns.
+        attrs["home_court"] is the fitted home-court advantage in points.
+    """
+    from scipy.sparse.linalg import lsmr
+
+    played = played_games(games)
+    teams = previous.index if previous is not None else None
+    X, names = design_matrix(played, teams)
+    y = played["margin"].to_numpy(dtype=float)
+
+    x0 = None
+    if previous is not None:
+        x0 = np.zeros(X.shape[1])
+        x0[:len(names)] = previous["rating"].reindex(names).fillna(0.0).to_numpy()
+        x0[-1] = previous.attrs.get("home_court", 0.0)
+
+    start = time.perf_counter()
+    result = lsmr(X, y, damp=damp, atol=atol, btol=btol, maxiter=maxiter, x0=x0)
+    coef, iterations = result[0], result[2]
+    elapsed = time.perf_counter() - start
+
+    ratings = coef[:-1] - coef[:-1].mean()
+    out = pd.DataFrame({"rating": ratings}, index=pd.Index(names, name="team"))
+    counts = pd.concat([played["team"], played["opponent"]]).value_counts()
+    out["games"] = counts.reindex(out.index).fillna(0).astype(int)
+    out["sos"] = strength_of_schedule(played, out["rating"])
+    out = out[out["games"] > 0].sort_values("rating", ascending=False)
+    out.attrs["home_court"] = float(coef[-1])
+    out.attrs["iterations"] = int(iterations)
+    out.attrs["solve_seconds"] = elapsed
+
+    if verbose:
+        start_kind = "warm" if x0 is not None else "cold"
+        print(f"Rated {len(out)} teams from {len(played)} games: HCA {coef[-1]:.2f} pts, "
+              f"{iterations} iterations ({start_kind} start, {elapsed * 1000:.1f} ms)")
+    return out
+
+
+def strength_of_schedule(played, rating):
+    """Mean opponent rating for every team, counting both sides of each game"""
+    pairs = pd.DataFrame({
+        "team": np.concatenate([played["team"].to_numpy(), played["opponent"].to_numpy()]),
+        "opp_rating": np.concatenate([
+            played["opponent"].map(rating).to_numpy(dtype=float),
+            played["team"].map(rating).to_numpy(dtype=float),
+        ]),
+    })
+    return pairs.groupby("team")["opp_rating"].mean().reindex(rating.index)
+
+
+def solve_bradley_terry(games, previous=None, l2=1e-2, verbose=True):
+    """
+    Bradley-Terry win model on the same design matrix:
+        P(team wins) = sigmoid(strength[team] - strength[opponent] + hca * site)
+
+    Fitted by L-BFGS on the sparse matrix, optionally warm-started.
+    Returns a DataFrame indexed by team with a bt_strength column.
+    """
+    from scipy.optimize import minimize
+
+    played = played_games(games)
+    played = played[played["margin"] != 0]
+    teams = previous.index if previous is not None else None
+    X, names = design_matrix(played, teams)
+    won = (played["margin"].to_numpy() > 0).astype(float)
+    XT = X.T.tocsr()
+
+    def loss(w):
+        z = X @ w
+        p = 1.0 / (1.0 + np.exp(-z))
+        nll = np.sum(np.logaddexp(0.0, z) - won * z) + 0.5 * l2 * (w @ w)
+        grad = XT @ (p - won) + l2 * w
+        return nll, grad
+
+    w0 = np.zeros(X.shape[1])
+    if previous is not None and "bt_strength" in previous.columns:
+        w0[:len(names)] = previous["bt_strength"].reindex(names).fillna(0.0).to_numpy()
+        w0[-1] = previous.attrs.get("bt_home_court", 0.0)
+
+    start = time.perf_counter()
+    result = minimize(loss, w0, jac=True, method="L-BFGS-B")
+    elapsed = time.perf_counter() - start
+
+    strength = result.x[:-1] - result.x[:-1].mean()
+    out = pd.DataFrame({"bt_strength": strength}, index=pd.Index(names, name="team"))
+    out.attrs["bt_home_court"] = float(result.x[-1])
+    if verbose:
+        print(f"Bradley-Terry: {len(out)} teams, {result.nit} iterations ({elapsed * 1000:.1f} ms)")
+    return out
+
+
+def win_probability(bt, team, opponent, site="neutral"):
+    """P(team beats opponent) from solve_bradley_terry() output"""
+    z = (bt.loc[team, "bt_strength"] - bt.loc[opponent, "bt_strength"]
+         + SITE_SIGN[site] * bt.attrs.get("bt_home_court", 0.0))
+    return float(1.0 / (1.0 + np.exp(-z)))
+
+
+def add_sos_feature(players, ratings_by_year, team_col="Team", year_col="Year", name_map=None):
+    """
+    Join team rating and strength of schedule onto a player table.
+
+    ratings_by_year maps the player table's Year (e.g. 25 for 2024-25) to a
+    solve_ratings() frame; name_map translates player-table team names to
+    sports-reference names where they differ.
+    """
+    frames = []
+    for year, ratings in ratings_by_year.items():
+        frames.append(ratings[["rating", "sos"]].assign(**{year_col: year}).reset_index())
+    table = pd.concat(frames, ignore_index=True).rename(columns={
+        "team": "_team", "rating": "team_rating", "sos": "team_sos",
+    })
+
+    keys = players[team_col].astype(str)
+    if name_map:
+        keys = keys.replace(name_map)
+    merged = players.assign(_team=keys.to_numpy()).merge(table, on=["_team", year_col], how="left")
+    return merged.drop(columns="_team")
@@ -0,0 +1,343 @@
+"""
+Async, rate-limited NCAA schedule scraper for sports-reference.
+
+notebook.ipynb fetches team schedules one at a time with random 15-30s sleeps
+and a 5 minute pause every 20 teams, so a season refresh spends hours idle.
+This module keeps sports-reference's published limit busy instead:
+
+  - a token bucket (20 requests/minute by default) gates every request, retries
+    included, so the scraper never goes over the limit and never waits longer
+    than the limit requires
+  - a semaphore bounds how many requests are in flight
+  - one aiohttp session with a keep-alive connector reuses the host connection
+  - 429s, 5xx responses and connection errors are retried with exponential
+    back-off plus full jitter, honouring Retry-After when the server sends one
+
+Schedules are parsed into the notebook's columns
+(date, opponent, team_pts, opp_pts, site, team).
+
+Usage:
+    from ncaa_scraper import scrape_season
+    games = scrape_season(2025)                  # writes ncaa_games_2025.csv
+
+    # Against a local stand-in server with canned pages:
+    async with canned_site({"/cbb/schools/duke/2025-schedule.html": html}) as base_url:
+        frames, errors = await scrape_schedules({"Duke": "duke"}, 2025, base_url=base_url)
+"""
+import asyncio
+import contextlib
+import random
+import re
+import time
+
+import pandas as pd
+
+from schedule_cache import cached_parse
+from schedule_table import extract_schedule
+
+BASE_URL = "https://www.sports-reference.com"
+TEAMLIST_PATH = "/cbb/seasons/{season}-school-stats.html"
+SCHEDULE_PATH = "/cbb/schools/{slug}/{season}-schedule.html"
+HEADERS = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
+
+# sports-reference's published bot policy: no more than 20 requests per minute
+REQUESTS_PER_MINUTE = 20
+MAX_CONCURRENCY = 4
+MAX_RETRIES = 4
+BACKOFF_BASE = 2.0
+BACKOFF_CAP = 120.0
+REQUEST_TIMEOUT = 30
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, holding at most `capacity`.
+
+    With capacity=1 consecutive acquisitions are spaced at least 1/rate seconds
+    apart, so any window of 60s sees at most rate*60 requests. Waiters are
+    served in arrival order.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.lock = asyncio.Lock()
+        self.acquired = 0
+
+    @classmethod
+    def per_minute(cls, requests_per_minute=REQUESTS_PER_MINUTE, capacity=1):
+        return cls(requests_per_minute / 60.0, capacity)
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # Holding the lock while sleeping keeps the queue FIFO: the next waiter
+        # only starts its own wait once this one has its token
+        async with self.lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+            self.acquired += 1
+
+
+class ScrapeError(Exception):
+    """A page could not be fetched after all retries"""
+
+
+def backoff_delay(attempt, retry_after=None, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Full-jitter exponential back-off, never shorter than the server's Retry-After"""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _retry_after(headers):
+    value = headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+async def fetch_text(session, url, limiter, semaphore, max_retries=MAX_RETRIES):
+    """
+    GET a page through the rate limiter, retrying transient failures.
+
+    Every attempt takes a token, so retries count against the limit too.
+    """
+    import aiohttp
+
+    last_error = None
+    for attempt in range(max_retries + 1):
+        retry_after = None
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                async with session.get(url) as resp:
+                    if resp.status == 200:
+                        return await resp.text()
+                    if resp.status not in RETRY_STATUSES:
+                        raise ScrapeError(f"{url}: HTTP {resp.status}")
+                    retry_after = _retry_after(resp.headers)
+                    last_error = f"HTTP {resp.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+
+        if attempt < max_retries:
+            delay = backoff_delay(attempt, retry_after)
+            print(f"⚠️  {url}: {last_error}, retrying in {delay:.1f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+
+    raise ScrapeError(f"{url}: failed after {max_retries + 1} attempts ({last_error})")
+
+
+def make_session(concurrency=MAX_CONCURRENCY, timeout=REQUEST_TIMEOUT):
+    """One keep-alive session; the connector caps connections per host at `concurrency`"""
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency, keepalive_timeout=60)
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=HEADERS,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    )
+
+
+# ======================
+# Parsing
+# ======================
+
+def parse_teamlist(html):
+    """{team name: slug} from the season school-stats page"""
+    from lxml import html as lxml_html
+
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    if not html.strip():
+        return {}
+    links = lxml_html.fromstring(html).xpath(
+        "//table[@id='basic_school_stats']//a[contains(@href, '/cbb/schools/')]")
+    return {
+        a.text_content().strip(): re.search(r"/cbb/schools/([^/]+)/", a.get("href")).group(1)
+        for a in links
+    }
+
+
+def parse_schedule(html, team_name):
+    """
+    Return DataFrame with columns:
+      date, opponent, team_pts, opp_pts, site, team
+    """
+    return extract_schedule(html, team_name)
+
+
+def combine_games(frames):
+    """Stack per-team schedules, keep each head-to-head game once and add margin"""
+    combined = pd.concat(frames, ignore_index=True)
+    team = combined["team"].astype(str)
+    opponent = combined["opponent"].astype(str)
+    first = team.where(team <= opponent, opponent)
+    second = opponent.where(team <= opponent, team)
+    combined["key"] = combined["date"].astype(str) + "_" + first + "_" + second
+
+    games = (
+        combined
+        .sort_values(["date", "team"])
+        .drop_duplicates("key")
+        .drop(columns="key")
+        .reset_index(drop=True)
+    )
+    games["margin"] = pd.to_numeric(games["team_pts"], errors="coerce") - pd.to_numeric(games["opp_pts"], errors="coerce")
+    return games
+
+
+# ======================
+# Scrape
+# ======================
+
+async def fetch_teams(season, base_url=BASE_URL, session=None, limiter=None, semaphore=None):
+    """Fetch and parse the season's team list"""
+    owns_session = session is None
+    session = session or make_session()
+    limiter = limiter or TokenBucket.per_minute()
+    semaphore = semaphore or asyncio.Semaphore(MAX_CONCURRENCY)
+    try:
+        html = await fetch_text(session, base_url + TEAMLIST_PATH.format(season=season), limiter, semaphore)
+    finally:
+        if owns_session:
+            await session.close()
+    return parse_teamlist(html)
+
+
+async def scrape_schedules(teams, season, base_url=BASE_URL, requests_per_minute=REQUESTS_PER_MINUTE,
+                           concurrency=MAX_CONCURRENCY, max_retries=MAX_RETRIES, limiter=None,
+                           on_result=None, cache=None):
+    """
+    Fetch every team's schedule concurrently under one shared rate limit.
+
+    Parameters:
+        teams (dict): {team name: sports-reference slug}.
+        season (int): Season end year (2025 = 2024-25).
+        base_url (str): Site root; point it at a stand-in server for testing.
+        requests_per_minute (float): Token-bucket rate shared by all requests.
+        concurrency (int): Maximum requests in flight (and connections per host).
+        on_result (callable): Optional callback(team, frame) as each team finishes.
+        cache (ScheduleCache): Parsed-row cache; unchanged pages skip HTML parsing.
+
+    Returns:
+        (frames, errors): per-team DataFrames and {team: error message}
+    """
+    limiter = limiter or TokenBucket.per_minute(requests_per_minute)
+    semaphore = asyncio.Semaphore(concurrency)
+    frames, errors = [], {}
+    started = time.perf_counter()
+
+    async with make_session(concurrency) as session:
+        async def one(team, slug):
+            url = base_url + SCHEDULE_PATH.format(slug=slug, season=season)
+            try:
+                html = await fetch_text(session, url, limiter, semaphore, max_retries)
+                if cache is not None:
+                    frame = cached_parse(cache, url, html, team, parse_schedule)
+                else:
+                    frame = parse_schedule(html, team)
+            except Exception as e:
+                errors[team] = str(e)
+                print(f"⚠️ Skipping {team}: {e}")
+                return
+            frames.append(frame)
+            if on_result is not None:
+                on_result(team, frame)
+            done = len(frames) + len(errors)
+            if done % 25 == 0 or done == len(teams):
+                print(f"⏱ {done}/{len(teams)} teams in {time.perf_counter() - started:.0f}s")
+
+        await asyncio.gather(*(one(team, slug) for team, slug in teams.items()))
+
+    return frames, errors
+
+
+def scrape_season(season, teams=None, out=None, base_url=BASE_URL, **kwargs):
+    """
+    Scrape a full season and write ncaa_games_{season}.csv.
+
+    Replaces notebook Cell 3: same de-duplicated games table with margin, but
+    paced by the rate limiter rather than fixed sleeps.
+    """
+    out = out or f"ncaa_games_{season}.csv"
+
+    async def run():
+        team_map = teams
+        if team_map is None:
+            team_map = await fetch_teams(season, base_url)
+            print(f"✅  Teams found: {len(team_map)}")
+        return await scrape_schedules(team_map, season, base_url=base_url, **kwargs)
+
+    frames, errors = asyncio.run(run())
+    if not frames:
+        raise ScrapeError(f"No schedules scraped for {season} ({len(errors)} errors)")
+
+    games = combine_games(frames)
+    games.to_csv(out, index=False)
+    print(f"✅ Scraped & saved {len(games)} games → {out} ({len(errors)} teams skipped)")
+    return games
+
+
+# ======================
+# Local stand-in server
+# ======================
+
+@contextlib.asynccontextmanager
+async def canned_site(pages, host="127.0.0.1", port=0, fail_first=None):
+    """
+    Serve canned pages ({path: html}) from a local aiohttp server.
+
+    fail_first ({path: n}) answers the first n requests for a path with a 429
+    so retry/back-off can be exercised. Yields the base URL as a CannedSite,
+    whose .log lists (monotonic time, path) for every request received.
+    """
+    from aiohttp import web
+
+    remaining = dict(fail_first or {})
+    log = []
+
+    async def handler(request):
+        log.append((time.monotonic(), request.path))
+        if remaining.get(request.path, 0) > 0:
+            remaining[request.path] -= 1
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        if request.path not in pages:
+            return web.Response(status=404)
+        return web.Response(text=pages[request.path], content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield CannedSite(f"http://{host}:{bound_port}", log)
+    finally:
+        await runner.cleanup()
+
+
+class CannedSite(str):
+    """Base URL of a canned_site() server, carrying its request log"""
+
+    def __new__(cls, base_url, log):
+        obj = super().__new__(cls, base_url)
+        obj.log = log
+        return obj
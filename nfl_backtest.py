@@ -0,0 +1,220 @@
+"""
+Rolling-origin (walk-forward) backtest of the point-differential model.
+
+predictions_vs_spread.csv is a single train-on-2021-2023 / test-on-2024
+snapshot. This engine replays the season week by week instead: for every
+(season, week) fold it fits on all games played before that week and predicts
+that week's games, walking forward through 2019-2024.
+
+  - the model matrix is built once, sorted by (season, week), and cached as
+    .npy files; each fold's training set is just a prefix of it, and worker
+    processes memory-map the arrays instead of receiving pickled frames
+  - folds are independent, so they run on a process pool
+  - MAE / RMSE / against-the-spread hit rates are computed with vectorized
+    numpy/pandas groupbys over the stacked predictions
+
+Usage:
+    from nfl_backtest import run_backtest
+    predictions, summary = run_backtest(game_data, seasons=range(2019, 2025))
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from nfl_training import CAT_FEATURES, CORE_FEATURES, TARGET, feature_set_hash, model_frame
+
+BACKTEST_CACHE_DIR = os.path.join("model_cache", "backtest")
+
+# Lighter than the notebook's 1500 iterations: there is no eval set to early-stop on
+BACKTEST_PARAMS = {
+    "iterations": 400,
+    "learning_rate": 0.05,
+    "depth": 5,
+    "loss_function": "Quantile:alpha=0.5",
+}
+
+
+def build_matrix(game_data, features=CORE_FEATURES, target=TARGET, cache_dir=BACKTEST_CACHE_DIR):
+    """
+    Sort games by (season, week), build the model matrix once and cache it on disk.
+
+    Returns:
+        (matrix_dir, games) where games holds the row-aligned identifiers,
+        target and spread_line for every row of the cached matrix
+    """
+    cat_features = [c for c in CAT_FEATURES if c in features]
+    games = game_data.dropna(subset=list(features) + [target])
+    games = games.sort_values(["season", "week", "game_id"], kind="stable").reset_index(drop=True)
+
+    key = feature_set_hash(games, features, cat_features, target, (int(games["season"].min()),
+                           int(games["season"].max())), None)
+    matrix_dir = os.path.join(cache_dir, key)
+    if not os.path.exists(os.path.join(matrix_dir, "y.npy")):
+        os.makedirs(matrix_dir, exist_ok=True)
+        X = model_frame(games, features, cat_features).to_numpy(dtype=np.float32)
+        np.save(os.path.join(matrix_dir, "X.npy"), X)
+        np.save(os.path.join(matrix_dir, "y.npy"), games[target].to_numpy(dtype=np.float32))
+
+    id_cols = ["game_id", "season", "week", "home_team", "away_team", target]
+    if "spread_line" in games.columns:
+        id_cols.append("spread_line")
+    return matrix_dir, games[id_cols].copy()
+
+
+def fit_predict_catboost(X_train, y_train, X_test, features, params, thread_count=1):
+    """Retrain CatBoost from scratch on the fold's history"""
+    from catboost import CatBoostRegressor
+
+    cat_idx = [i for i, f in enumerate(features) if f in CAT_FEATURES]
+    X_train = pd.DataFrame(X_train, columns=features)
+    X_test = pd.DataFrame(X_test, columns=features)
+    for i in cat_idx:
+        X_train[features[i]] = X_train[features[i]].astype(int)
+        X_test[features[i]] = X_test[features[i]].astype(int)
+
+    model = CatBoostRegressor(**params, thread_count=thread_count, verbose=0, allow_writing_files=False)
+    model.fit(X_train, y_train, cat_features=cat_idx)
+    return model.predict(X_test)
+
+
+def fit_predict_ridge(X_train, y_train, X_test, features, params, thread_count=1):
+    """Cheap closed-form refit (ridge regression) for quick walk-forward sweeps"""
+    alpha = params.get("alpha", 1.0)
+    mean, std = X_train.mean(axis=0), X_train.std(axis=0)
+    std[std == 0] = 1.0
+    A = np.hstack([(X_train - mean) / std, np.ones((len(X_train), 1), dtype=X_train.dtype)])
+    reg = alpha * np.eye(A.shape[1])
+    reg[-1, -1] = 0.0  # don't shrink the intercept
+    coefs = np.linalg.solve(A.T @ A + reg, A.T @ y_train)
+    B = np.hstack([(X_test - mean) / std, np.ones((len(X_test), 1), dtype=X_test.dtype)])
+    return B @ coefs
+
+
+FIT_PREDICT = {
+    "retrain": fit_predict_catboost,
+    "refit": fit_predict_ridge,
+}
+
+
+def _run_fold(matrix_dir, train_end, test_start, test_end, features, mode, params, thread_count):
+    """Fit on rows [0, train_end) and predict rows [test_start, test_end) of the cached matrix"""
+    X = np.load(os.path.join(matrix_dir, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(matrix_dir, "y.npy"), mmap_mode="r")
+    preds = FIT_PREDICT[mode](
+        np.asarray(X[:train_end]), np.asarray(y[:train_end]),
+        np.asarray(X[test_start:test_end]), list(features), params, thread_count,
+    )
+    return test_start, np.asarray(preds, dtype=float)
+
+
+def walk_forward_folds(games, seasons, min_train_games=100):
+    """
+    (train_end, test_start, test_end) row ranges for every (season, week) fold.
+
+    Because rows are sorted by (season, week), "all games before week W" is
+    always the prefix that ends where week W starts.
+    """
+    keys = games["season"].to_numpy().astype(int) * 100 + games["week"].to_numpy().astype(int)
+    fold_keys, starts = np.unique(keys, return_index=True)
+    ends = np.append(starts[1:], len(keys))
+    folds = []
+    for key, start, end in zip(fold_keys, starts, ends):
+        if key // 100 in seasons and start >= min_train_games:
+            folds.append((int(start), int(start), int(end)))
+    return folds
+
+
+def ats_results(pred, actual, spread):
+    """
+    Vectorized against-the-spread grading.
+
+    spread_line is the expected home margin (positive = home favored). The model
+    takes the home side when it predicts a bigger home margin than the line.
+    Pushes and exact agreement with the line are not graded (NaN).
+    """
+    pick_home = np.sign(pred - spread)
+    home_covers = np.sign(actual - spread)
+    graded = (pick_home != 0) & (home_covers != 0) & ~np.isnan(spread)
+    return np.where(graded, (pick_home == home_covers).astype(float), np.nan)
+
+
+def summarize(predictions, by=("season",)):
+    """MAE, RMSE, direction accuracy and ATS hit rate, overall and per group"""
+    df = predictions.assign(
+        abs_error=predictions["prediction_error"].abs(),
+        sq_error=predictions["prediction_error"] ** 2,
+        correct_direction=(np.sign(predictions["pred_point_diff"]) == np.sign(predictions["actual_point_diff"])).astype(float),
+    )
+    agg = {
+        "games": ("abs_error", "size"),
+        "mae": ("abs_error", "mean"),
+        "rmse": ("sq_error", "mean"),
+        "direction_accuracy": ("correct_direction", "mean"),
+    }
+    if "ats_hit" in df.columns:
+        agg["ats_graded"] = ("ats_hit", "count")
+        agg["ats_hit_rate"] = ("ats_hit", "mean")
+
+    per_group = df.groupby(list(by)).agg(**agg) if by else None
+    overall = df.assign(_all="all").groupby("_all").agg(**agg)
+    overall.index.name = None
+    summary = pd.concat([per_group, overall]) if per_group is not None else overall
+    summary["rmse"] = np.sqrt(summary["rmse"])
+    return summary
+
+
+def run_backtest(game_data, seasons=range(2019, 2025), features=CORE_FEATURES, mode="retrain",
+                 params=None, max_workers=None, threads_per_fold=1, min_train_games=100,
+                 cache_dir=BACKTEST_CACHE_DIR):
+    """
+    Walk forward through `seasons`, predicting each week from everything before it.
+
+    Parameters:
+        game_data (pd.DataFrame): Output of nfl_features.build_features().
+        seasons (iterable): Seasons whose weeks are predicted.
+        features (list): Model features (the notebook's feature_cols by default).
+        mode (str): "retrain" (CatBoost from scratch per fold) or "refit" (ridge refit).
+        params (dict): Model params; BACKTEST_PARAMS by default for retrain.
+        max_workers (int): Process pool size for the independent folds.
+        threads_per_fold (int): CatBoost threads inside each fold.
+        min_train_games (int): Skip folds with less history than this.
+
+    Returns:
+        (predictions, summary): per-game predictions in the predictions_vs_spread.csv
+        layout, and the per-season + overall metrics table
+    """
+    features = list(features)
+    params = params if params is not None else (BACKTEST_PARAMS if mode == "retrain" else {})
+    seasons = set(seasons)
+
+    matrix_dir, games = build_matrix(game_data, features, cache_dir=cache_dir)
+    folds = walk_forward_folds(games, seasons, min_train_games)
+    print(f"Backtesting {len(folds)} weekly folds over seasons {sorted(seasons)}")
+
+    pred = np.full(len(games), np.nan)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_run_fold, matrix_dir, train_end, test_start, test_end,
+                        features, mode, params, threads_per_fold)
+            for train_end, test_start, test_end in folds
+        ]
+        for future in futures:
+            start, fold_pred = future.result()
+            pred[start:start + len(fold_pred)] = fold_pred
+
+    predicted = ~np.isnan(pred)
+    predictions = games.loc[predicted].copy()
+    predictions["pred_point_diff"] = pred[predicted]
+    predictions["actual_point_diff"] = predictions[TARGET].astype(float)
+    predictions["prediction_error"] = predictions["pred_point_diff"] - predictions["actual_point_diff"]
+    if "spread_line" in predictions.columns:
+        predictions["ats_hit"] = ats_results(
+            predictions["pred_point_diff"].to_numpy(),
+            predictions["actual_point_diff"].to_numpy(),
+            predictions["spread_line"].to_numpy(dtype=float),
+        )
+
+    summary = summarize(predictions)
+    return predictions.reset_index(drop=True), summary
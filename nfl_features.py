@@ -0,0 +1,739 @@
+"""
+Season-partitioned NFL feature build (the game_data pipeline from NFL_Fixed.ipynb).
+
+The notebook builds every season at once in a single process. Here the build is
+split into per-season tasks:
+
+  1. build_season(season)   - independent work for one season: pbp aggregation
+                              into team_game_stats / team_def_stats, the game
+                              frame, starter scores, weekly position scores and
+                              the season's position baselines.
+  2. finish_season(S, S-1)  - the parts that need the prior season: position
+                              deltas against last season's baselines and the
+                              prior-season-weighted rolling EPA averages.
+
+Stage 1 runs on a process pool and is cached per season, so a full rebuild
+scales with cores and a single stale season can be rebuilt alone:
+
+    game_data = build_features(depth_starters=depth_starters,
+                               score_tables=score_tables,
+                               rebuild=[2024])
+
+Results are concatenated in season order, so the output is deterministic
+regardless of which worker finished first.
+"""
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from nfl_schema import concat_stages, enforce_schema, register_frames, stage
+
+SEASONS = list(range(2018, 2025))
+REPLACEMENT_LEVEL = 55.0
+FEATURE_CACHE_DIR = "feature_cache"
+
+# Starter score column per mapped depth position (notebook cell 91)
+POSITION_GROUPS = {
+    "QB": "avg_qb_score",
+    "RB": "avg_rb_score",
+    "WR": "avg_wr_score",
+    "TE": "avg_te_score",
+    "T": "avg_ol_score",
+    "G": "avg_ol_score",
+    "C": "avg_ol_score",
+    "DE": "avg_edge_score",
+    "DT": "avg_di_score",
+    "OLB": "avg_lb_score",
+    "ILB": "avg_lb_score",
+    "CB": "avg_cb_score",
+    "S": "avg_s_score",
+}
+
+# (position, score column) pairs; the score tables themselves are passed in
+# as {position: score_df} because they come from the PFF exports
+POSITION_CONFIGS = [
+    ("QB", "qb_value_score"),
+    ("RB", "rb_value_score"),
+    ("WR", "wr_value_score"),
+    ("TE", "wr_value_score"),
+    ("OL", "ol_value_score"),
+    ("EDGE", "edge_value_score"),
+    ("DI", "di_value_score"),
+    ("LB", "lb_value_score"),
+    ("CB", "cb_value_score"),
+    ("S", "safety_value_score"),
+]
+
+DELTA_POSITIONS = ["qb", "rb", "wr", "te", "ol", "cb", "edge", "di"]
+ROLLING_STATS = ["avg_starting_field_position", "sack_rate", "sack_rate_def"]
+
+
+# ======================
+# DATA LOADING
+# ======================
+def load_pbp_season(season):
+    """Load one season of play-by-play from nflverse"""
+    from nfl_data_py import import_pbp_data
+    return import_pbp_data([season])
+
+
+def load_schedule_season(season):
+    """Load one season of schedules (scores, spread lines) from nflverse"""
+    from nfl_data_py import import_schedules
+    return import_schedules([season])
+
+
+# ======================
+# PBP AGGREGATION
+# ======================
+@stage("team_game_stats")
+def build_team_game_stats(pbp: pd.DataFrame) -> pd.DataFrame:
+    """Offensive per-(game, team) stats, including the explosive/red-zone add-ons"""
+    pbp_offense = pbp[pbp["posteam"].notna()].copy()
+
+    team_game_stats = pbp_offense.groupby(["game_id", "posteam"], observed=True).agg(
+        plays=("play_id", "count"),
+        total_yards=("yards_gained", "sum"),
+        total_epa=("epa", "sum"),
+        epa_per_play=("epa", "mean"),
+        pass_plays=("pass_attempt", "sum"),
+        rush_plays=("rush_attempt", "sum"),
+        pass_yards=("passing_yards", "sum"),
+        rush_yards=("rushing_yards", "sum"),
+        third_down_conversions=("third_down_converted", "sum"),
+        third_down_failures=("third_down_failed", "sum"),
+        fourth_down_conversions=("fourth_down_converted", "sum"),
+        fourth_down_failures=("fourth_down_failed", "sum"),
+        penalties=("penalty", "sum"),
+        interceptions=("interception", "sum"),
+        fumbles_lost=("fumble_lost", "sum")
+    ).reset_index()
+
+    team_game_stats["third_down_attempts"] = (
+        team_game_stats["third_down_conversions"] + team_game_stats["third_down_failures"]
+    )
+    team_game_stats["fourth_down_attempts"] = (
+        team_game_stats["fourth_down_conversions"] + team_game_stats["fourth_down_failures"]
+    )
+    team_game_stats["turnovers"] = team_game_stats["interceptions"] + team_game_stats["fumbles_lost"]
+    team_game_stats["yards_per_play"] = team_game_stats["total_yards"] / team_game_stats["plays"]
+
+    # Explosive plays, dropbacks and red-zone TDs
+    pbp_offense["explosive_play"] = (
+        (pbp_offense["passing_yards"] > 20) | (pbp_offense["rushing_yards"] > 20)
+    ).astype(int)
+    pbp_offense["dropbacks"] = pbp_offense["qb_dropback"]
+    pbp_offense["red_zone_td"] = (
+        (pbp_offense["yardline_100"] <= 20) & (pbp_offense["touchdown"] == 1)
+    ).astype(int)
+
+    offensive_addons = pbp_offense.groupby(["game_id", "posteam"], observed=True).agg(
+        explosive_plays=("explosive_play", "sum"),
+        red_zone_tds=("red_zone_td", "sum"),
+        sacks=("sack", "sum"),
+        dropbacks=("dropbacks", "sum"),
+        avg_starting_field_position=("yardline_100", "mean"),
+        total_penalties=("penalty", "sum")
+    ).reset_index()
+
+    team_game_stats = team_game_stats.merge(offensive_addons, on=["game_id", "posteam"], how="left")
+    team_game_stats["sack_rate"] = (
+        team_game_stats["sacks"] / team_game_stats["dropbacks"].replace(0, np.nan)
+    )
+    team_game_stats["penalties_per_play"] = team_game_stats["total_penalties"] / team_game_stats["plays"]
+    return team_game_stats
+
+
+@stage("team_def_stats")
+def build_team_def_stats(pbp: pd.DataFrame) -> pd.DataFrame:
+    """Defensive per-(game, team) stats (the cell 21 version used by game_data)"""
+    pbp_defense = pbp[pbp["defteam"].notna()].copy()
+
+    pbp_defense["explosive_play_allowed"] = (
+        (pbp_defense["passing_yards"] > 20) | (pbp_defense["rushing_yards"] > 20)
+    ).astype(int)
+    pbp_defense["dropbacks_faced"] = pbp_defense["qb_dropback"]
+    pbp_defense["red_zone_td_allowed"] = (
+        (pbp_defense["yardline_100"] <= 20) & (pbp_defense["touchdown"] == 1)
+    ).astype(int)
+
+    team_def_stats = pbp_defense.groupby(["game_id", "defteam"], observed=True).agg(
+        explosive_plays_allowed=("explosive_play_allowed", "sum"),
+        red_zone_tds_allowed=("red_zone_td_allowed", "sum"),
+        sacks_made=("sack", "sum"),
+        dropbacks_faced=("dropbacks_faced", "sum"),
+        avg_starting_field_position_allowed=("yardline_100", "mean"),
+        total_penalties_by_defense=("penalty", "sum")
+    ).reset_index()
+
+    team_def_stats["sack_rate_def"] = (
+        team_def_stats["sacks_made"] / team_def_stats["dropbacks_faced"].replace(0, np.nan)
+    )
+    team_def_stats["penalties_per_play_def"] = (
+        team_def_stats["total_penalties_by_defense"] / team_def_stats["dropbacks_faced"].replace(0, np.nan)
+    )
+    return team_def_stats
+
+
+def _prefixed(stats, side, team_col):
+    """Prefix stat columns with home_/away_ and rename the team key"""
+    out = stats.rename(columns=lambda x: f"{side}_{x}" if x not in ["game_id", team_col] else x)
+    return out.rename(columns={team_col: f"{side}_team"})
+
+
+@stage("game_data")
+def assemble_game_data(pbp, team_game_stats, team_def_stats, schedule):
+    """One row per game: home/away offense and defense side by side plus final scores"""
+    games_df = pbp[["game_id", "home_team", "away_team"]].drop_duplicates()
+
+    game_data = games_df.merge(_prefixed(team_game_stats, "home", "posteam"), on=["game_id", "home_team"])
+    game_data = game_data.merge(_prefixed(team_game_stats, "away", "posteam"), on=["game_id", "away_team"])
+    game_data = game_data.merge(_prefixed(team_def_stats, "home", "defteam"), on=["game_id", "home_team"])
+    game_data = game_data.merge(_prefixed(team_def_stats, "away", "defteam"), on=["game_id", "away_team"])
+
+    score_cols = ["game_id", "home_score", "away_score"]
+    if "spread_line" in schedule.columns:
+        score_cols.append("spread_line")
+    game_data = game_data.merge(schedule[score_cols], on="game_id", how="left")
+
+    extracted = game_data["game_id"].astype(str).str.extract(r"(?P<season>\d{4})_(?P<week>\d{1,2})_")
+    game_data["season"] = extracted["season"].astype(int)
+    game_data["week"] = extracted["week"].astype(int)
+    return game_data.sort_values(["week", "game_id"]).reset_index(drop=True)
+
+
+# ======================
+# STARTER SCORES
+# ======================
+@stage("team_starter_scores")
+def build_team_starter_scores(depth_starters: pd.DataFrame) -> pd.DataFrame:
+    """Average starter score per (season, week, team) for each position group"""
+    starters = depth_starters.copy()
+    starters["score_col_name"] = starters["mapped_depth_position"].astype(str).map(POSITION_GROUPS)
+    starters = starters[starters["score_col_name"].notna()]
+
+    team_starter_scores = (
+        starters.groupby(["season", "week", "club_code", "score_col_name"], observed=True)["score"]
+        .mean()
+        .unstack()
+        .reset_index()
+    )
+    team_starter_scores.columns.name = None
+    return team_starter_scores
+
+
+def compute_weekly_position_scores_from_starters(
+    depth_starters: pd.DataFrame,
+    year: int,
+    position: str,
+    score_column: str = "score"
+) -> pd.DataFrame:
+    """
+    Computes average weekly position scores based on who actually started each week.
+
+    Parameters:
+        depth_starters (pd.DataFrame): DataFrame of actual starters.
+        year (int): The season year to analyze.
+        position (str): The position to filter for (e.g., "QB", "EDGE").
+        score_column (str): Name of the column with player scores.
+
+    Returns:
+        pd.DataFrame with columns: ['team', 'week', 'season', 'position', 'weekly_score']
+    """
+    filtered = depth_starters[
+        (depth_starters["season"] == year) &
+        (depth_starters["modeled_position"] == position)
+    ].copy()
+
+    filtered = filtered.drop(columns=["team"], errors="ignore")
+    filtered = filtered.rename(columns={"club_code": "team"})
+    filtered[score_column] = filtered[score_column].fillna(REPLACEMENT_LEVEL)
+
+    grouped = (
+        filtered.groupby(["team", "week"], observed=True)
+        [score_column]
+        .mean()
+        .reset_index()
+        .rename(columns={score_column: "weekly_score"})
+    )
+    grouped["weekly_score"] = grouped["weekly_score"].fillna(REPLACEMENT_LEVEL)
+    grouped["season"] = year
+    grouped["position"] = position
+
+    return grouped[["team", "week", "season", "position", "weekly_score"]]
+
+
+def compute_position_baseline_from_starters(
+    depth_starters: pd.DataFrame,
+    score_df: pd.DataFrame,
+    year: int,
+    position: str,
+    value_score_column: str = "value_score"
+) -> pd.DataFrame:
+    """
+    Computes a team's baseline score at a specific position for a given year
+    based on who actually started — using the *next year's* player scores.
+
+    Parameters:
+        depth_starters (pd.DataFrame): DataFrame of starting players with team info.
+        score_df (pd.DataFrame): Full DataFrame of all player scores across seasons.
+        year (int): The season year to analyze.
+        position (str): Position to compute baseline for (e.g., "QB", "EDGE").
+        value_score_column (str): Name of the score column in score_df.
+
+    Returns:
+        pd.DataFrame with columns: ['team', 'baseline_score', 'season', 'position']
+    """
+    filtered = depth_starters[
+        (depth_starters["season"] == year) &
+        (depth_starters["modeled_position"] == position)
+    ].copy()
+
+    filtered = filtered.drop(columns=["team"], errors="ignore")
+    filtered = filtered.rename(columns={"club_code": "team"})
+
+    starts = (
+        filtered
+        .groupby(["team", "full_name"], observed=True)
+        .size()
+        .reset_index(name="games_started")
+    )
+
+    scores_next_year = score_df[score_df["season"] == (year + 1)]
+    if scores_next_year.empty:
+        raise ValueError(f"No player score data available for year {year + 1}")
+
+    scores_next_year = scores_next_year[["full_name", value_score_column]].copy()
+    # Names may be categorical with different dictionaries on each side
+    starts["full_name"] = starts["full_name"].astype(str)
+    scores_next_year["full_name"] = scores_next_year["full_name"].astype(str)
+
+    merged = starts.merge(scores_next_year, on="full_name", how="left")
+    merged[value_score_column] = merged[value_score_column].fillna(REPLACEMENT_LEVEL)
+    merged["weighted_score"] = merged[value_score_column] * merged["games_started"]
+
+    merged["team"] = merged["team"].astype(str)
+    team_totals = (
+        merged.groupby("team")
+        .agg(
+            total_weighted_score=("weighted_score", "sum"),
+            total_games_started=("games_started", "sum")
+        )
+        .reset_index()
+    )
+
+    team_totals["baseline_score"] = team_totals["total_weighted_score"] / team_totals["total_games_started"]
+    team_totals["season"] = year
+    team_totals["position"] = position
+
+    return team_totals[["team", "baseline_score", "season", "position"]]
+
+
+@stage("weekly_position_scores")
+def build_weekly_position_scores(depth_starters, season):
+    """Weekly starter score for every modeled position in one season"""
+    weekly = [
+        compute_weekly_position_scores_from_starters(depth_starters, season, position)
+        for position, _ in POSITION_CONFIGS
+    ]
+    weekly = [w for w in weekly if not w.empty]
+    if not weekly:
+        return pd.DataFrame(columns=["team", "week", "season", "position", "weekly_score"])
+    return pd.concat(weekly, ignore_index=True)
+
+
+@stage("position_baselines")
+def build_position_baselines(depth_starters, score_tables, season):
+    """Baseline score for every modeled position in one season"""
+    baselines = []
+    for position, score_col in POSITION_CONFIGS:
+        if position not in score_tables:
+            continue
+        try:
+            baselines.append(compute_position_baseline_from_starters(
+                depth_starters=depth_starters,
+                score_df=score_tables[position],
+                year=season,
+                position=position,
+                value_score_column=score_col
+            ))
+        except ValueError as e:
+            print(f"Skipping {season} {position} due to error: {e}")
+    if not baselines:
+        return pd.DataFrame(columns=["team", "baseline_score", "season", "position"])
+    return pd.concat(baselines, ignore_index=True)
+
+
+@stage("position_deltas")
+def build_position_deltas(weekly_scores, prior_baselines):
+    """
+    Wide (season, week, team) table of weekly score minus last season's baseline.
+
+    This is the only step of the position features that depends on the prior season.
+    """
+    baselines_trimmed = prior_baselines.rename(columns={"season": "prior_season"})[
+        ["team", "position", "prior_season", "baseline_score"]
+    ]
+    weekly = weekly_scores.copy()
+    weekly["prior_season"] = weekly["season"] - 1
+    for col in ["team", "position"]:
+        weekly[col] = weekly[col].astype(str)
+        baselines_trimmed = baselines_trimmed.assign(**{col: baselines_trimmed[col].astype(str)})
+
+    with_deltas = weekly.merge(baselines_trimmed, on=["team", "position", "prior_season"], how="left")
+    with_deltas["position_delta"] = with_deltas["weekly_score"] - with_deltas["baseline_score"]
+
+    wide = with_deltas.pivot_table(
+        index=["season", "week", "team"],
+        columns="position",
+        values="position_delta",
+        dropna=False
+    ).reset_index()
+    wide.columns = [
+        col if col in ("season", "week", "team") else f"{col.lower()}_delta"
+        for col in wide.columns
+    ]
+    return wide
+
+
+def _merge_team_table(game_data, table, team_key, value_cols):
+    """Merge a (season, week, team) table onto game_data once for home and once for away"""
+    table = table.copy()
+    table[team_key] = table[team_key].astype(str)
+    for side in ("home", "away"):
+        side_table = table.rename(columns={team_key: f"{side}_team", **{c: f"{side}_{c}" for c in value_cols}})
+        game_data = game_data.merge(side_table, on=["season", "week", f"{side}_team"], how="left")
+    return game_data
+
+
+# ======================
+# ROLLING TEAM FEATURES
+# ======================
+def _team_long(game_data):
+    """One row per (game, team) with the team's own offense and what its defense allowed"""
+    sides = []
+    for side, opp in (("home", "away"), ("away", "home")):
+        sides.append(pd.DataFrame({
+            "game_id": game_data["game_id"].astype(str),
+            "season": game_data["season"].astype(int),
+            "week": game_data["week"].astype(int),
+            "team": game_data[f"{side}_team"].astype(str),
+            "side": side,
+            "off_epa": game_data[f"{side}_epa_per_play"].astype(float),
+            "def_epa": game_data[f"{opp}_epa_per_play"].astype(float),
+            **{stat: game_data[f"{side}_{stat}"].astype(float) for stat in ROLLING_STATS},
+        }))
+    return pd.concat(sides, ignore_index=True).sort_values(["team", "week"], kind="stable")
+
+
+def _blend_with_prior(long, prior_long, cols):
+    """
+    Ramp-weighted blend of this season's games so far and last season's average
+    (week 1 = all prior season, week 9+ = all current season).
+    """
+    grouped = long.groupby("team")
+    counts = grouped.cumcount()
+    weight_current = np.minimum(long["week"] / 9, 1.0)
+
+    if prior_long is not None and not prior_long.empty:
+        prior_avg = prior_long.groupby("team")[cols].mean()
+    else:
+        prior_avg = pd.DataFrame(columns=cols, dtype=float)
+
+    out = {}
+    for col in cols:
+        # Mean over the team's earlier games this season (current game excluded)
+        curr = (grouped[col].cumsum() - long[col].fillna(0)) / counts.replace(0, np.nan)
+        prev = long["team"].map(prior_avg[col]) if col in prior_avg else pd.Series(np.nan, index=long.index)
+        blended = weight_current * curr + (1 - weight_current) * prev
+        out[col] = blended.where(curr.notna() & prev.notna(), curr.fillna(prev))
+    return pd.DataFrame(out, index=long.index)
+
+
+@stage("rolling_team_features")
+def add_rolling_team_features(game_data, prior_game_data=None):
+    """
+    Prior-season-weighted EPA/field-position/sack-rate averages and 3-week form.
+
+    Vectorized replacement for the iterrows loops in notebook cells 137-145;
+    needs the previous season's game_data for the early-week prior.
+    """
+    long = _team_long(game_data)
+    prior_long = _team_long(prior_game_data) if prior_game_data is not None else None
+
+    blended = _blend_with_prior(long, prior_long, ["off_epa", "def_epa"] + ROLLING_STATS)
+    form = long.groupby("team")[["off_epa", "def_epa"]].transform(
+        lambda s: s.rolling(3, min_periods=1).mean().shift(1)
+    )
+
+    features = pd.DataFrame({
+        "game_id": long["game_id"],
+        "side": long["side"],
+        "team_epa": blended["off_epa"],
+        "def_epa": blended["def_epa"],
+        "off_epa_3week": form["off_epa"],
+        "def_epa_3week": form["def_epa"],
+        **{stat: blended[stat] for stat in ROLLING_STATS},
+    })
+
+    game_data = game_data.copy()
+    game_data["game_id"] = game_data["game_id"].astype(str)
+    for side in ("home", "away"):
+        side_features = features[features["side"] == side].drop(columns="side").set_index("game_id")
+        game_data[f"avg_{side}_team_epa"] = game_data["game_id"].map(side_features["team_epa"])
+        game_data[f"avg_{side}_def_epa"] = game_data["game_id"].map(side_features["def_epa"])
+        game_data[f"avg_{side}_off_epa_3week"] = game_data["game_id"].map(side_features["off_epa_3week"])
+        game_data[f"avg_{side}_def_epa_3week"] = game_data["game_id"].map(side_features["def_epa_3week"])
+        game_data[f"{side}_off_minus_def"] = game_data[f"avg_{side}_team_epa"] - game_data[f"avg_{side}_def_epa"]
+        for stat in ROLLING_STATS:
+            game_data[f"avg_{side}_{stat}"] = game_data["game_id"].map(side_features[stat])
+    return game_data
+
+
+@stage("model_features")
+def add_model_features(game_data):
+    """Home-minus-away model inputs and the point_diff target (notebook cell 147)"""
+    game_data = game_data.copy()
+    for pos in DELTA_POSITIONS:
+        home_col, away_col = f"home_{pos}_delta", f"away_{pos}_delta"
+        if home_col in game_data and away_col in game_data:
+            game_data[f"{pos}_delta_diff"] = game_data[home_col] - game_data[away_col]
+
+    game_data["epa_diff"] = game_data["avg_home_team_epa"] - game_data["avg_away_team_epa"]
+    game_data["def_epa_diff"] = game_data["avg_home_def_epa"] - game_data["avg_away_def_epa"]
+    game_data["epa_diff_combo"] = game_data["epa_diff"] - game_data["def_epa_diff"]
+    game_data["Hotness_epaO"] = game_data["avg_home_off_epa_3week"] - game_data["avg_away_off_epa_3week"]
+    game_data["Hotness_epaD"] = game_data["avg_home_def_epa_3week"] - game_data["avg_away_def_epa_3week"]
+    game_data["Hotness3wk"] = game_data["Hotness_epaO"] - game_data["Hotness_epaD"]
+
+    # Fill NaNs in rolling 3-week features with 0 for early weeks (e.g. week 1)
+    fill_zero_cols = [
+        "avg_home_off_epa_3week", "avg_away_off_epa_3week",
+        "avg_home_def_epa_3week", "avg_away_def_epa_3week",
+        "Hotness_epaO", "Hotness_epaD", "Hotness3wk"
+    ]
+    game_data[fill_zero_cols] = game_data[fill_zero_cols].fillna(0)
+
+    game_data["is_playoff"] = (game_data["week"] > 18).astype(int)
+    game_data["point_diff"] = game_data["home_score"] - game_data["away_score"]
+    game_data["FPODIFF"] = (
+        game_data["avg_home_avg_starting_field_position"] - game_data["avg_away_avg_starting_field_position"]
+    )
+    return game_data
+
+
+# ======================
+# SEASON TASKS
+# ======================
+def build_season(season, depth_starters=None, score_tables=None,
+                 load_pbp=load_pbp_season, load_schedule=load_schedule_season):
+    """
+    Stage 1 for one season: everything that does not need another season's output.
+
+    Runs in a worker process, so it loads its own pbp/schedule rather than
+    receiving them pickled from the parent. `depth_starters` is this season's
+    slice; `score_tables` only needs next season's rows (for the baselines).
+
+    Returns:
+        dict with game_data, weekly_scores and baselines frames for the season
+    """
+    pbp = load_pbp(season)
+    schedule = load_schedule(season)
+
+    team_game_stats = build_team_game_stats(pbp)
+    team_def_stats = build_team_def_stats(pbp)
+    game_data = assemble_game_data(pbp, team_game_stats, team_def_stats, schedule)
+    del pbp
+
+    result = {"season": season, "game_data": game_data, "weekly_scores": None, "baselines": None}
+
+    if depth_starters is not None and not depth_starters.empty:
+        starter_scores = build_team_starter_scores(depth_starters)
+        score_cols = [c for c in starter_scores.columns if c not in ("season", "week", "club_code")]
+        game_data = _merge_team_table(game_data, starter_scores, "club_code", score_cols)
+        # Missing starters are treated as replacement level
+        game_data[[f"{side}_{c}" for side in ("home", "away") for c in score_cols]] = (
+            game_data[[f"{side}_{c}" for side in ("home", "away") for c in score_cols]].fillna(REPLACEMENT_LEVEL)
+        )
+        result["game_data"] = enforce_schema(game_data, f"game_data_with_starters_{season}")
+        result["weekly_scores"] = build_weekly_position_scores(depth_starters, season)
+        result["baselines"] = build_position_baselines(depth_starters, score_tables or {}, season)
+
+    return result
+
+
+def finish_season(current, prior=None):
+    """
+    Stage 2 for one season: join the parts that depend on the prior season.
+
+    Parameters:
+        current (dict): build_season() output for season S.
+        prior (dict): build_season() output for season S-1, or None for the first season.
+
+    Returns:
+        pd.DataFrame: the finished game_data rows for season S
+    """
+    game_data = current["game_data"]
+
+    if current["weekly_scores"] is not None and prior is not None and prior["baselines"] is not None:
+        deltas = build_position_deltas(current["weekly_scores"], prior["baselines"])
+        delta_cols = [c for c in deltas.columns if c.endswith("_delta")]
+        game_data = _merge_team_table(game_data, deltas, "team", delta_cols)
+
+    prior_game_data = prior["game_data"] if prior is not None else None
+    game_data = add_rolling_team_features(game_data, prior_game_data)
+    return add_model_features(game_data)
+
+
+def _season_cache_path(cache_dir, season):
+    return os.path.join(cache_dir, f"season_{season}.pkl")
+
+
+def _season_inputs(season, depth_starters, score_tables):
+    """Slice the shared inputs down to what one season's task needs"""
+    starters = None
+    if depth_starters is not None:
+        starters = depth_starters[depth_starters["season"] == season]
+    tables = None
+    if score_tables is not None:
+        tables = {pos: df[df["season"] == season + 1] for pos, df in score_tables.items()}
+    return starters, tables
+
+
+def build_features(seasons=SEASONS, depth_starters=None, score_tables=None,
+                   cache_dir=FEATURE_CACHE_DIR, rebuild=(), max_workers=None,
+                   load_pbp=load_pbp_season, load_schedule=load_schedule_season):
+    """
+    Build game_data for all seasons with per-season tasks on a process pool.
+
+    Parameters:
+        seasons (list): Seasons to build (prior-season features need S-1 in the list).
+        depth_starters (pd.DataFrame): Starters with scores (notebook `depth_starters`).
+        score_tables (dict): {position: score_df} for the position baselines,
+            e.g. {"QB": qb_scores_by_year, "RB": rb_scores_by_year, ...}.
+        cache_dir (str): Where per-season stage 1 results are pickled; None disables caching.
+        rebuild (iterable): Seasons to rebuild even if cached (e.g. the current season).
+        max_workers (int): Process pool size (defaults to os.cpu_count()).
+        load_pbp / load_schedule: Module-level loaders, called inside the workers.
+
+    Returns:
+        pd.DataFrame: game_data for all seasons, ordered by season, week, game_id
+    """
+    seasons = sorted(seasons)
+    rebuild = set(rebuild)
+    results = {}
+
+    # One player dictionary for every stage, registered before any stage casts
+    # (forked workers inherit it)
+    register_frames(depth_starters, *(score_tables or {}).values())
+
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        for season in seasons:
+            path = _season_cache_path(cache_dir, season)
+            if season not in rebuild and os.path.exists(path):
+                with open(path, "rb") as f:
+                    results[season] = pickle.load(f)
+
+    stale = [s for s in seasons if s not in results]
+    if stale:
+        print(f"Building seasons {stale} ({len(seasons) - len(stale)} cached)")
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            for season in stale:
+                starters, tables = _season_inputs(season, depth_starters, score_tables)
+                futures[season] = pool.submit(
+                    build_season, season, starters, tables, load_pbp, load_schedule
+                )
+            for season in stale:
+                results[season] = futures[season].result()
+                if cache_dir:
+                    with open(_season_cache_path(cache_dir, season), "wb") as f:
+                        pickle.dump(results[season], f)
+
+    # Stage 2 walks seasons in order; each one only needs its predecessor
+    finished = []
+    for season in seasons:
+        finished.append(finish_season(results[season], results.get(season - 1)))
+
+    game_data = concat_stages(finished, ignore_index=True)
+    game_data = game_data.sort_values(["season", "week", "game_id"], kind="stable").reset_index(drop=True)
+    return enforce_schema(game_data, "game_data_all_seasons")
+
+
+# ======================
+# SERVING TABLE
+# ======================
+TEAM_WEEK_COLUMNS = {
+    "team_epa": "avg_{side}_team_epa",
+    "def_epa": "avg_{side}_def_epa",
+    "off_epa_3week": "avg_{side}_off_epa_3week",
+    "def_epa_3week": "avg_{side}_def_epa_3week",
+    "avg_starting_field_position": "avg_{side}_avg_starting_field_position",
+    **{f"{pos}_delta": f"{{side}}_{pos}_delta" for pos in DELTA_POSITIONS},
+}
+
+# Home-minus-away model features and the per-team column they are built from
+MATCHUP_DIFFS = {
+    "epa_diff": "team_epa",
+    "def_epa_diff": "def_epa",
+    "Hotness_epaO": "off_epa_3week",
+    "Hotness_epaD": "def_epa_3week",
+    "FPODIFF": "avg_starting_field_position",
+    **{f"{pos}_delta_diff": f"{pos}_delta" for pos in DELTA_POSITIONS},
+}
+
+
+@stage("team_week_features")
+def build_team_week_features(game_data):
+    """
+    Pre-game features per (season, week, team), precomputed for serving.
+
+    Every game row already holds both teams' pre-game averages, so splitting it
+    into a home row and an away row gives a lookup table from which any
+    matchup's model features can be rebuilt without touching pbp.
+    """
+    sides = []
+    for side in ("home", "away"):
+        cols = {name: tmpl.format(side=side) for name, tmpl in TEAM_WEEK_COLUMNS.items()}
+        cols = {name: col for name, col in cols.items() if col in game_data.columns}
+        side_df = game_data[["season", "week", f"{side}_team"] + list(cols.values())].rename(
+            columns={f"{side}_team": "team", **{col: name for name, col in cols.items()}}
+        )
+        sides.append(side_df)
+    table = pd.concat(sides, ignore_index=True)
+    table["team"] = table["team"].astype(str)
+    return table.sort_values(["season", "team", "week"], kind="stable").reset_index(drop=True)
+
+
+def matchup_features(home, away, week):
+    """
+    Model features for home-vs-away matchups from two aligned team-week frames.
+
+    Mirrors add_model_features(), so a game looked up from the team table gets
+    the same inputs the model was trained on.
+    """
+    out = pd.DataFrame(index=home.index)
+    for feature, col in MATCHUP_DIFFS.items():
+        if col in home.columns and col in away.columns:
+            out[feature] = home[col].to_numpy(dtype=float) - away[col].to_numpy(dtype=float)
+    for col in ["Hotness_epaO", "Hotness_epaD"]:
+        if col in out:
+            out[col] = out[col].fillna(0)
+    if "Hotness_epaO" in out and "Hotness_epaD" in out:
+        out["Hotness3wk"] = out["Hotness_epaO"] - out["Hotness_epaD"]
+    if "epa_diff" in out and "def_epa_diff" in out:
+        out["epa_diff_combo"] = out["epa_diff"] - out["def_epa_diff"]
+    out["is_playoff"] = (np.asarray(week) > 18).astype(int)
+    return out
+
+
+def export_team_week_features(game_data, path="nfl_team_week_features.csv"):
+    """Write the serving lookup table next to app.py"""
+    table = build_team_week_features(game_data)
+    table.to_csv(path, index=False)
+    print(f"Exported {len(table)} team-week rows to {path}")
+    return table
@@ -0,0 +1,295 @@
+"""
+Compact column schema for the NFL game-prediction pipeline.
+
+The pbp-derived frames in NFL_Fixed.ipynb (team_game_stats, team_def_stats,
+depth_starters, game_data, ...) carry everything as float64/object. This module
+maps every column to a compact dtype:
+
+  - team, position and player-name columns -> shared pandas categoricals
+  - counts and weeks                        -> int8 / int16
+  - EPA, scores, deltas and other floats     -> float32
+
+Call `enforce_schema(df, stage)` (or decorate a builder with `@stage(...)`)
+at each pipeline stage boundary. Every call records a memory report in
+`stage_reports` so the whole multi-season build can be audited afterwards.
+
+Player names share one dictionary across stages. Register every name source
+once, up front (`register_frames(depth_starters, *score_tables.values())`),
+before any stage casts. Names first seen later are appended to the
+dictionary, never re-sorted into it, so codes already assigned stay valid;
+frames cast before the dictionary grew are brought up to date by
+`align_players()`, and `concat_stages()` does that before concatenating.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+# Every club code that appears in nflverse pbp/schedules/depth charts 2018-2024
+# (relocated franchises keep their old codes in the early seasons).
+NFL_TEAMS = [
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN",
+    "DET", "GB", "HOU", "IND", "JAC", "JAX", "KC", "LA", "LAC", "LAR", "LV",
+    "MIA", "MIN", "NE", "NO", "NYG", "NYJ", "OAK", "PHI", "PIT", "SD", "SEA",
+    "SF", "STL", "TB", "TEN", "WAS",
+]
+
+# Raw depth-chart positions after position_map plus the modeled groups
+MODEL_POSITIONS = [
+    "QB", "RB", "FB", "WR", "TE", "T", "G", "C", "OL", "DE", "DT", "EDGE",
+    "DI", "OLB", "ILB", "LB", "CB", "S", "K", "P",
+]
+
+TEAM_DTYPE = pd.CategoricalDtype(NFL_TEAMS)
+POSITION_DTYPE = pd.CategoricalDtype(MODEL_POSITIONS)
+
+TEAM_COLUMNS = {
+    "home_team", "away_team", "posteam", "defteam", "team", "club_code",
+    "home_abbr", "away_abbr",
+}
+POSITION_COLUMNS = {"position", "mapped_depth_position", "modeled_position"}
+PLAYER_COLUMNS = {
+    "full_name", "player", "name_normalized", "qb_name", "rb_name", "wr_name",
+    "te_name", "passer_player_name", "rusher_player_name", "receiver_player_name",
+}
+# Repeated identifiers that get their own (non-shared) dictionary
+LABEL_COLUMNS = {"game_id", "depth_position", "position_label", "score_col_name", "round"}
+
+INT8_COLUMNS = {
+    "week", "is_playoff", "depth_team", "depth_order", "games_started",
+    "interceptions", "fumbles_lost", "turnovers", "sacks", "red_zone_tds",
+    "explosive_plays", "penalties", "total_penalties",
+    "third_down_conversions", "third_down_failures", "third_down_attempts",
+    "fourth_down_conversions", "fourth_down_failures", "fourth_down_attempts",
+    "interceptions_forced", "fumbles_recovered", "turnovers_forced", "sacks_made",
+    "red_zone_tds_allowed", "explosive_plays_allowed", "penalties_committed",
+    "total_penalties_by_defense",
+    "third_down_conversions_allowed", "third_down_failures_forced",
+    "third_down_attempts_faced", "fourth_down_conversions_allowed",
+    "fourth_down_failures_forced", "fourth_down_attempts_faced",
+}
+INT16_COLUMNS = {
+    "season", "prior_season", "plays", "plays_defended", "pass_plays", "rush_plays",
+    "passes_defended", "rushes_defended", "dropbacks", "dropbacks_faced",
+    "total_yards", "pass_yards", "rush_yards", "yards_allowed",
+    "pass_yards_allowed", "rush_yards_allowed", "play_id",
+}
+
+# Per-stage memory reports, appended to by enforce_schema()
+stage_reports = []
+
+# Shared player-name dictionary; extended with register_players()
+_player_dtype = pd.CategoricalDtype([])
+
+
+def _base_name(col):
+    """Strip home_/away_ prefixes so home_sacks and away_sacks share a rule"""
+    for prefix in ("home_", "away_"):
+        if col.startswith(prefix) and col not in TEAM_COLUMNS:
+            return col[len(prefix):]
+    return col
+
+
+def register_players(*name_series):
+    """
+    Add player names to the shared player dictionary.
+
+    Call this once with every frame's name column (depth charts, rosters,
+    score tables) before enforcing the schema, so all frames share one set of
+    codes and merges on names never fall back to object dtype. New names are
+    appended after the existing ones, so earlier codes keep their meaning.
+    """
+    global _player_dtype
+    known = set(_player_dtype.categories)
+    new = set()
+    for s in name_series:
+        new.update(pd.Series(s).dropna().astype(str).unique())
+    new -= known
+    if new:
+        _player_dtype = pd.CategoricalDtype(list(_player_dtype.categories) + sorted(new))
+    return _player_dtype
+
+
+def _player_columns(df):
+    return [col for col in df.columns if _base_name(col) in PLAYER_COLUMNS]
+
+
+def register_frames(*frames):
+    """register_players() with every player-name column of the given frames"""
+    return register_players(*(df[col] for df in frames if df is not None for col in _player_columns(df)))
+
+
+def align_players(df):
+    """
+    Re-cast a frame's player columns to the current shared dictionary.
+
+    Needed for frames cast before the dictionary last grew; without it their
+    player columns have a smaller dtype and concat/merge falls back to object.
+    """
+    casts = {}
+    for col in _player_columns(df):
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) and series.dtype != _player_dtype:
+            register_players(series.cat.categories)
+            casts[col] = series.cat.set_categories(_player_dtype.categories)
+    return df.assign(**casts) if casts else df
+
+
+def concat_stages(frames, **kwargs):
+    """pd.concat for stage outputs: player columns stay on the shared categorical dtype"""
+    frames = [df for df in frames if df is not None]
+    register_frames(*frames)
+    return pd.concat([align_players(df) for df in frames], **kwargs)
+
+
+def player_dtype():
+    """Current shared player-name dtype"""
+    return _player_dtype
+
+
+def column_dtype(col, series):
+    """
+    Return the target dtype for a column, or None to leave it unchanged.
+
+    Integer targets are only used when the column has no missing values;
+    otherwise the column is stored as float32 so NaN semantics are kept.
+    """
+    name = _base_name(col)
+
+    if col in TEAM_COLUMNS:
+        return TEAM_DTYPE
+    if name in POSITION_COLUMNS:
+        return POSITION_DTYPE
+    if name in PLAYER_COLUMNS:
+        return _player_dtype
+    if name in LABEL_COLUMNS:
+        return "category"
+
+    if not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)):
+        return None
+
+    if name in INT8_COLUMNS or name in INT16_COLUMNS:
+        if series.isna().any():
+            return np.float32
+        return np.int8 if name in INT8_COLUMNS else np.int16
+
+    if pd.api.types.is_float_dtype(series):
+        return np.float32
+    if pd.api.types.is_integer_dtype(series) and series.dtype.itemsize > 4:
+        return np.int32
+    return None
+
+
+def _check_fits(col, series, dtype):
+    """Raise ValueError instead of silently wrapping an out-of-range integer"""
+    info = np.iinfo(dtype)
+    lo, hi = series.min(), series.max()
+    if lo < info.min or hi > info.max:
+        raise ValueError(
+            f"Column '{col}' range [{lo}, {hi}] does not fit {np.dtype(dtype).name}"
+        )
+    if pd.api.types.is_float_dtype(series) and not np.all(np.mod(series.to_numpy(), 1) == 0):
+        raise ValueError(f"Column '{col}' has fractional values but is declared {np.dtype(dtype).name}")
+
+
+def enforce_schema(df, stage_name=None, verbose=True):
+    """
+    Cast a pipeline frame to the compact schema and record a memory report.
+
+    Parameters:
+        df (pd.DataFrame): Frame leaving a pipeline stage.
+        stage_name (str): Label for the memory report (e.g. "team_game_stats").
+        verbose (bool): Print the report line.
+
+    Returns:
+        pd.DataFrame with compact dtypes (a new frame; the input is not modified).
+    """
+    before = df.memory_usage(deep=True).sum()
+
+    casts = {}
+    for col in df.columns:
+        series = df[col]
+        target = column_dtype(col, series)
+        if target is None or series.dtype == target:
+            continue
+        if isinstance(target, str):
+            casts[col] = series.astype(target)
+        elif isinstance(target, pd.CategoricalDtype):
+            unknown = set(series.dropna().astype(str).unique()) - set(target.categories)
+            if unknown and target is not _player_dtype:
+                raise ValueError(f"Column '{col}' has values outside the schema: {sorted(unknown)[:10]}")
+            if unknown:
+                # New players: grow the shared dictionary instead of dropping them
+                target = register_players(series)
+            casts[col] = series.astype(str).where(series.notna()).astype(target)
+        elif target in (np.int8, np.int16):
+            _check_fits(col, series, target)
+            casts[col] = series.astype(target)
+        else:
+            casts[col] = series.astype(target)
+
+    out = df.assign(**casts) if casts else df.copy()
+
+    if stage_name is not None:
+        memory_report(out, stage_name, before=before, verbose=verbose)
+    return out
+
+
+def memory_report(df, stage_name, before=None, verbose=True):
+    """Record (and optionally print) rows, columns and deep memory for a stage"""
+    after = df.memory_usage(deep=True).sum()
+    report = {
+        "stage": stage_name,
+        "rows": int(len(df)),
+        "columns": int(df.shape[1]),
+        "memory_mb": round(after / 1e6, 3),
+        "memory_mb_before": round(before / 1e6, 3) if before is not None else None,
+    }
+    stage_reports.append(report)
+
+    if verbose:
+        saved = f" (was {before / 1e6:.1f} MB)" if before is not None else ""
+        print(f"[{stage_name}] {len(df)} rows x {df.shape[1]} cols: {after / 1e6:.1f} MB{saved}")
+    return report
+
+
+def stage(stage_name):
+    """
+    Decorator for pipeline builders: enforce the schema on the returned frame.
+
+    Example:
+        @stage("team_game_stats")
+        def build_team_game_stats(pbp): ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return enforce_schema(func(*args, **kwargs), stage_name)
+        return wrapper
+    return decorator
+
+
+def read_compact_csv(path, stage_name=None):
+    """
+    Read a pipeline CSV (game_data exports, predictions_vs_spread.csv) directly
+    into the compact schema, without materializing the float64 frame first.
+    """
+    sample = pd.read_csv(path, nrows=200)
+    dtypes = {}
+    for col in sample.columns:
+        name = _base_name(col)
+        if col in TEAM_COLUMNS or name in LABEL_COLUMNS or name in POSITION_COLUMNS:
+            dtypes[col] = "category"
+        elif name in PLAYER_COLUMNS or name in INT8_COLUMNS or name in INT16_COLUMNS:
+            # Names and integer columns go through enforce_schema for the
+            # shared dictionary and range checks
+            continue
+        elif pd.api.types.is_numeric_dtype(sample[col]):
+            dtypes[col] = np.float32
+    df = pd.read_csv(path, dtype=dtypes)
+    return enforce_schema(df, stage_name or str(path))
+
+
+def summarize_stages():
+    """Return the recorded stage memory reports as a DataFrame"""
+    return pd.DataFrame(stage_reports)
@@ -0,0 +1,282 @@
+"""
+Cached, concurrent CatBoost training for the NFL point-differential models.
+
+NFL_Fixed.ipynb fits its CatBoostRegressor straight from DataFrames, so every
+re-run re-quantizes the features and retrains even when nothing changed. This
+runner:
+
+  - builds each quantized train/eval Pool once and saves it under
+    model_cache/pools/<hash>/, keyed by a hash of the feature set, target,
+    season split and the data itself
+  - trains the point-differential model and one model per position group
+    concurrently, splitting a fixed CPU thread budget between them
+  - saves each model in CatBoost's native .cbm format next to a JSON file of
+    training-time metrics, and skips models whose pool and params are unchanged
+
+Usage:
+    from nfl_training import train_models
+    results = train_models(game_data, thread_budget=8, max_parallel=4)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor, Pool
+
+MODEL_CACHE_DIR = "model_cache"
+
+# Notebook cell 147 feature set and parameters
+CORE_FEATURES = ["is_playoff", "epa_diff", "def_epa_diff", "qb_delta_diff", "Hotness3wk"]
+CAT_FEATURES = ["is_playoff"]
+TARGET = "point_diff"
+POSITIONS = ["qb", "rb", "wr", "te", "ol", "cb", "edge", "di"]
+
+MODEL_PARAMS = {
+    "iterations": 1500,
+    "learning_rate": 0.03,
+    "depth": 5,
+    "loss_function": "Quantile:alpha=0.5",
+    "eval_metric": "MAE",
+    "early_stopping_rounds": 50,
+}
+
+TRAIN_SEASONS = (2021, 2023)
+EVAL_SEASON = 2024
+
+
+def default_model_specs():
+    """
+    The point-differential model plus one model per position group.
+
+    Each position model swaps qb_delta_diff for that position's delta diff, so
+    the position groups can be compared on the same core EPA features.
+    """
+    specs = [{"name": "point_diff", "features": CORE_FEATURES}]
+    base = [f for f in CORE_FEATURES if f != "qb_delta_diff"]
+    for pos in POSITIONS:
+        specs.append({"name": f"{pos}_point_diff", "features": base + [f"{pos}_delta_diff"]})
+    return specs
+
+
+def _hash(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:16]
+
+
+def feature_set_hash(df, features, cat_features, target, train_seasons, eval_season):
+    """Hash of the feature set, split and the exact rows/values that go into the pools"""
+    cols = list(features) + [target, "season"]
+    data_hash = pd.util.hash_pandas_object(df[cols], index=False).values
+    return _hash(
+        sorted(features), sorted(cat_features), target, list(train_seasons), eval_season,
+        hashlib.sha256(data_hash.tobytes()).hexdigest(),
+    )
+
+
+def split_frames(game_data, features, target=TARGET, train_seasons=TRAIN_SEASONS, eval_season=EVAL_SEASON):
+    """Train on the train season range, evaluate on eval_season (rows with NaNs dropped)"""
+    train_df = game_data[game_data["season"].between(*train_seasons)].dropna(subset=features + [target])
+    test_df = game_data[game_data["season"] == eval_season].dropna(subset=features + [target])
+    return train_df, test_df
+
+
+def model_frame(df, features, cat_features):
+    """Feature frame in the dtypes CatBoost expects (int categoricals, float32 numerics)"""
+    X = df[features].copy()
+    for col in cat_features:
+        X[col] = X[col].astype(int)
+    for col in X.columns.difference(cat_features):
+        X[col] = X[col].astype(np.float32)
+    return X
+
+
+def build_pools(game_data, features, cat_features=CAT_FEATURES, target=TARGET,
+                train_seasons=TRAIN_SEASONS, eval_season=EVAL_SEASON, cache_dir=MODEL_CACHE_DIR):
+    """
+    Return (pool_key, train_pool, eval_pool), loading quantized pools from disk when cached.
+
+    The eval pool is quantized with the train pool's borders so both share one
+    feature quantization, exactly as fit() would do internally.
+    """
+    key = feature_set_hash(game_data, features, cat_features, target, train_seasons, eval_season)
+    pool_dir = os.path.join(cache_dir, "pools", key)
+    train_path = os.path.join(pool_dir, "train.bin")
+    eval_path = os.path.join(pool_dir, "eval.bin")
+
+    if os.path.exists(train_path) and os.path.exists(eval_path):
+        return key, Pool(f"quantized://{train_path}"), Pool(f"quantized://{eval_path}")
+
+    os.makedirs(pool_dir, exist_ok=True)
+    train_df, test_df = split_frames(game_data, list(features), target, train_seasons, eval_season)
+
+    train_pool = Pool(model_frame(train_df, features, cat_features), train_df[target].astype(float),
+                      cat_features=list(cat_features))
+    train_pool.quantize()
+    borders_path = os.path.join(pool_dir, "borders.tsv")
+    train_pool.save_quantization_borders(borders_path)
+
+    eval_pool = Pool(model_frame(test_df, features, cat_features), test_df[target].astype(float),
+                     cat_features=list(cat_features))
+    eval_pool.quantize(input_borders=borders_path)
+
+    train_pool.save(train_path)
+    eval_pool.save(eval_path)
+    with open(os.path.join(pool_dir, "pool.json"), "w") as f:
+        json.dump({
+            "features": list(features),
+            "cat_features": list(cat_features),
+            "target": target,
+            "train_seasons": list(train_seasons),
+            "eval_season": eval_season,
+            "train_rows": int(len(train_df)),
+            "eval_rows": int(len(test_df)),
+        }, f, indent=2)
+    print(f"Quantized pool {key}: {len(train_df)} train / {len(test_df)} eval rows")
+    return key, train_pool, eval_pool
+
+
+def eval_frame(game_data, features, cat_features=CAT_FEATURES, target=TARGET,
+               train_seasons=TRAIN_SEASONS, eval_season=EVAL_SEASON):
+    """
+    (X, y) for the eval season as raw (non-quantized) features.
+
+    Metrics are computed by predicting on this frame: CatBoost can't predict on
+    a quantized Pool with categorical features.
+    """
+    _, test_df = split_frames(game_data, list(features), target, train_seasons, eval_season)
+    return model_frame(test_df, features, cat_features), test_df[target].to_numpy(dtype=float)
+
+
+def _train_one(spec, pool_key, train_pool, eval_pool, eval_data, params, thread_count, cache_dir):
+    """Fit one model (or reuse the saved one) and write the .cbm + metrics JSON"""
+    name = spec["name"]
+    model_dir = os.path.join(cache_dir, "models")
+    model_path = os.path.join(model_dir, f"{name}.cbm")
+    meta_path = os.path.join(model_dir, f"{name}.json")
+    model_key = _hash(pool_key, params)
+
+    if os.path.exists(model_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("model_key") == model_key:
+            print(f"{name}: unchanged, reusing {model_path}")
+            return meta
+
+    train_dir = os.path.join(cache_dir, "catboost_info", name)
+    os.makedirs(train_dir, exist_ok=True)
+    model = CatBoostRegressor(
+        **params,
+        thread_count=thread_count,
+        train_dir=train_dir,
+        verbose=0,
+    )
+    start = time.perf_counter()
+    model.fit(train_pool, eval_set=eval_pool)
+    train_seconds = time.perf_counter() - start
+
+    X_eval, y_eval = eval_data
+    y_pred = model.predict(X_eval)
+    errors = y_pred - y_eval
+
+    meta = {
+        "name": name,
+        "model_key": model_key,
+        "pool_key": pool_key,
+        "features": list(spec["features"]),
+        "params": params,
+        "thread_count": thread_count,
+        "train_seconds": round(train_seconds, 3),
+        "best_iteration": model.get_best_iteration(),
+        "best_score": model.get_best_score(),
+        "eval_mae": float(np.mean(np.abs(errors))),
+        "eval_rmse": float(np.sqrt(np.mean(errors ** 2))),
+        "eval_direction_accuracy": float(np.mean(np.sign(y_pred) == np.sign(y_eval))),
+        "feature_importance": dict(zip(spec["features"], map(float, model.get_feature_importance()))),
+    }
+
+    os.makedirs(model_dir, exist_ok=True)
+    model.save_model(model_path, format="cbm")
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    print(f"{name}: MAE {meta['eval_mae']:.2f}, RMSE {meta['eval_rmse']:.2f} "
+          f"({train_seconds:.1f}s on {thread_count} threads)")
+    return meta
+
+
+def train_models(game_data, specs=None, params=None, thread_budget=None, max_parallel=4,
+                 train_seasons=TRAIN_SEASONS, eval_season=EVAL_SEASON, cache_dir=MODEL_CACHE_DIR):
+    """
+    Train every model spec concurrently under a shared CPU thread budget.
+
+    Parameters:
+        game_data (pd.DataFrame): Output of nfl_features.build_features().
+        specs (list): [{"name": ..., "features": [...]}, ...]; defaults to default_model_specs().
+        params (dict): CatBoostRegressor params; defaults to the notebook's MODEL_PARAMS.
+        thread_budget (int): Total CatBoost threads across all concurrent fits (default: all cores).
+        max_parallel (int): How many models train at the same time.
+        cache_dir (str): Root for cached pools, .cbm models and metrics.
+
+    Returns:
+        dict: {model name: metrics dict}
+    """
+    specs = specs or default_model_specs()
+    params = dict(params or MODEL_PARAMS)
+    thread_budget = thread_budget or os.cpu_count() or 1
+    max_parallel = max(1, min(max_parallel, len(specs), thread_budget))
+    threads_per_model = max(1, thread_budget // max_parallel)
+
+    # One pool build per distinct feature set, shared by every spec that uses it
+    pools = {}
+    pools_lock = threading.Lock()
+
+    def get_pools(spec):
+        cat_features = [c for c in CAT_FEATURES if c in spec["features"]]
+        feature_key = (tuple(spec["features"]), tuple(cat_features))
+        with pools_lock:
+            if feature_key not in pools:
+                pools[feature_key] = threading.Lock(), None
+            lock, _ = pools[feature_key]
+        with lock:
+            built = pools[feature_key][1]
+            if built is None:
+                built = build_pools(game_data, spec["features"], cat_features, TARGET,
+                                    train_seasons, eval_season, cache_dir)
+                pools[feature_key] = lock, built
+        return built
+
+    def run(spec):
+        pool_key, train_pool, eval_pool = get_pools(spec)
+        cat_features = [c for c in CAT_FEATURES if c in spec["features"]]
+        eval_data = eval_frame(game_data, spec["features"], cat_features, TARGET, train_seasons, eval_season)
+        return _train_one(spec, pool_key, train_pool, eval_pool, eval_data, params, threads_per_model, cache_dir)
+
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        results = list(executor.map(run, specs))
+
+    return {meta["name"]: meta for meta in results}
+
+
+def load_model(name, cache_dir=MODEL_CACHE_DIR):
+    """Load a trained model and its training metrics"""
+    model = CatBoostRegressor()
+    model.load_model(os.path.join(cache_dir, "models", f"{name}.cbm"), format="cbm")
+    with open(os.path.join(cache_dir, "models", f"{name}.json")) as f:
+        meta = json.load(f)
+    return model, meta
+
+
+def export_model(name="point_diff", path="nfl_point_diff.cbm", cache_dir=MODEL_CACHE_DIR):
+    """Copy a trained model (and its metrics, as <path>.json) to where app.py serves it from"""
+    model, meta = load_model(name, cache_dir)
+    model.save_model(path, format="cbm")
+    with open(f"{path}.json", "w") as f:
+        json.dump(meta, f, indent=2)
+    print(f"Exported {name} ({meta['model_key']}) to {path}")
+    return path
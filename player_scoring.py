@@ -0,0 +1,278 @@
+"""
+Vectorized scoring and ranking for the NBA-success models.
+
+Every Streamlit tab used to score players one row at a time
+(iterrows + scaler.transform per row), and re-scored the whole 2010-2025
+position group for each player it displayed. Here each cluster's players are
+scored with one scaler.transform + matrix product, and the tab tables
+(lottery picks, draft steals, draft class, year rankings) are built from that
+single pass. Outputs match the original per-row loops.
+
+contribution_matrix()/DriverIndex give the per-feature breakdown
+(scaled value x coefficient) for many players at once, for "why" views.
+"""
+import numpy as np
+import pandas as pd
+
+CLUSTERS = [0.0, 1.0, 2.0]
+RATING_YEARS = (19, 25)        # players shown/rated in the app (2019-2025)
+COMPARISON_YEARS = (10, 25)    # position group used for in-position ranks
+
+# (threshold, color, background, badge), checked top-down
+RATING_TIERS = [
+    (0.9, "#006400", "#d4edda", "ELITE"),
+    (0.8, "#228b22", "#d4edda", "GREAT"),
+    (0.7, "#32cd32", "#e8f5e8", "VERY GOOD"),
+    (0.6, "#9acd32", "#f0f8e8", "GOOD"),
+    (0.5, "#ff7f0e", "#fff3cd", "ABOVE AVERAGE"),
+    (0.4, "#ffa500", "#fff8dc", "AVERAGE"),
+    (0.3, "#ff6347", "#ffe4e1", "BELOW AVERAGE"),
+]
+POOR_TIER = ("#d62728", "#f8d7da", "POOR")
+
+
+def rating_tier(rating):
+    """(color, bg_color, badge) for a rating"""
+    for threshold, color, bg_color, badge in RATING_TIERS:
+        if rating >= threshold:
+            return color, bg_color, badge
+    return POOR_TIER
+
+
+def predict_proba(rows, model_data):
+    """Success probability for every row of a frame under one cluster model"""
+    features = model_data["features"]
+    if len(rows) == 0:
+        return np.empty(0)
+    X = rows[features].fillna(0)
+    logit = model_data["scaler"].transform(X) @ model_data["avg_coefs"]
+    return 1 / (1 + np.exp(-logit))
+
+
+def score_players(df, models_by_cluster):
+    """Prediction for every row, each under its own cluster's model (NaN if no model)"""
+    pred = pd.Series(np.nan, index=df.index, name="Prediction")
+    clusters = df["PlayStyleCluster"]
+    for cluster, model_data in models_by_cluster.items():
+        mask = (clusters == cluster).to_numpy()
+        if mask.any():
+            pred[mask] = predict_proba(df.loc[mask], model_data)
+    return pred
+
+
+def in_years(df, years):
+    lo, hi = years
+    return (df["Year"] >= lo) & (df["Year"] <= hi)
+
+
+def search_players(df, query, years=RATING_YEARS):
+    """Case-insensitive substring match on Name, limited to the given years"""
+    mask = df["Name"].str.contains(query, case=False, na=False, regex=False)
+    if years is not None:
+        mask &= in_years(df, years)
+    return df[mask]
+
+
+def position_rank(df, models_by_cluster, player, years=COMPARISON_YEARS):
+    """
+    Rating and in-position rank for one player.
+
+    Returns dict(rating, rank, total); rank is None if the player isn't in
+    the comparison group.
+    """
+    cluster = player["PlayStyleCluster"]
+    model_data = models_by_cluster[cluster]
+    prob = float(predict_proba(player.to_frame().T, model_data)[0])
+
+    group = df[(df["PlayStyleCluster"] == cluster) & in_years(df, years)]
+    preds = pd.Series(predict_proba(group, model_data), index=group.index)
+    order = preds.sort_values(ascending=False)
+    names = group["Name"].reindex(order.index).to_numpy()
+    hits = np.flatnonzero(names == player["Name"])
+    rank = int(hits[0]) + 1 if len(hits) else None
+    return {"rating": prob, "rank": rank, "total": int(len(group))}
+
+
+def rated_players(df, models_by_cluster, years=RATING_YEARS):
+    """
+    Name, Year, Prediction, Cluster, Team, Pick for every rated player in `years`,
+    ordered by year then cluster (the order the rankings tab builds them in).
+    """
+    rows = df[in_years(df, years) & df["PlayStyleCluster"].isin(list(models_by_cluster))]
+    out = rows[["Name", "Year", "Team", "Pick"]].copy()
+    out["Prediction"] = score_players(rows, models_by_cluster)
+    out["Cluster"] = rows["PlayStyleCluster"]
+    cluster_order = out["Cluster"].map({c: i for i, c in enumerate(models_by_cluster)})
+    order = np.lexsort((cluster_order.to_numpy(), out["Year"].to_numpy()))
+    return out.iloc[order][["Name", "Year", "Prediction", "Cluster", "Team", "Pick"]]
+
+
+def _picks_by_rating(all_preds, mask, clusters=CLUSTERS):
+    """Rows of all_preds matching mask, grouped by cluster, then sorted by Rating"""
+    parts = [all_preds[mask & (all_preds["Cluster"] == c)] for c in clusters]
+    picks = pd.concat(parts).assign(Rating=lambda d: d["Prediction"])
+    return picks.sort_values("Rating", ascending=False)
+
+
+def lottery_picks(all_preds):
+    """Lottery picks (1-14) from rated_players(), ranked by rating"""
+    pick = all_preds["Pick"]
+    return _picks_by_rating(all_preds, pick.notna() & (pick <= 14))
+
+
+def draft_steals(all_preds, min_rating=0.3, top=None):
+    """Picks 15+ rated at least min_rating, ranked by rating (best `top` if given)"""
+    pick = all_preds["Pick"]
+    steals = _picks_by_rating(all_preds, pick.notna() & (pick > 14) & (all_preds["Prediction"] >= min_rating))
+    return steals.head(top) if top is not None else steals
+
+
+def draft_class(df, models_by_cluster, year):
+    """
+    Drafted players from one (two-digit) year, ordered by pick.
+
+    Columns: Name, Pick, Team, Rating, Prediction, IsHypothetical. Years
+    outside 2019-2025 are marked hypothetical, as in the original tab.
+    """
+    rows = df[(df["Year"] == year) & df["Pick"].notna() & (df["Pick"] > 0)
+              & df["PlayStyleCluster"].isin(list(models_by_cluster))]
+    pred = score_players(rows, models_by_cluster)
+    lo, hi = RATING_YEARS
+    out = pd.DataFrame({
+        "Name": rows["Name"].to_numpy(),
+        "Pick": rows["Pick"].astype(int).to_numpy(),
+        "Team": rows["Team"].to_numpy(),
+        "Rating": pred.to_numpy(),
+        "Prediction": pred.to_numpy(),
+        "IsHypothetical": not (lo <= year <= hi),
+    })
+    return out.sort_values("Pick")
+
+
+def player_rankings(df, models_by_cluster, year, clusters=CLUSTERS):
+    """All players from one (two-digit) year, ranked by rating"""
+    rows = df[(df["Year"] == year) & df["PlayStyleCluster"].isin(clusters)
+              & df["PlayStyleCluster"].isin(list(models_by_cluster))]
+    pred = score_players(rows, models_by_cluster)
+    out = pd.DataFrame({
+        "Name": rows["Name"].to_numpy(),
+        "Team": rows["Team"].to_numpy(),
+        "Rating": pred.to_numpy(),
+        "Prediction": pred.to_numpy(),
+        "Pick": rows["Pick"].to_numpy(),
+        "Height": rows["Height"].to_numpy(),
+        "BPM": rows["BPM"].to_numpy(),
+        "Ast": rows["Ast"].to_numpy(),
+        "REB": rows["REB"].to_numpy(),
+        "Blk": rows["Blk"].to_numpy(),
+    })
+    return out.sort_values("Rating", ascending=False)
+
+
+# ======================
+# Explanations
+# ======================
+
+def contribution_matrix(rows, model_data):
+    """
+    Scaled value x coefficient for every row and model feature (rows x features).
+
+    Each row sums to that player's logit; this is explain_manual_prediction()'s
+    feature_breakdown "contribution" for many players at once.
+    """
+    features = model_data["features"]
+    if len(rows) == 0:
+        return pd.DataFrame(columns=features, index=rows.index, dtype=float)
+    X = rows[features].fillna(0)
+    return pd.DataFrame(model_data["scaler"].transform(X) * np.asarray(model_data["avg_coefs"]),
+                        index=rows.index, columns=features)
+
+
+def explain_players(df, models_by_cluster):
+    """Contribution matrix for each cluster's rows of df: {cluster: DataFrame}"""
+    clusters = df["PlayStyleCluster"]
+    return {
+        cluster: contribution_matrix(df[clusters == cluster], model_data)
+        for cluster, model_data in models_by_cluster.items()
+    }
+
+
+def _driver_order(values):
+    """Column order per row, largest |contribution| first"""
+    return np.argsort(-np.abs(values), axis=1, kind="stable")
+
+
+def top_drivers(df, models_by_cluster, k=3):
+    """
+    Each row's k strongest features as [(feature, contribution), ...], by
+    absolute contribution; rows without a model get an empty list.
+    """
+    out = pd.Series([[] for _ in range(len(df))], index=df.index, dtype=object)
+    for cluster, contrib in explain_players(df, models_by_cluster).items():
+        if contrib.empty:
+            continue
+        values = contrib.to_numpy()
+        order = _driver_order(values)[:, :k]
+        features = np.asarray(contrib.columns)
+        picked = np.take_along_axis(values, order, axis=1)
+        out[contrib.index] = [list(zip(features[o].tolist(), v.tolist())) for o, v in zip(order, picked)]
+    return out
+
+
+class DriverIndex:
+    """
+    Per-cluster index of which features drive each player's logit.
+
+    Built once from one pass of contribution_matrix() per cluster; for every
+    feature it keeps the players ranked by that feature's contribution, and
+    the subset whose largest |contribution| is that feature, so
+    driven_by("LogREB", top=20) is a slice.
+    """
+
+    def __init__(self, df, models_by_cluster, years=RATING_YEARS):
+        rows = df[in_years(df, years)] if years is not None else df
+        self.players = rows[[c for c in ("Name", "Year", "Team", "Pick", "PlayStyleCluster") if c in rows.columns]]
+        frames = []
+        for cluster, contrib in explain_players(rows, models_by_cluster).items():
+            if contrib.empty:
+                continue
+            values = contrib.to_numpy()
+            order = _driver_order(values)
+            features = np.asarray(contrib.columns)
+            logit = values.sum(axis=1)
+            for j, feature in enumerate(features):
+                frames.append(pd.DataFrame({
+                    "feature": feature,
+                    "Cluster": cluster,
+                    "contribution": values[:, j],
+                    "share": np.abs(values[:, j]) / np.maximum(np.abs(values).sum(axis=1), 1e-12),
+                    "driver_rank": np.argmax(order == j, axis=1) + 1,
+                    "Prediction": 1 / (1 + np.exp(-logit)),
+                }, index=contrib.index))
+        long = pd.concat(frames) if frames else pd.DataFrame(
+            columns=["feature", "Cluster", "contribution", "share", "driver_rank", "Prediction"])
+        long = long.join(self.players.drop(columns="PlayStyleCluster", errors="ignore"))
+        long = long.sort_values("contribution", ascending=False)
+        self.by_feature = {feature: group for feature, group in long.groupby("feature", sort=False)}
+        self.primary = {feature: group[group["driver_rank"] == 1] for feature, group in self.by_feature.items()}
+
+    @property
+    def features(self):
+        return sorted(self.by_feature)
+
+    def driven_by(self, feature, top=20, primary=True):
+        """
+        Players ranked by how much `feature` pushes their logit up.
+
+        primary=True keeps only players for whom it's the strongest driver.
+        """
+        if feature not in self.by_feature:
+            raise ValueError(f"No model uses feature '{feature}' (known: {self.features})")
+        group = self.primary[feature] if primary else self.by_feature[feature]
+        return group.head(top) if top is not None else group
+
+    def drivers_for(self, name):
+        """Every feature's contribution for a player, strongest first"""
+        parts = [g[g["Name"] == name] for g in self.by_feature.values()]
+        rows = pd.concat(parts) if parts else pd.DataFrame()
+        return rows.sort_values("driver_rank")
@@ -0,0 +1,168 @@
+"""
+Read-only, memory-mapped player store for multi-process serving (serve.py).
+
+build_store() writes everything app.py's routes need as plain .npy files plus
+meta.json:
+
+  names / sorted_names / name_order   exact-name lookup by binary search
+  names_lower                         autocomplete substring search
+  team, year, actual, cluster         fields returned by /predict_player
+  probability                         score table: every player pre-scored
+                                      with their cluster's model
+  model_<i>_mean/_scale/_coefs        scaler and coefficient arrays per cluster
+
+Strings are stored as fixed-width unicode arrays, so nothing is a Python
+object. PlayerStore opens the files with mmap_mode="r": forked workers read
+the same page-cache pages and per-worker memory does not grow with the
+dataset.
+
+Only build_store() and to_frame() need pandas; mapping a store and serving
+from it import numpy alone, which keeps worker cold starts short (startup.py).
+"""
+import json
+import os
+
+import numpy as np
+
+META_FILE = "meta.json"
+# Columns of the materialized score table (to_frame(), batch_score.py output)
+SCORE_COLUMNS = ["Name", "Team", "Year", "PlayStyleCluster", "Probability"]
+
+
+class StoredScaler:
+    """StandardScaler.transform from saved mean_/scale_ arrays"""
+
+    def __init__(self, mean, scale, features):
+        self.mean_ = mean
+        self.scale_ = scale
+        self.feature_names_in_ = np.asarray(features, dtype=object)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=float) - self.mean_) / self.scale_
+
+
+def _strings(series):
+    return series.fillna("").astype(str).to_numpy(dtype=str)
+
+
+def build_store(df, models_by_cluster, path, version=None, data_version=None):
+    """
+    Write the serving arrays for a player frame and its cluster models.
+
+    Parameters:
+        df (pd.DataFrame): final_df_transform.
+        models_by_cluster (dict): Cluster -> {features, scaler, avg_coefs}.
+        path (str): Directory to write into (created if missing).
+        version (str): Model version recorded in meta.json.
+        data_version (str): Data version (player table + models) recorded in meta.json.
+
+    Returns:
+        str: path
+    """
+    from player_scoring import score_players
+
+    os.makedirs(path, exist_ok=True)
+    names = _strings(df["Name"])
+    order = np.argsort(names, kind="stable")
+    arrays = {
+        "names": names,
+        "names_lower": np.char.lower(names),
+        "name_order": order,
+        "sorted_names": names[order],
+        "team": _strings(df["Team"]) if "Team" in df.columns else np.full(len(df), "", dtype=str),
+        "year": df["Year"].to_numpy() if "Year" in df.columns else np.zeros(len(df), dtype=int),
+        "cluster": df["PlayStyleCluster"].to_numpy(dtype=float),
+        "probability": score_players(df, models_by_cluster).to_numpy(dtype=float),
+    }
+    if "Actual" in df.columns:
+        arrays["actual"] = df["Actual"].to_numpy()
+
+    clusters = []
+    for i, (cluster, model_data) in enumerate(models_by_cluster.items()):
+        scaler = model_data["scaler"]
+        arrays[f"model_{i}_mean"] = np.asarray(scaler.mean_, dtype=float)
+        arrays[f"model_{i}_scale"] = np.asarray(scaler.scale_, dtype=float)
+        arrays[f"model_{i}_coefs"] = np.asarray(model_data["avg_coefs"], dtype=float)
+        clusters.append({"cluster": float(cluster), "index": i, "features": list(model_data["features"])})
+
+    for name, values in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), values, allow_pickle=False)
+    meta = {"n_players": int(len(df)), "clusters": clusters, "arrays": sorted(arrays),
+            "version": version, "data_version": data_version}
+    with open(os.path.join(path, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+
+class PlayerStore:
+    """Memory-mapped view of a build_store() directory"""
+
+    def __init__(self, path, mmap_mode="r"):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+            for name in self.meta["arrays"]
+        }
+        # Same shape as models_by_cluster, minus the training-time df_with_predictions
+        self.models = {}
+        for entry in self.meta["clusters"]:
+            i = entry["index"]
+            self.models[entry["cluster"]] = {
+                "features": entry["features"],
+                "scaler": StoredScaler(self.arrays[f"model_{i}_mean"], self.arrays[f"model_{i}_scale"],
+                                       entry["features"]),
+                "avg_coefs": self.arrays[f"model_{i}_coefs"],
+            }
+
+    def __len__(self):
+        return self.meta["n_players"]
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.arrays.values())
+
+    def find(self, name):
+        """Row of the first player with exactly this name, or None"""
+        sorted_names = self.arrays["sorted_names"]
+        pos = int(np.searchsorted(sorted_names, name, side="left"))
+        if pos < len(sorted_names) and sorted_names[pos] == name:
+            return int(self.arrays["name_order"][pos])
+        return None
+
+    def player_prediction(self, name):
+        """
+        show_clustered_player_prediction() result from the score table,
+        or None if the name is unknown.
+        """
+        row = self.find(name)
+        if row is None:
+            return None
+        cluster = float(self.arrays["cluster"][row])
+        if cluster not in self.models:
+            return {"error": f"No model found for cluster {cluster}."}
+        actual = self.arrays["actual"][row].item() if "actual" in self.arrays else "Unknown"
+        return {
+            "player_name": name,
+            "cluster": cluster,
+            "probability": float(self.arrays["probability"][row]),
+            "actual": actual,
+            "success": True,
+            "team": str(self.arrays["team"][row]),
+            "year": self.arrays["year"][row].item(),
+        }
+
+    def suggestions(self, query, limit=10):
+        """First `limit` names containing query (case-insensitive, literal), in file order"""
+        hits = np.flatnonzero(np.char.find(self.arrays["names_lower"], query.lower()) >= 0)
+        return [str(n) for n in self.arrays["names"][hits[:limit]]]
+
+    def to_frame(self):
+        """The score table (SCORE_COLUMNS) as a DataFrame (copies; for inspection)"""
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Name": self.arrays["names"], "Team": self.arrays["team"], "Year": self.arrays["year"],
+            "PlayStyleCluster": self.arrays["cluster"], "Probability": self.arrays["probability"],
+        }, columns=SCORE_COLUMNS)
@@ -0,0 +1,398 @@
+"""
+Full scored-player rankings export, streamed as CSV, NDJSON or Arrow IPC.
+
+The Player Rankings tab stops at 100 players; this writes every scored player
+(optionally filtered by year range, cluster and pick range) with:
+
+  Name, Team, Year, Pick, PlayStyleCluster, Actual
+  Probability     the player's cluster model prediction
+  Rank            1 = highest probability among the exported players
+  ClusterRank     the same, within the player's cluster
+  Percentile      share of exported players at or below this probability (0-100]
+  contrib_<f>     scaled value x coefficient per model feature (--contributions;
+                  empty for features the player's cluster model does not use)
+
+Only the probability column and the sort order are held for the whole result.
+Rows are built, explained and encoded CHUNK_SIZE at a time in rank order, so
+memory stays flat as the export grows. The bytes are a pure function of the
+data, the models and the query, which is what makes resuming possible: the CLI
+--resume and app.py's /export_rankings (HTTP Range) pick up where a partial
+download stopped.
+
+Arrow output needs pyarrow; it is only imported when that format is asked for.
+Any format can be gzip- or brotli-compressed (--compress / ?compress=).
+
+Usage:
+    python rankings_export.py > rankings.csv
+    python rankings_export.py --format ndjson --years 2019-2025 --clusters 0,2 --picks 1-14
+    python rankings_export.py --format arrow --contributions -o rankings.arrow
+    python rankings_export.py --contributions --compress gzip -o rankings.csv.gz
+    python rankings_export.py -o rankings.csv --resume          # continue a partial file
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+import http_caching
+from player_scoring import contribution_matrix, score_players
+
+CHUNK_SIZE = 5000
+ID_COLUMNS = ["Name", "Team", "Year", "Pick", "PlayStyleCluster", "Actual"]
+RANK_COLUMNS = ["Probability", "Rank", "ClusterRank", "Percentile"]
+
+
+# ======================
+# Query
+# ======================
+
+def parse_span(text, name="range"):
+    """'1-14' -> (1, 14); '15-' / '-14' leave that end open; '7' -> (7, 7); None/'' -> None"""
+    if text is None or str(text).strip() == "":
+        return None
+    lo, sep, hi = str(text).strip().partition("-")
+    try:
+        lo = int(lo) if lo.strip() else None
+        hi = (int(hi) if hi.strip() else None) if sep else lo
+    except ValueError:
+        raise ValueError(f"{name} must look like 'lo-hi', 'lo-' or '-hi', got {text!r}")
+    if lo is not None and hi is not None and lo > hi:
+        raise ValueError(f"{name} is empty: {text!r}")
+    return lo, hi
+
+
+def parse_years(text):
+    """Year span as two-digit years (the CSV's Year column); accepts 2019-2025 or 19-25"""
+    span = parse_span(text, "years")
+    if span is None:
+        return None
+    return tuple(y - 2000 if y is not None and y >= 100 else y for y in span)
+
+
+def parse_clusters(text):
+    if text is None or str(text).strip() == "":
+        return None
+    try:
+        return [float(c) for c in str(text).split(",") if c.strip()]
+    except ValueError:
+        raise ValueError(f"clusters must be a comma-separated list of numbers, got {text!r}")
+
+
+def _in_span(values, span):
+    lo, hi = span
+    mask = np.ones(len(values), dtype=bool)
+    if lo is not None:
+        mask &= values >= lo
+    if hi is not None:
+        mask &= values <= hi
+    return mask
+
+
+class RankingsExport:
+    """
+    Ranked, filtered view of a player frame, produced in chunks.
+
+    Parameters:
+        df (pd.DataFrame): final_df_transform.
+        models_by_cluster (dict): Cluster -> {features, scaler, avg_coefs}.
+        years (tuple): (lo, hi) two-digit years, either end None for open; None for all.
+        clusters (list): Clusters to include; None for every cluster with a model.
+        picks (tuple): (lo, hi) draft pick span; None for all.
+        contributions (bool): Add contrib_<feature> columns.
+        chunk_size (int): Rows per chunk.
+    """
+
+    def __init__(self, df, models_by_cluster, years=None, clusters=None, picks=None,
+                 contributions=False, chunk_size=CHUNK_SIZE):
+        self.df = df
+        self.models = models_by_cluster
+        self.years = years
+        self.clusters = list(models_by_cluster) if clusters is None else [c for c in clusters
+                                                                          if c in models_by_cluster]
+        self.picks = picks
+        self.contributions = contributions
+        self.chunk_size = chunk_size
+
+        mask = df["PlayStyleCluster"].isin(self.clusters).to_numpy(copy=True)
+        if years is not None:
+            mask &= _in_span(df["Year"].to_numpy(), years)
+        if picks is not None:
+            mask &= _in_span(df["Pick"].to_numpy(), picks)
+        rows = df[mask]
+
+        # The only whole-result state: one probability per row and the rank order
+        probability = score_players(rows, self.models).to_numpy(dtype=float)
+        # Highest first; ties keep file order so the output is byte-for-byte repeatable
+        order = np.argsort(-probability, kind="stable")
+        n = len(order)
+        self._index = rows.index.to_numpy()[order]
+        self._probability = probability[order]
+        self._cluster = rows["PlayStyleCluster"].to_numpy(dtype=float)[order]
+        self._rank = np.arange(1, n + 1)
+        self._cluster_rank = np.zeros(n, dtype=int)
+        for cluster in self.clusters:
+            at = self._cluster == cluster
+            self._cluster_rank[at] = np.arange(1, int(at.sum()) + 1)
+        # Percentile: rows with probability <= this one (ties share the top of their block)
+        at_or_below = n - np.searchsorted(-self._probability, -self._probability, side="left")
+        self._percentile = 100.0 * at_or_below / n if n else np.empty(0)
+
+        self.id_columns = [c for c in ID_COLUMNS if c in df.columns]
+        self.features = []
+        if contributions:
+            for cluster in self.clusters:
+                self.features.extend(f for f in self.models[cluster]["features"] if f not in self.features)
+        self.columns = self.id_columns + RANK_COLUMNS + [f"contrib_{f}" for f in self.features]
+
+    def __len__(self):
+        return len(self._index)
+
+    def _chunk(self, start, stop):
+        rows = self.df.loc[self._index[start:stop]]
+        chunk = rows[self.id_columns].reset_index(drop=True)
+        chunk["Probability"] = self._probability[start:stop]
+        chunk["Rank"] = self._rank[start:stop]
+        chunk["ClusterRank"] = self._cluster_rank[start:stop]
+        chunk["Percentile"] = self._percentile[start:stop]
+        if self.contributions:
+            contrib = pd.DataFrame(np.nan, index=rows.index, columns=self.features)
+            for cluster in self.clusters:
+                at = rows["PlayStyleCluster"] == cluster
+                if at.any():
+                    block = contribution_matrix(rows[at], self.models[cluster])
+                    contrib.loc[at, block.columns] = block.to_numpy()
+            for f in self.features:
+                chunk[f"contrib_{f}"] = contrib[f].to_numpy()
+        return chunk
+
+    def chunks(self):
+        """DataFrames of up to chunk_size rows, in rank order, with self.columns"""
+        for start in range(0, len(self), self.chunk_size):
+            yield self._chunk(start, min(start + self.chunk_size, len(self)))
+
+    def empty_chunk(self):
+        """A zero-row chunk with the same columns and dtypes as chunks() yields"""
+        return self._chunk(0, 0)
+
+
+def export_key(query, data_version):
+    """Stable id for (query, data version): names spool files and serves as the ETag"""
+    body = json.dumps({"query": query, "data": data_version}, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()[:20]
+
+
+# ======================
+# Encoders
+# ======================
+
+def encode_csv(export):
+    for i, chunk in enumerate(export.chunks()):
+        yield chunk.to_csv(index=False, header=(i == 0)).encode()
+    if len(export) == 0:
+        yield (",".join(export.columns) + "\n").encode()
+
+
+def encode_ndjson(export):
+    for chunk in export.chunks():
+        yield chunk.to_json(orient="records", lines=True).encode()
+
+
+class _Drain:
+    """Write-only file object that hands back whatever was written since the last take()"""
+
+    def __init__(self):
+        self.parts = []
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        out, self.parts = b"".join(self.parts), []
+        return out
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Arrow export needs pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def arrow_schema(export):
+    """
+    Arrow schema of an export, from a zero-row chunk so it doesn't depend on
+    whether (or which) rows matched. Object columns with no rows to infer from
+    are strings (Name, Team).
+    """
+    pa = _pyarrow()
+    schema = pa.Schema.from_pandas(export.empty_chunk(), preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+    return schema
+
+
+def encode_arrow(export):
+    """Arrow IPC stream format, one record batch per chunk"""
+    pa = _pyarrow()
+    sink = _Drain()
+    schema = arrow_schema(export)
+    writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+    for chunk in export.chunks():
+        writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+# format -> (media type, file extension, encoder)
+FORMATS = {
+    "csv": ("text/csv", "csv", encode_csv),
+    "ndjson": ("application/x-ndjson", "ndjson", encode_ndjson),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow", encode_arrow),
+}
+# Compressed downloads are separate files (not Content-Encoding), so Range
+# requests address stable compressed bytes
+COMPRESSIONS = {"gzip": ("application/gzip", "gz"), "br": ("application/x-brotli", "br")}
+
+
+def encode(export, fmt, compression=None):
+    """
+    Byte chunks of the export in one of FORMATS, optionally gzip/br compressed.
+
+    Checked eagerly (unknown format -> ValueError, no pyarrow or brotli ->
+    ImportError) so callers can report errors before any bytes are sent.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    if compression not in (None, *COMPRESSIONS):
+        raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}")
+    if fmt == "arrow":
+        _pyarrow()
+    if compression == "br" and http_caching.brotli is None:
+        raise ImportError("Brotli compression needs the brotli package (pip install brotli)")
+    parts = (part for part in FORMATS[fmt][2](export) if part)
+    return http_caching.compress_stream(parts, compression) if compression else parts
+
+
+def output_type(fmt, compression=None):
+    """(media type, file extension) of an encode() result"""
+    media_type, ext, _ = FORMATS[fmt]
+    if compression:
+        media_type, suffix = COMPRESSIONS[compression]
+        ext = f"{ext}.{suffix}"
+    return media_type, ext
+
+
+def skip_bytes(parts, offset):
+    """Drop the first `offset` bytes of a byte-chunk stream"""
+    for part in parts:
+        if offset >= len(part):
+            offset -= len(part)
+            continue
+        yield part[offset:] if offset else part
+        offset = 0
+
+
+def spool(parts, path):
+    """
+    Pass byte chunks through while writing them to path.
+
+    The file only appears (atomically) once the stream has been fully
+    consumed, so an abandoned download never leaves a truncated spool file.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    done = False
+    try:
+        with open(tmp, "wb") as f:
+            for part in parts:
+                f.write(part)
+                yield part
+        os.replace(tmp, path)
+        done = True
+    finally:
+        if not done and os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def prune_spool(directory, keep):
+    """Delete all but the `keep` most recently used spool files"""
+    try:
+        files = [os.path.join(directory, n) for n in os.listdir(directory) if not n.endswith(".tmp")]
+    except OSError:
+        return
+    files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# ======================
+# CLI
+# ======================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export every scored player with rank and percentile")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--years", help="e.g. 2019-2025, 2022-, 19-25")
+    parser.add_argument("--clusters", help="e.g. 0,2")
+    parser.add_argument("--picks", help="e.g. 1-14, 15-")
+    parser.add_argument("--contributions", action="store_true", help="Add per-feature contribution columns")
+    parser.add_argument("--compress", choices=sorted(COMPRESSIONS), help="gzip or brotli-compress the output")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--data", default="final_df_transform.csv")
+    parser.add_argument("--models", default="models_by_cluster.pkl")
+    parser.add_argument("-o", "--out", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Append to an existing partial --out instead of starting over")
+    args = parser.parse_args(argv)
+
+    try:
+        years, clusters, picks = parse_years(args.years), parse_clusters(args.clusters), parse_span(args.picks, "picks")
+    except ValueError as e:
+        parser.error(str(e))
+
+    df = pd.read_csv(args.data)
+    with open(args.models, "rb") as f:
+        models_by_cluster = pickle.load(f)
+    export = RankingsExport(df, models_by_cluster, years=years, clusters=clusters, picks=picks,
+                            contributions=args.contributions, chunk_size=args.chunk_size)
+    parts = encode(export, args.format, args.compress)
+
+    if args.out == "-":
+        out = sys.stdout.buffer
+        for part in parts:
+            out.write(part)
+        out.flush()
+        return
+
+    offset = os.path.getsize(args.out) if args.resume and os.path.exists(args.out) else 0
+    written = 0
+    with open(args.out, "ab" if offset else "wb") as f:
+        for part in skip_bytes(parts, offset):
+            f.write(part)
+            written += len(part)
+    print(f"{len(export)} players -> {args.out} ({offset + written} bytes"
+          f"{f', resumed at {offset}' if offset else ''})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
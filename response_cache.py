@@ -0,0 +1,113 @@
+"""
+Bounded LRU + TTL response cache with single-flight request coalescing.
+
+    cache = ResponseCache("predict_player", maxsize=4096, ttl=600)
+    result = cache.get_or_compute(key, lambda: expensive(...))
+
+The first caller for a key computes; callers arriving while that computation
+is running wait for it instead of starting their own, so a burst of identical
+requests costs one computation. Entries expire after `ttl` seconds and the
+least recently used entry is dropped beyond `maxsize`.
+
+Counts go to metrics.RESPONSE_CACHE{cache,result} with result one of hit,
+miss, coalesced, evicted_size or evicted_ttl (hit rate in Prometheus:
+rate(hit) / rate(hit + miss + coalesced)); stats() returns the same numbers
+for this process.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    def __init__(self, name, maxsize=1024, ttl=300.0, clock=time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(("hit", "miss", "coalesced", "evicted_size", "evicted_ttl"), 0)
+
+    def _count(self, result):
+        # Called with self._lock held
+        self.counts[result] += 1
+        metrics.RESPONSE_CACHE.inc(self.name, result)
+
+    def get_or_compute(self, key, compute, cacheable=None):
+        """
+        Cached value for key, else compute() (once across concurrent callers).
+
+        cacheable(value) -> False keeps a result out of the cache (e.g. error
+        responses); waiting callers still receive it. Exceptions propagate to
+        every caller of that flight and are not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self._count("hit")
+                    return entry[1]
+                del self._entries[key]
+                self._count("evicted_ttl")
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self._count("miss")
+            else:
+                self._count("coalesced")
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None and (cacheable is None or cacheable(flight.value)):
+                    self._entries[key] = (self.clock() + self.ttl, flight.value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                        self._count("evicted_size")
+                del self._inflight[key]
+            flight.done.set()
+        return flight.value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        counts = dict(self.counts)
+        lookups = counts["hit"] + counts["miss"] + counts["coalesced"]
+        return {
+            **counts,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_rate": (counts["hit"] + counts["coalesced"]) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,201 @@
+"""
+Parsed-result cache tier for scraped schedule pages.
+
+sched_cache.sqlite / sref_cache.sqlite (requests_cache) only hold raw HTTP
+responses, so a rerun still pays for pd.read_html + BeautifulSoup on every
+schedule page. This module adds two tables to the same SQLite file:
+
+  parsed_pages      one row per URL: the response validator (ETag, or a
+                    sha256 of the body), the requests_cache key and an expiry
+  parsed_schedules  the typed schedule rows (date, opponent, team_pts,
+                    opp_pts, site, team) for that page
+
+A lookup with a matching validator returns the stored rows without touching
+the HTML. Expiry follows the raw response: purge_expired() drops parsed pages
+whose requests_cache response has expired (via the existing expires_idx on
+responses.expires) as well as pages past their own expiry.
+
+Usage:
+    cache = ScheduleCache("sched_cache.sqlite")
+    sched = fetch_schedule_cached(session, url, team_name, cache)   # requests_cache session
+"""
+import hashlib
+import sqlite3
+import time
+
+import pandas as pd
+
+SCHEDULE_COLUMNS = ["date", "opponent", "team_pts", "opp_pts", "site", "team"]
+DEFAULT_EXPIRE_AFTER = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed_pages (
+    url TEXT PRIMARY KEY,
+    validator TEXT NOT NULL,
+    response_key TEXT,
+    team TEXT,
+    n_rows INTEGER NOT NULL,
+    parsed_at INTEGER NOT NULL,
+    expires INTEGER
+);
+CREATE INDEX IF NOT EXISTS parsed_pages_expires_idx ON parsed_pages(expires);
+CREATE INDEX IF NOT EXISTS parsed_pages_response_idx ON parsed_pages(response_key);
+CREATE TABLE IF NOT EXISTS parsed_schedules (
+    url TEXT NOT NULL REFERENCES parsed_pages(url) ON DELETE CASCADE,
+    row_idx INTEGER NOT NULL,
+    date TEXT,
+    opponent TEXT,
+    team_pts INTEGER,
+    opp_pts INTEGER,
+    site TEXT,
+    team TEXT,
+    PRIMARY KEY (url, row_idx)
+) WITHOUT ROWID;
+"""
+
+
+def content_validator(body, etag=None):
+    """ETag when the server sends one, otherwise a sha256 of the response body"""
+    if etag:
+        return f"etag:{etag}"
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return "sha256:" + hashlib.sha256(body).hexdigest()
+
+
+def _points(series):
+    """Scores as nullable ints (unplayed games have no score)"""
+    return pd.to_numeric(series, errors="coerce").astype("Int64")
+
+
+class ScheduleCache:
+    """Parsed schedule rows stored alongside the raw requests_cache responses"""
+
+    def __init__(self, path="sched_cache.sqlite", expire_after=DEFAULT_EXPIRE_AFTER):
+        self.path = path
+        self.expire_after = expire_after
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.conn.close()
+
+    def _has_responses_table(self):
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'responses'"
+        ).fetchone()
+        return row is not None
+
+    def get(self, url, validator, now=None):
+        """Cached schedule frame for url if the validator matches and it hasn't expired, else None"""
+        now = int(now if now is not None else time.time())
+        row = self.conn.execute(
+            "SELECT validator, expires FROM parsed_pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None or row[0] != validator or (row[1] is not None and row[1] <= now):
+            self.misses += 1
+            return None
+
+        rows = self.conn.execute(
+            "SELECT date, opponent, team_pts, opp_pts, site, team FROM parsed_schedules "
+            "WHERE url = ? ORDER BY row_idx", (url,)
+        ).fetchall()
+        self.hits += 1
+        frame = pd.DataFrame(rows, columns=SCHEDULE_COLUMNS)
+        frame["team_pts"] = _points(frame["team_pts"])
+        frame["opp_pts"] = _points(frame["opp_pts"])
+        return frame
+
+    def put(self, url, validator, frame, response_key=None, expires=None, now=None):
+        """Store a parsed schedule frame, replacing any previous rows for url"""
+        now = int(now if now is not None else time.time())
+        if expires is None and self.expire_after is not None:
+            expires = now + int(self.expire_after)
+
+        out = frame[SCHEDULE_COLUMNS].copy()
+        out["date"] = out["date"].astype(str)
+        team_pts = _points(out["team_pts"])
+        opp_pts = _points(out["opp_pts"])
+        records = [
+            (url, i, d, o, None if pd.isna(tp) else int(tp), None if pd.isna(op) else int(op), s, t)
+            for i, (d, o, tp, op, s, t) in enumerate(zip(
+                out["date"], out["opponent"].astype(str), team_pts, opp_pts,
+                out["site"].astype(str), out["team"].astype(str),
+            ))
+        ]
+        team = str(out["team"].iloc[0]) if len(out) else None
+
+        with self.conn:
+            self.conn.execute("DELETE FROM parsed_schedules WHERE url = ?", (url,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO parsed_pages "
+                "(url, validator, response_key, team, n_rows, parsed_at, expires) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, validator, response_key, team, len(records), now, expires),
+            )
+            self.conn.executemany(
+                "INSERT INTO parsed_schedules VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records
+            )
+
+    def purge_expired(self, now=None):
+        """
+        Drop parsed pages past their own expiry, or whose raw requests_cache
+        response has expired. Returns the number of pages removed.
+        """
+        now = int(now if now is not None else time.time())
+        with self.conn:
+            removed = self.conn.execute(
+                "DELETE FROM parsed_pages WHERE expires IS NOT NULL AND expires <= ?", (now,)
+            ).rowcount
+            if self._has_responses_table():
+                # Range scan on responses(expires) via expires_idx
+                removed += self.conn.execute(
+                    "DELETE FROM parsed_pages WHERE response_key IN "
+                    "(SELECT key FROM responses WHERE expires IS NOT NULL AND expires <= ?)", (now,)
+                ).rowcount
+        return removed
+
+    def stats(self):
+        pages, rows = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(n_rows), 0) FROM parsed_pages"
+        ).fetchone()
+        return {"pages": pages, "rows": rows, "hits": self.hits, "misses": self.misses}
+
+
+def cached_parse(cache, url, body, team_name, parse, etag=None, response_key=None, expires=None):
+    """
+    Parse a fetched page through the cache: a validator hit returns the stored
+    rows without parsing; a miss parses with parse(body, team_name) and stores it.
+    """
+    validator = content_validator(body, etag)
+    frame = cache.get(url, validator)
+    if frame is not None:
+        return frame
+    frame = parse(body, team_name)
+    cache.put(url, validator, frame, response_key=response_key, expires=expires)
+    return frame
+
+
+def fetch_schedule_cached(session, url, team_name, cache, parse=None, **request_kwargs):
+    """
+    Notebook-style fetch_schedule() on a requests_cache CachedSession, with the
+    parsed rows cached next to the raw response.
+    """
+    if parse is None:
+        from ncaa_scraper import parse_schedule as parse
+
+    resp = session.get(url, **request_kwargs)
+    resp.raise_for_status()
+
+    expires = getattr(resp, "expires", None)
+    if expires is not None:
+        expires = int(expires.timestamp())
+    return cached_parse(
+        cache, url, resp.content, team_name, lambda body, team: parse(resp.text, team),
+        etag=resp.headers.get("ETag"),
+        response_key=getattr(resp, "cache_key", None),
+        expires=expires,
+    )
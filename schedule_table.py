@@ -0,0 +1,107 @@
+"""
+Single-pass extractor for sports-reference schedule tables.
+
+The notebook's fetch_schedule parses every page twice (pd.read_html for the
+table, then BeautifulSoup for the game_location cells) and drops the repeated
+"G" header rows afterwards. extract_schedule() instead streams the page through
+lxml once:
+
+  - only rows inside <table id="schedule"> are looked at
+  - cells are read by their data-stat attribute straight into per-column lists
+  - repeated header rows (class "thead", or rows with no <td>) are skipped as
+    they are encountered
+  - every finished <tr> is cleared, so the tree never holds the whole table
+
+Output columns match the notebook: date, opponent, team_pts, opp_pts, site, team.
+"""
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+SITE_MAP = {"@": "away", "N": "neutral", "": "home"}
+
+# data-stat attribute -> output column
+SCHEDULE_STATS = {
+    "date_game": "date",
+    "opp_name": "opponent",
+    "pts": "team_pts",
+    "opp_pts": "opp_pts",
+    "game_location": "site",
+}
+
+
+def _text(cell):
+    return "".join(cell.itertext()).replace("\xa0", " ").strip()
+
+
+def iter_table_rows(html, table_id, stats):
+    """
+    Yield {data-stat: text} for each data row of <table id=table_id>.
+
+    Only the data-stat keys in `stats` are read; other cells are ignored.
+    Raises ValueError if the page has no such table.
+    """
+    from lxml import etree
+
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+
+    found = False
+    depth = 0  # >0 while inside the target table (nested tables are counted)
+    for event, elem in etree.iterparse(BytesIO(html), events=("start", "end"), html=True,
+                                       tag=("table", "tr"), recover=True):
+        if elem.tag == "table":
+            if event == "start" and (depth or elem.get("id") == table_id):
+                found = True
+                depth += 1
+            elif event == "end" and depth:
+                depth -= 1
+                if depth == 0:
+                    elem.clear()
+                    return
+            continue
+
+        if event != "end":
+            continue
+        if depth and "thead" not in (elem.get("class") or ""):
+            row = {}
+            has_td = False
+            for cell in elem:
+                if cell.tag == "td":
+                    has_td = True
+                stat = cell.get("data-stat")
+                if stat in stats:
+                    row[stat] = _text(cell)
+            if has_td:
+                yield row
+        elem.clear()
+
+    if not found:
+        raise ValueError(f"No <table id='{table_id}'> found")
+
+
+def _points(values):
+    """Score strings -> nullable Int64 (blank for unplayed games)"""
+    arr = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+    return arr.astype("Int64")
+
+
+def extract_schedule(html, team_name):
+    """
+    Return DataFrame with columns:
+      date, opponent, team_pts, opp_pts, site, team
+    """
+    columns = {col: [] for col in SCHEDULE_STATS.values()}
+    for row in iter_table_rows(html, "schedule", SCHEDULE_STATS):
+        for stat, col in SCHEDULE_STATS.items():
+            columns[col].append(row.get(stat, ""))
+
+    return pd.DataFrame({
+        "date": np.array(columns["date"], dtype=object),
+        "opponent": np.array(columns["opponent"], dtype=object),
+        "team_pts": _points(columns["team_pts"]),
+        "opp_pts": _points(columns["opp_pts"]),
+        "site": pd.Series(columns["site"], dtype=object).map(SITE_MAP).fillna("home").to_numpy(),
+        "team": team_name,
+    })
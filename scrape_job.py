@@ -0,0 +1,176 @@
+"""
+Resumable, checkpointed season scrape.
+
+Notebook Cell 3 keeps every team's schedule in memory and only writes
+ncaa_games_{SEASON}.csv at the end, then treats that file's existence as
+"done". A crash at team 300 loses everything and a refresh re-scrapes all
+~360 teams. ScrapeJob instead keeps three files per season:
+
+  ncaa_scrape_{SEASON}.manifest.json  per-team status, row count, last played
+                                      game date, next scheduled game date,
+                                      scrape timestamp and last error
+  ncaa_team_rows_{SEASON}.csv         per-team schedule rows, appended as each
+                                      team finishes (tagged with scraped_at)
+  ncaa_games_{SEASON}.csv             the de-duplicated games table, rebuilt
+                                      from the latest rows of every team
+
+On restart only teams that are missing or failed are fetched. On a daily
+refresh a team is also re-fetched once its next scheduled game date has
+passed, i.e. when it should have new results.
+
+Usage:
+    from scrape_job import ScrapeJob
+    games = ScrapeJob(2025).run()          # safe to re-run at any point
+"""
+import asyncio
+import json
+import os
+import time
+
+import pandas as pd
+
+from ncaa_scraper import BASE_URL, combine_games, fetch_teams, scrape_schedules
+
+
+def _game_dates(frame):
+    """(last played date, next unplayed date) as ISO strings, or None"""
+    dates = pd.to_datetime(frame["date"], errors="coerce", format="mixed")
+    played = pd.to_numeric(frame["team_pts"], errors="coerce").notna()
+    last = dates[played].max()
+    upcoming = dates[~played].min()
+    return (
+        None if pd.isna(last) else last.date().isoformat(),
+        None if pd.isna(upcoming) else upcoming.date().isoformat(),
+    )
+
+
+class ScrapeJob:
+    """Checkpointed scrape of one season's schedules"""
+
+    def __init__(self, season, teams=None, workdir=".", base_url=BASE_URL):
+        self.season = season
+        self.base_url = base_url
+        self.manifest_path = os.path.join(workdir, f"ncaa_scrape_{season}.manifest.json")
+        self.rows_path = os.path.join(workdir, f"ncaa_team_rows_{season}.csv")
+        self.out_path = os.path.join(workdir, f"ncaa_games_{season}.csv")
+        self.manifest = self._load_manifest()
+        if teams is not None:
+            self.manifest["teams"] = dict(teams)
+
+    # ======================
+    # Manifest
+    # ======================
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {"season": self.season, "teams": {}, "status": {}}
+
+    def save_manifest(self):
+        """Atomic write: a crash mid-save never leaves a truncated manifest"""
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    def pending(self, today=None):
+        """
+        {team: slug} for teams that need fetching: never scraped, failed last
+        time, or with a scheduled game on or before `today` (default: now).
+        """
+        today = pd.Timestamp(today if today is not None else pd.Timestamp.now()).date().isoformat()
+        todo = {}
+        for team, slug in self.manifest["teams"].items():
+            status = self.manifest["status"].get(team)
+            if status is None or status.get("state") != "done":
+                todo[team] = slug
+            elif status.get("next_game") is not None and status["next_game"] <= today:
+                todo[team] = slug
+        return todo
+
+    # ======================
+    # Checkpoints
+    # ======================
+
+    def record(self, team, frame):
+        """Append a finished team's rows, then mark it done in the manifest"""
+        scraped_at = int(time.time() * 1000)
+        rows = frame.assign(scraped_at=scraped_at)
+        rows.to_csv(self.rows_path, mode="a", index=False, header=not os.path.exists(self.rows_path))
+
+        last_game, next_game = _game_dates(frame)
+        self.manifest["status"][team] = {
+            "state": "done",
+            "rows": int(len(frame)),
+            "last_game": last_game,
+            "next_game": next_game,
+            "scraped_at": scraped_at,
+        }
+        self.save_manifest()
+
+    def record_error(self, team, error):
+        status = self.manifest["status"].setdefault(team, {})
+        if status.get("state") != "done":
+            status["state"] = "error"
+        status["error"] = str(error)
+        self.save_manifest()
+
+    def finalize(self):
+        """
+        Rebuild ncaa_games_{SEASON}.csv from each team's latest scrape and
+        compact the rows file down to those rows.
+        """
+        if not os.path.exists(self.rows_path):
+            raise ValueError(f"No team rows scraped yet for {self.season}")
+
+        rows = pd.read_csv(self.rows_path)
+        latest = {
+            team: status["scraped_at"]
+            for team, status in self.manifest["status"].items()
+            if "scraped_at" in status
+        }
+        keep = rows["scraped_at"].to_numpy() == rows["team"].map(latest).to_numpy()
+        rows = rows[keep]
+
+        tmp = self.rows_path + ".tmp"
+        rows.to_csv(tmp, index=False)
+        os.replace(tmp, self.rows_path)
+
+        frames = [group.drop(columns="scraped_at") for _, group in rows.groupby("team", sort=False)]
+        games = combine_games(frames)
+        games.to_csv(self.out_path, index=False)
+        return games
+
+    # ======================
+    # Run
+    # ======================
+
+    def run(self, today=None, **scrape_kwargs):
+        """
+        Fetch pending teams (checkpointing each as it finishes) and rebuild the
+        season games table. Extra kwargs go to ncaa_scraper.scrape_schedules().
+        """
+        async def go():
+            if not self.manifest["teams"]:
+                self.manifest["teams"] = await fetch_teams(self.season, self.base_url)
+                self.save_manifest()
+                print(f"✅  Teams found: {len(self.manifest['teams'])}")
+
+            todo = self.pending(today)
+            done = len(self.manifest["teams"]) - len(todo)
+            print(f"📋 {len(todo)} teams to fetch ({done} up to date)")
+            if not todo:
+                return {}
+            _, errors = await scrape_schedules(
+                todo, self.season, base_url=self.base_url, on_result=self.record, **scrape_kwargs,
+            )
+            return errors
+
+        errors = asyncio.run(go())
+        for team, error in errors.items():
+            self.record_error(team, error)
+
+        games = self.finalize()
+        print(f"✅ {len(games)} games → {self.out_path} ({len(errors)} teams failed, will retry next run)")
+        return games
@@ -0,0 +1,223 @@
+"""
+Pre-fork production server for app.py.
+
+The master process loads final_df_transform.csv and models_by_cluster.pkl
+once, writes the serving arrays (player store, score table, scaler and
+coefficient arrays; see player_store.py) to --store-dir and maps them
+read-only. It then binds the listening socket and forks --workers processes
+that accept from it. Workers serve app.py's routes straight from the mapped
+arrays, so they share the same physical pages and per-worker memory does not
+grow with the dataset. Crashed workers are replaced; SIGTERM/Ctrl-C stops all.
+
+The default store directory is under /dev/shm (RAM-backed) where available,
+one per data version (content hashes of the CSV and the model pickle). A
+restart with unchanged files maps the existing store without reading the CSV
+or unpickling the models, so neither pandas nor scikit-learn is imported
+(see startup.py for the cold-start report). Each worker keeps its own
+/metrics counters.
+
+Usage:
+    python serve.py                          # one worker per core on :8080
+    python serve.py --workers 8 --threads    # 8 processes, threaded each
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+
+import metrics
+import startup
+from player_store import META_FILE, PlayerStore, build_store
+
+
+def default_store_dir(data_version):
+    """Shared store directory for a data version"""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, f"ncaab_store_{data_version}")
+
+
+def store_is_current(store_dir, data_version):
+    """Does store_dir hold a complete store built for data_version?"""
+    try:
+        with open(os.path.join(store_dir, META_FILE)) as f:
+            return json.load(f).get("data_version") == data_version
+    except (OSError, ValueError):
+        return False
+
+
+def artifact_versions(data_path="final_df_transform.csv", models_path="models_by_cluster.pkl"):
+    """(model version, data version): content hashes of the exported artifacts"""
+    version = metrics.artifact_version(models_path)
+    return version, f"{metrics.artifact_version(data_path)}-{version}"
+
+
+def current_store(data_path="final_df_transform.csv", models_path="models_by_cluster.pkl"):
+    """
+    Map the shared store for the exported data/models if one has been built.
+
+    Unlike load_store() this never builds: it is for processes that read
+    the store but shouldn't write to /dev/shm (the Streamlit UI).
+
+    Returns:
+        PlayerStore: mapped read-only, or None when no store for the current
+        data version exists yet.
+    """
+    _, data_version = artifact_versions(data_path, models_path)
+    store_dir = default_store_dir(data_version)
+    return PlayerStore(store_dir) if store_is_current(store_dir, data_version) else None
+
+
+def _swap_in(tmp, store_dir):
+    """Move a freshly built store into place, replacing a stale one"""
+    if os.path.isdir(store_dir):
+        stale = f"{tmp}.stale"
+        os.rename(store_dir, stale)
+        shutil.rmtree(stale, ignore_errors=True)
+    try:
+        os.rename(tmp, store_dir)
+    except OSError:
+        # Another process moved its build in first; theirs is as good as ours
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_store(store_dir=None, data_path="final_df_transform.csv", models_path="models_by_cluster.pkl"):
+    """
+    Map the serving arrays for the exported data/models, building them first if needed.
+
+    Parameters:
+        store_dir (str): Store directory; default default_store_dir(<data version>).
+        data_path (str): final_df_transform CSV.
+        models_path (str): models_by_cluster pickle.
+
+    Returns:
+        PlayerStore: mapped read-only. When store_dir already holds a store for
+        the current data version only the two files' hashes are computed;
+        otherwise the store is built in a temporary sibling directory and
+        renamed into place, so a concurrently starting process never maps a
+        half-written store.
+    """
+    report = startup.REPORT
+    with report.phase("load", "artifact versions"):
+        version, data_version = artifact_versions(data_path, models_path)
+    store_dir = store_dir or default_store_dir(data_version)
+
+    if store_is_current(store_dir, data_version):
+        metrics.ARTIFACT_LOADS.inc("player_store", "hit")
+    else:
+        pd = startup.lazy_import("pandas")
+        with report.phase("load", "final_df_transform"), metrics.timed_load("final_df_transform"):
+            df = pd.read_csv(data_path)
+        with report.phase("load", "models_by_cluster"), metrics.timed_load("models_by_cluster"):
+            with open(models_path, "rb") as f:
+                models_by_cluster = pickle.load(f)
+        parent = os.path.dirname(os.path.abspath(store_dir))
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".ncaab_store_build_", dir=parent)
+        os.chmod(tmp, 0o755)
+        try:
+            with report.phase("index", "player store"):
+                build_store(df, models_by_cluster, tmp, version=version, data_version=data_version)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        _swap_in(tmp, store_dir)
+
+    with report.phase("load", "player store"):
+        return PlayerStore(store_dir)
+
+
+def _worker(sock, threaded):
+    from werkzeug.serving import make_server
+
+    import app
+
+    # The master handles Ctrl-C and stops workers with SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    host, port = sock.getsockname()[:2]
+    server = make_server(host, port, app.app, threaded=threaded, fd=sock.fileno())
+    server.serve_forever()
+
+
+def spawn(sock, threaded):
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _worker(sock, threaded)
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+class _Stop(Exception):
+    pass
+
+
+def _raise_stop(signum, frame):
+    raise _Stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-fork server for app.py")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", action="store_true", help="Handle requests on threads within each worker")
+    parser.add_argument("--store-dir", default=None, help="Store directory (default: shared, per data version)")
+    parser.add_argument("--data", default="final_df_transform.csv")
+    parser.add_argument("--models", default="models_by_cluster.pkl")
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        sys.exit("serve.py needs os.fork(); use `python app.py` on this platform")
+
+    import app
+
+    store = load_store(args.store_dir, args.data, args.models)
+    app.attach_store(store)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(1024)
+    print(f"Mapped {len(store)} players ({store.nbytes / 1024:.0f} KB) from {store.path}; "
+          f"starting {args.workers} workers on {args.host}:{args.port}")
+
+    signal.signal(signal.SIGTERM, _raise_stop)
+    signal.signal(signal.SIGINT, _raise_stop)
+    workers = set()
+    try:
+        for _ in range(args.workers):
+            workers.add(spawn(sock, args.threads))
+        while True:
+            pid, status = os.wait()
+            workers.discard(pid)
+            print(f"Worker {pid} exited ({status}); restarting")
+            workers.add(spawn(sock, args.threads))
+    except _Stop:
+        pass
+    finally:
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in workers:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        sock.close()
+        print("Stopped")
+
+
+if __name__ == "__main__":
+    main()
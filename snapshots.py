@@ -0,0 +1,277 @@
+"""
+Static snapshots of every read-only view, for serving without Python.
+
+Everything the Streamlit tabs and Flask player routes show for 2019-2025 is a
+pure function of final_df_transform.csv and models_by_cluster.pkl. This
+precomputes those views as gzipped JSON:
+
+  player/<slug>        rating, in-position rank and card fields for one player
+  draft_class/<year>   drafted players ordered by pick (Draft Class tab)
+  rankings/<year>      top LEADERBOARD_SIZE players by rating (Player Rankings tab)
+  lottery_picks        picks 1-14 by rating (Rankings & Analysis tab)
+  draft_steals         picks 15+ rated >= 0.3 by rating
+  search_index         [name, lower-cased name, year, team, player view] rows for
+                       client-side autocomplete
+
+Files are named <view>.<content hash>.json.gz, so they can be cached forever;
+manifest.json maps each view to its current file. Every view also records a
+hash of just the inputs it depends on (its rows of the player table and the
+models it uses); a rebuild skips views whose input hash is unchanged and
+deletes files no longer referenced.
+
+Usage:
+    python snapshots.py                       # -> snapshots/
+    python snapshots.py --out site/data --force
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from player_scoring import (
+    COMPARISON_YEARS, RATING_YEARS, draft_class, draft_steals, in_years, lottery_picks,
+    player_rankings, rated_players, rating_tier, score_players,
+)
+
+# Bump when view contents change shape, to force a full rebuild
+SNAPSHOT_VERSION = 1
+MANIFEST = "manifest.json"
+LEADERBOARD_SIZE = 100
+PLAYER_FIELDS = ["Name", "Team", "Year", "Pick", "Height", "BPM", "REB", "Ast", "Blk", "PlayStyleCluster"]
+
+
+# ======================
+# Hashing
+# ======================
+
+def _digest(*parts):
+    h = hashlib.sha256(str(SNAPSHOT_VERSION).encode())
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode())
+    return h.hexdigest()[:16]
+
+
+def frame_hash(df):
+    """Content hash of a frame's rows (index included)"""
+    return _digest(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes(), list(df.columns))
+
+
+def model_hashes(models_by_cluster):
+    """Per-cluster hash of features, scaler and coefficients"""
+    out = {}
+    for cluster, model_data in models_by_cluster.items():
+        scaler = model_data["scaler"]
+        out[cluster] = _digest(
+            json.dumps(list(model_data["features"])),
+            np.asarray(scaler.mean_, dtype=float).tobytes(),
+            np.asarray(scaler.scale_, dtype=float).tobytes(),
+            np.asarray(model_data["avg_coefs"], dtype=float).tobytes(),
+        )
+    return out
+
+
+def feature_columns(models_by_cluster):
+    cols = []
+    for model_data in models_by_cluster.values():
+        cols.extend(f for f in model_data["features"] if f not in cols)
+    return cols
+
+
+def slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", str(name).lower()).strip("-") or "player"
+
+
+# ======================
+# Views
+# ======================
+
+def _records(df):
+    """JSON-ready records (NaN -> null, numpy -> Python)"""
+    return json.loads(df.to_json(orient="records"))
+
+
+def _position_ranks(df, models_by_cluster):
+    """In-position rank of every name, as position_rank() computes it, in one sort per cluster"""
+    ranks, totals = {}, {}
+    for cluster in models_by_cluster:
+        group = df[(df["PlayStyleCluster"] == cluster) & in_years(df, COMPARISON_YEARS)]
+        preds = score_players(group, {cluster: models_by_cluster[cluster]})
+        names = group["Name"].reindex(preds.sort_values(ascending=False).index).to_numpy()
+        first = {}
+        for i, name in enumerate(names, 1):
+            first.setdefault(name, i)
+        ranks[cluster] = first
+        totals[cluster] = int(len(group))
+    return ranks, totals
+
+
+def plan_views(df, models_by_cluster):
+    """
+    (key, input hash, build()) for every view; build() returns the JSON payload.
+
+    Input hashes cover only the columns and rows each view reads: editing a
+    2023 player's BPM rebuilds that player and the 2023 views; editing a model
+    feature also rebuilds their position group (ranks) and the cross-year lists.
+    """
+    model_hash = model_hashes(models_by_cluster)
+    all_models = _digest(*sorted(model_hash.values()))
+    features = feature_columns(models_by_cluster)
+    view_cols = [c for c in PLAYER_FIELDS if c in df.columns] + [f for f in features if f not in PLAYER_FIELDS]
+    rank_cols = ["Name", "Year", "PlayStyleCluster"]
+
+    cluster_hash = {}
+    for c, model_data in models_by_cluster.items():
+        group = df[(df["PlayStyleCluster"] == c) & in_years(df, COMPARISON_YEARS)]
+        cluster_hash[c] = _digest(frame_hash(group[rank_cols + list(model_data["features"])]), model_hash[c])
+    rated = df[in_years(df, RATING_YEARS) & df["PlayStyleCluster"].isin(list(models_by_cluster))]
+    rated_hash = _digest(frame_hash(rated[view_cols]), all_models)
+    row_hash = pd.util.hash_pandas_object(rated[view_cols], index=True)
+    state = {}
+
+    def ranks():
+        if "ranks" not in state:
+            state["ranks"] = _position_ranks(df, models_by_cluster)
+        return state["ranks"]
+
+    def scores():
+        if "scores" not in state:
+            state["scores"] = score_players(rated, models_by_cluster)
+        return state["scores"]
+
+    def all_preds():
+        if "all_preds" not in state:
+            state["all_preds"] = rated_players(df, models_by_cluster)
+        return state["all_preds"]
+
+    views = []
+    keys = {}
+    used = set()
+    for idx, row in rated.iterrows():
+        key = f"player/{slug(row['Name'])}"
+        if key in used:
+            key = f"{key}-{idx}"
+        keys[idx] = key
+        used.add(key)
+
+        def build_player(idx=idx, row=row):
+            cluster = row["PlayStyleCluster"]
+            rating = float(scores()[idx])
+            color, bg_color, badge = rating_tier(rating)
+            rank_by_name, totals = ranks()
+            return {
+                **_records(row[[c for c in PLAYER_FIELDS if c in row.index]].to_frame().T)[0],
+                "rating": rating,
+                "badge": badge, "color": color, "bg_color": bg_color,
+                "position_rank": rank_by_name[cluster].get(row["Name"]),
+                "position_total": totals[cluster],
+            }
+
+        views.append((key, _digest(int(row_hash[idx]), cluster_hash[row["PlayStyleCluster"]]), build_player))
+
+    lo, hi = RATING_YEARS
+    for year in range(lo, hi + 1):
+        year_hash = _digest(frame_hash(df.loc[df["Year"] == year, view_cols]), all_models)
+        views.append((f"draft_class/{2000 + year}", year_hash,
+                      lambda year=year: _records(draft_class(df, models_by_cluster, year))))
+        views.append((f"rankings/{2000 + year}", year_hash,
+                      lambda year=year: _records(
+                          player_rankings(df, models_by_cluster, year).head(LEADERBOARD_SIZE))))
+
+    views.append(("lottery_picks", rated_hash, lambda: _records(lottery_picks(all_preds()))))
+    views.append(("draft_steals", rated_hash, lambda: _records(draft_steals(all_preds(), min_rating=0.3))))
+    views.append(("search_index", _digest(frame_hash(rated[["Name", "Year", "Team"]]), sorted(keys.values())),
+                  lambda: [[str(r["Name"]), str(r["Name"]).lower(), int(r["Year"]), str(r["Team"]), keys[i]]
+                           for i, r in rated.iterrows()]))
+    return views
+
+
+# ======================
+# Build
+# ======================
+
+def _write(out_dir, key, payload):
+    """gzip'd JSON named by content hash; returns the relative path"""
+    body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    rel = f"{key}.{hashlib.sha256(body).hexdigest()[:12]}.json.gz"
+    path = os.path.join(out_dir, rel)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            # mtime=0 keeps the gzip bytes identical for identical content
+            f.write(gzip.compress(body, compresslevel=9, mtime=0))
+    return rel
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+        return manifest if manifest.get("version") == SNAPSHOT_VERSION else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def build_snapshots(df, models_by_cluster, out_dir="snapshots", force=False, verbose=True):
+    """
+    Build or refresh every view under out_dir.
+
+    Returns:
+        dict: The new manifest (views: key -> {file, inputs}).
+    """
+    start = time.perf_counter()
+    previous = {} if force else load_manifest(out_dir).get("views", {})
+    views = {}
+    built = 0
+    for key, inputs, build in plan_views(df, models_by_cluster):
+        old = previous.get(key)
+        if old is not None and old["inputs"] == inputs and os.path.exists(os.path.join(out_dir, old["file"])):
+            views[key] = old
+            continue
+        views[key] = {"file": _write(out_dir, key, build()), "inputs": inputs}
+        built += 1
+
+    manifest = {"version": SNAPSHOT_VERSION, "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "views": views}
+    tmp = os.path.join(out_dir, MANIFEST + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+
+    # Drop snapshot files nothing refers to any more
+    keep = {v["file"] for v in views.values()}
+    removed = 0
+    for root, _, files in os.walk(out_dir):
+        for name in files:
+            rel = os.path.relpath(os.path.join(root, name), out_dir).replace(os.sep, "/")
+            if rel.endswith(".json.gz") and rel not in keep:
+                os.remove(os.path.join(root, name))
+                removed += 1
+
+    if verbose:
+        print(f"{len(views)} views: {built} built, {len(views) - built} unchanged, {removed} stale files removed "
+              f"({time.perf_counter() - start:.2f}s) -> {out_dir}")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build static JSON snapshots of the app's views")
+    parser.add_argument("--data", default="final_df_transform.csv")
+    parser.add_argument("--models", default="models_by_cluster.pkl")
+    parser.add_argument("--out", default="snapshots")
+    parser.add_argument("--force", action="store_true", help="Rebuild every view")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.data)
+    with open(args.models, "rb") as f:
+        models_by_cluster = pickle.load(f)
+    build_snapshots(df, models_by_cluster, args.out, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Cold-start report for the servers: where startup time goes, checked against a budget.
+
+REPORT records each startup step as a phase of one kind:
+
+  import   module imports (flask, numpy, pandas, ...)
+  load     artifact reads (final_df_transform.csv, the model pickle, mapping the store)
+  index    building serving structures (the player store and its score table)
+
+app.py, serve.py and asgi_app.py wrap their startup steps in
+REPORT.phase(kind, name) and call REPORT.mark_ready() once predictions can
+be served; /readyz returns REPORT.as_dict(). Phases don't nest.
+
+Time-to-ready is measured from process start (/proc/self/stat), so it
+includes interpreter startup. check() compares it with the budget:
+
+  NCAAB_STARTUP_BUDGET   seconds (default 1.0)
+
+The fast path (serve.load_store() mapping a current prebuilt store) imports
+neither pandas nor scikit-learn; heavy_modules() lists which of them a
+process has loaded so far.
+
+Usage:
+    python startup.py                   # cold-start app.py from the store, print the report
+    python startup.py --plain           # as `python app.py` loads (CSV + pickle)
+    python startup.py --json --budget 0.5 --forbid pandas,sklearn
+"""
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import sys
+import time
+
+BUDGET_ENV = "NCAAB_STARTUP_BUDGET"
+DEFAULT_BUDGET = 1.0
+PHASE_KINDS = ("import", "load", "index")
+HEAVY_MODULES = ("pandas", "sklearn", "scipy", "pyarrow", "catboost")
+
+
+def process_age():
+    """Seconds since this process started, from /proc; None where that isn't available"""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesized command name; starttime is field 22
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - start_ticks / os.sysconf("SC_CLK_TCK"), 0.0)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def budget():
+    """NCAAB_STARTUP_BUDGET in seconds"""
+    return float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET))
+
+
+def heavy_modules():
+    """Which of HEAVY_MODULES this process has imported"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+class StartupReport:
+    """Timed startup phases and the time the process became ready"""
+
+    def __init__(self):
+        # perf_counter() value at process start, so elapsed() has its resolution
+        self.origin = time.perf_counter() - (process_age() or 0.0)
+        self.phases = []
+        self.ready_at = None
+
+    def elapsed(self):
+        """Seconds since process start"""
+        return time.perf_counter() - self.origin
+
+    @contextlib.contextmanager
+    def phase(self, kind, name):
+        if kind not in PHASE_KINDS:
+            raise ValueError(f"phase kind must be one of {', '.join(PHASE_KINDS)}")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({"kind": kind, "name": name, "seconds": time.perf_counter() - start})
+
+    def mark_ready(self):
+        """Record time-to-ready (first call only; reloads don't move it)"""
+        if self.ready_at is None:
+            self.ready_at = self.elapsed()
+
+    @property
+    def ready(self):
+        return self.ready_at is not None
+
+    def totals(self):
+        """{kind: seconds} over all phases"""
+        out = dict.fromkeys(PHASE_KINDS, 0.0)
+        for phase in self.phases:
+            out[phase["kind"]] += phase["seconds"]
+        return out
+
+    def as_dict(self):
+        return {
+            "ready": self.ready,
+            "time_to_ready": self.ready_at,
+            "uptime": self.elapsed(),
+            "budget": budget(),
+            "totals": self.totals(),
+            "phases": list(self.phases),
+            "heavy_modules": heavy_modules(),
+        }
+
+    def check(self, limit=None, forbid=()):
+        """
+        Problems with this startup, or [] if it is within budget.
+
+        Parameters:
+            limit (float): Time-to-ready budget in seconds (default: budget()).
+            forbid (iterable): Modules that must not have been imported.
+
+        Returns:
+            list: One message per problem.
+        """
+        limit = budget() if limit is None else limit
+        problems = []
+        if not self.ready:
+            problems.append("not ready")
+        elif self.ready_at > limit:
+            slowest = max(self.phases, key=lambda p: p["seconds"], default=None)
+            detail = f"; slowest phase {slowest['kind']} {slowest['name']} {slowest['seconds']:.3f}s" if slowest else ""
+            problems.append(f"time to ready {self.ready_at:.3f}s is over the {limit:g}s budget{detail}")
+        loaded = [name for name in forbid if name in sys.modules]
+        if loaded:
+            problems.append(f"imported {', '.join(loaded)}")
+        return problems
+
+
+REPORT = StartupReport()
+
+
+def lazy_import(name, report=REPORT):
+    """importlib.import_module(name), recorded as an import phase the first time"""
+    if name in sys.modules:
+        return sys.modules[name]
+    with report.phase("import", name):
+        return importlib.import_module(name)
+
+
+# ======================
+# CLI
+# ======================
+
+def format_report(report):
+    lines = []
+    for phase in report["phases"]:
+        lines.append(f"  {phase['kind']:<7} {phase['name']:<32} {phase['seconds'] * 1000:8.1f} ms")
+    totals = ", ".join(f"{kind} {seconds * 1000:.0f} ms" for kind, seconds in report["totals"].items())
+    lines.append(f"  total: {totals}")
+    ready = f"{report['time_to_ready']:.3f}s" if report["ready"] else "not ready"
+    lines.append(f"  time to ready: {ready} (budget {report['budget']:g}s); "
+                 f"heavy modules: {', '.join(report['heavy_modules']) or 'none'}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start app.py and report where the time goes")
+    parser.add_argument("--plain", action="store_true", help="Load the CSV and pickle like `python app.py`")
+    parser.add_argument("--store-dir", default=None, help="Store directory (default: the shared versioned one)")
+    parser.add_argument("--budget", type=float, default=None, help=f"Seconds (default ${BUDGET_ENV} or {DEFAULT_BUDGET})")
+    parser.add_argument("--forbid", default="", help="Comma-separated modules that must not be imported")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    # Run as a script this module is __main__; app.py records into the imported `startup`
+    import startup
+
+    # Keep stdout for the report; app.py prints its load progress
+    with contextlib.redirect_stdout(sys.stderr):
+        import app
+        if args.plain:
+            app.load_data()
+        else:
+            import serve
+            app.attach_store(serve.load_store(args.store_dir))
+
+    report = startup.REPORT
+    problems = report.check(args.budget, [m.strip() for m in args.forbid.split(",") if m.strip()])
+    out = {**report.as_dict(), "problems": problems}
+    if args.budget is not None:
+        out["budget"] = args.budget
+    print(json.dumps(out, indent=2) if args.json else format_report(out))
+    for problem in problems:
+        print(f"Startup check failed: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+Opt-in timing and profiling for streamlit_app.py reruns.
+
+Enable with the NCAAB_PROFILE environment variable or the ?profile= query
+parameter:
+
+    NCAAB_PROFILE=1 streamlit run streamlit_app.py          # section timings
+    http://localhost:8501/?profile=1                         # same, one session
+    http://localhost:8501/?profile=cprofile                  # + cProfile of the rerun
+    http://localhost:8501/?profile=pyinstrument              # + pyinstrument of the rerun
+
+pyinstrument is optional (requirements-optional.txt); without it
+?profile=pyinstrument falls back to section timings and says so in the panel.
+
+Every tab is a section. Time spent inside profiler.compute() blocks (scoring,
+filtering, ranking) is reported as compute; the rest of the section
+(markdown/widget calls) as render. Per section it also counts rows scored by
+player_scoring.predict_proba and DataFrame.copy() calls. Results show in a
+collapsed "Diagnostics" expander and are appended to streamlit_profile.jsonl
+(NCAAB_PROFILE_LOG to change). cProfile/pyinstrument output is saved next to
+the log.
+
+When profiling is off every hook is a no-op context manager.
+
+Use the profiler as a context manager around the whole script body, so it is
+finished even when the rerun ends early (st.stop() and st.rerun() raise, as
+do errors) and no profiler or counters outlive their rerun:
+
+    with RerunProfiler(profile_mode(st.query_params)) as profiler:
+        ...
+        profiler.finish()
+        profiler.render_panel(st)
+"""
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+
+import pandas as pd
+
+import player_scoring
+
+ENV_VAR = "NCAAB_PROFILE"
+LOG_ENV_VAR = "NCAAB_PROFILE_LOG"
+DEFAULT_LOG = "streamlit_profile.jsonl"
+PROFILERS = ("cprofile", "pyinstrument")
+OFF_VALUES = ("", "0", "false", "off", "no")
+
+# Streamlit runs each session's script in its own thread; counters find the
+# profiler of the rerun they belong to through this
+_active = threading.local()
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+def profile_mode(query_params=None):
+    """None (off), 'timing', 'cprofile' or 'pyinstrument' from ?profile= or NCAAB_PROFILE"""
+    value = query_params.get("profile") if query_params is not None else None
+    if value is None:
+        value = os.environ.get(ENV_VAR)
+    if value is None or str(value).strip().lower() in OFF_VALUES:
+        return None
+    value = str(value).strip().lower()
+    return value if value in PROFILERS else "timing"
+
+
+def _count(key, n=1):
+    profiler = getattr(_active, "profiler", None)
+    if profiler is not None:
+        profiler.count(key, n)
+
+
+def _install_hooks():
+    """Wrap predict_proba and DataFrame.copy once per process to feed the counters"""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        predict_proba = player_scoring.predict_proba
+        copy = pd.DataFrame.copy
+
+        @functools.wraps(predict_proba)
+        def counted_predict_proba(rows, model_data):
+            out = predict_proba(rows, model_data)
+            _count("rows_scored", len(out))
+            return out
+
+        @functools.wraps(copy)
+        def counted_copy(self, *args, **kwargs):
+            _count("df_copies")
+            return copy(self, *args, **kwargs)
+
+        player_scoring.predict_proba = counted_predict_proba
+        pd.DataFrame.copy = counted_copy
+        _hooks_installed = True
+
+
+class RerunProfiler:
+    """Collects section timings and counters for one script rerun"""
+
+    def __init__(self, mode, log_path=None):
+        self.mode = mode
+        self.enabled = mode is not None
+        self.log_path = log_path or os.environ.get(LOG_ENV_VAR, DEFAULT_LOG)
+        self.sections = {}
+        self.current = None
+        self.profile_text = None
+        self.profile_path = None
+        self.record = None
+        self.warning = None
+        self._profiler = None
+
+    def start(self):
+        if not self.enabled:
+            return self
+        # Import the optional profiler before attaching anything to the thread
+        if self.mode == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                self.mode = "timing"
+                self.warning = "pyinstrument is not installed (pip install pyinstrument); showing timings only."
+            else:
+                self._profiler = Profiler()
+        elif self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+        _install_hooks()
+        _active.profiler = self
+        if self.mode == "cprofile":
+            self._profiler.enable()
+        elif self.mode == "pyinstrument":
+            self._profiler.start()
+        self.started = time.perf_counter()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+        return False
+
+    def _stats(self, name):
+        if name not in self.sections:
+            self.sections[name] = {"total_s": 0.0, "compute_s": 0.0, "rows_scored": 0, "df_copies": 0}
+        return self.sections[name]
+
+    def count(self, key, n=1):
+        self._stats(self.current or "(outside tabs)")[key] += n
+
+    @contextlib.contextmanager
+    def _timed(self, name, key):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stats(name)[key] += time.perf_counter() - start
+
+    def section(self, name):
+        """Time a whole tab (or other top-level block)"""
+        if not self.enabled:
+            return contextlib.nullcontext()
+
+        @contextlib.contextmanager
+        def scope():
+            outer, self.current = self.current, name
+            try:
+                with self._timed(name, "total_s"):
+                    yield
+            finally:
+                self.current = outer
+
+        return scope()
+
+    def compute(self):
+        """Time data work inside the current section; the rest counts as render"""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed(self.current or "(outside tabs)", "compute_s")
+
+    def finish(self):
+        """Stop profiling, append the record to the JSONL log and return it (once; later calls return it again)"""
+        if not self.enabled or self.record is not None:
+            return self.record
+        total = time.perf_counter() - self.started
+        _active.profiler = None
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        log_dir = os.path.dirname(os.path.abspath(self.log_path))
+
+        if self.mode == "cprofile":
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(30)
+            self.profile_text = out.getvalue()
+            self.profile_path = os.path.join(log_dir, f"streamlit_rerun_{stamp}.prof")
+            self._profiler.dump_stats(self.profile_path)
+        elif self.mode == "pyinstrument":
+            self._profiler.stop()
+            self.profile_text = self._profiler.output_text(unicode=False, color=False)
+            self.profile_path = os.path.join(log_dir, f"streamlit_rerun_{stamp}.html")
+            with open(self.profile_path, "w") as f:
+                f.write(self._profiler.output_html())
+
+        self.record = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "mode": self.mode,
+            "total_s": total,
+            "sections": {
+                name: {**stats, "render_s": stats["total_s"] - stats["compute_s"]}
+                for name, stats in self.sections.items()
+            },
+            "profile_path": self.profile_path,
+            "warning": self.warning,
+        }
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(self.record) + "\n")
+        return self.record
+
+    def table(self):
+        """Per-section timings (ms) and counters as a DataFrame"""
+        rows = [{
+            "Section": name,
+            "Compute ms": stats["compute_s"] * 1000,
+            "Render ms": stats["render_s"] * 1000,
+            "Total ms": stats["total_s"] * 1000,
+            "Rows scored": stats["rows_scored"],
+            "DataFrame copies": stats["df_copies"],
+        } for name, stats in self.record["sections"].items()]
+        return pd.DataFrame(rows)
+
+    def render_panel(self, st):
+        """Collapsed diagnostics expander; call after finish()"""
+        if not self.enabled:
+            return
+        with st.expander("⏱️ Diagnostics", expanded=False):
+            if self.warning:
+                st.warning(self.warning)
+            st.write(f"Rerun took **{self.record['total_s'] * 1000:.0f} ms** (mode: {self.mode}); "
+                     f"logged to `{self.log_path}`")
+            st.dataframe(self.table().round(1), hide_index=True)
+            if self.profile_text:
+                st.write(f"Full profile saved to `{self.profile_path}`")
+                st.code(self.profile_text, language="text")
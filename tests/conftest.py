@@ -0,0 +1,10 @@
+"""
+Unit tests. Run from the repository root:
+
+    pytest tests
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
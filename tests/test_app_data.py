@@ -0,0 +1,16 @@
+import app
+import metrics
+
+
+def test_index_counts_reused_data_as_hits(monkeypatch):
+    monkeypatch.setattr(app, "player_store", None)
+    monkeypatch.setattr(app, "final_df_transform", None)
+    monkeypatch.setattr(app, "models_by_cluster", None)
+    before = {result: metrics.ARTIFACT_LOADS.get("final_df_transform", result) for result in ("hit", "miss")}
+
+    client = app.app.test_client()
+    for _ in range(3):
+        assert client.get("/").status_code == 200
+
+    assert metrics.ARTIFACT_LOADS.get("final_df_transform", "miss") - before["miss"] == 1
+    assert metrics.ARTIFACT_LOADS.get("final_df_transform", "hit") - before["hit"] == 2
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+catboost = pytest.importorskip("catboost")
+
+import app  # noqa: E402
+
+
+@pytest.fixture
+def nfl_model(monkeypatch):
+    """A tiny model on epa_diff + def_epa_diff + is_playoff, and a team table with only team_epa"""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"epa_diff": rng.normal(size=60), "def_epa_diff": rng.normal(size=60),
+                      "is_playoff": rng.integers(0, 2, 60)})
+    model = catboost.CatBoostRegressor(iterations=5, verbose=0, cat_features=["is_playoff"],
+                                       allow_writing_files=False)
+    model.fit(X, X["epa_diff"] * 7)
+    rows = {(2024, team): (np.array([1]), np.array([[0.1 * i]])) for i, team in enumerate(["BUF", "KC"])}
+    monkeypatch.setattr(app, "nfl_model", model)
+    monkeypatch.setattr(app, "nfl_team_index", {"columns": ["team_epa"], "rows": rows})
+    return model
+
+
+def test_missing_model_features_are_an_error(nfl_model):
+    game = {"season": 2024, "week": 2, "home_team": "BUF", "away_team": "KC"}
+    result, = app.predict_nfl_games([game])
+    assert result["success"] is False
+    assert "def_epa_diff" in result["error"] and "pred_point_diff" not in result
+
+
+def test_complete_features_predict(nfl_model, monkeypatch):
+    columns = ["team_epa", "def_epa"]
+    rows = {(2024, team): (np.array([1]), np.array([[0.1 * i, 0.2]])) for i, team in enumerate(["BUF", "KC"])}
+    monkeypatch.setattr(app, "nfl_team_index", {"columns": columns, "rows": rows})
+    game = {"season": 2024, "week": 2, "home_team": "BUF", "away_team": "KC"}
+    result, = app.predict_nfl_games([game])
+    assert result["success"] is True and np.isfinite(result["pred_point_diff"])
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import ncaa_scraper  # noqa: E402
+
+PATH = "/cbb/schools/duke/2025-schedule.html"
+RATE = 20.0     # tokens per second: attempts at least 50 ms apart
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Retries wait only for the token bucket, so the spacing measured is the limiter's"""
+    monkeypatch.setattr(ncaa_scraper, "backoff_delay", lambda attempt, retry_after=None: 0.0)
+
+
+def fetch(fail_first, max_retries):
+    async def run():
+        async with ncaa_scraper.canned_site({PATH: "<html>ok</html>"}, fail_first={PATH: fail_first}) as site:
+            limiter = ncaa_scraper.TokenBucket(RATE)
+            async with ncaa_scraper.make_session() as session:
+                try:
+                    text = await ncaa_scraper.fetch_text(session, site + PATH, limiter, asyncio.Semaphore(4),
+                                                         max_retries=max_retries)
+                except ncaa_scraper.ScrapeError as e:
+                    text = e
+            return text, site.log, limiter.acquired
+
+    return asyncio.run(run())
+
+
+def test_retries_until_success_within_rate_limit():
+    text, log, acquired = fetch(fail_first=2, max_retries=4)
+    assert text == "<html>ok</html>"
+    # Two 429s, then the page; every attempt took a token
+    assert [path for _, path in log] == [PATH] * 3
+    assert acquired == 3
+    gaps = [b - a for (a, _), (b, _) in zip(log, log[1:])]
+    assert min(gaps) >= 1 / RATE * 0.9
+
+
+def test_gives_up_after_max_retries():
+    error, log, acquired = fetch(fail_first=10, max_retries=2)
+    assert isinstance(error, ncaa_scraper.ScrapeError)
+    assert "after 3 attempts" in str(error)
+    assert len(log) == acquired == 3
+
+
+def test_parse_teamlist_reads_only_the_school_stats_table():
+    html = """<html><body>
+    <table id="other"><tr><td><a href="/cbb/schools/kansas/2025.html">Kansas</a></td></tr></table>
+    <table id="basic_school_stats">
+      <thead><tr><th>School</th></tr></thead>
+      <tr><td><a href="/cbb/schools/duke/men/2025.html">Duke</a></td></tr>
+      <tr><td><a href="/cbb/schools/north-carolina/men/2025.html"> North Carolina </a></td></tr>
+      <tr><td><a href="/cbb/seasons/men/2025.html">2025</a></td></tr>
+    </table></body></html>"""
+    assert ncaa_scraper.parse_teamlist(html) == {"Duke": "duke", "North Carolina": "north-carolina"}
+    assert ncaa_scraper.parse_teamlist("") == {}
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+import nfl_schema
+
+
+@pytest.fixture(autouse=True)
+def fresh_player_dictionary(monkeypatch):
+    monkeypatch.setattr(nfl_schema, "_player_dtype", pd.CategoricalDtype([]))
+    monkeypatch.setattr(nfl_schema, "stage_reports", [])
+
+
+def stage_output(names, team):
+    return nfl_schema.enforce_schema(
+        pd.DataFrame({"full_name": names, "team": team, "week": range(1, len(names) + 1)}),
+        verbose=False)
+
+
+def test_concat_stage_outputs_stays_categorical():
+    first = stage_output(["Josh Allen", "Stefon Diggs"], "BUF")
+    # Casting this stage grows the shared dictionary after `first` was cast
+    second = stage_output(["Patrick Mahomes", "Josh Allen"], "KC")
+    assert first["full_name"].dtype != second["full_name"].dtype
+
+    both = nfl_schema.concat_stages([first, second], ignore_index=True)
+    assert both["full_name"].dtype == nfl_schema.player_dtype()
+    assert both["full_name"].tolist() == ["Josh Allen", "Stefon Diggs", "Patrick Mahomes", "Josh Allen"]
+    assert isinstance(both["team"].dtype, pd.CategoricalDtype)
+
+
+def test_growing_dictionary_keeps_existing_codes():
+    first = stage_output(["Stefon Diggs", "Josh Allen"], "BUF")
+    codes = first["full_name"].cat.codes.tolist()
+    stage_output(["Aaron Donald"], "LA")
+    aligned = nfl_schema.align_players(first)
+    assert aligned["full_name"].cat.codes.tolist() == codes
+    assert aligned["full_name"].dtype == nfl_schema.player_dtype()
+
+
+def test_registered_up_front_shares_one_dtype():
+    nfl_schema.register_frames(pd.DataFrame({"full_name": ["A", "B", "C"]}))
+    first = stage_output(["A", "B"], "BUF")
+    second = stage_output(["C"], "KC")
+    assert first["full_name"].dtype == second["full_name"].dtype
+    assert isinstance(pd.concat([first, second])["full_name"].dtype, pd.CategoricalDtype)
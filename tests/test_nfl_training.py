@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("catboost")
+
+import nfl_training  # noqa: E402
+
+
+def synthetic_games(n=400, seed=0):
+    """Every default spec's features over the train and eval seasons"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "season": rng.choice([2021, 2022, 2023, nfl_training.EVAL_SEASON], n),
+        "is_playoff": rng.integers(0, 2, n),
+    })
+    for spec in nfl_training.default_model_specs():
+        for feature in spec["features"]:
+            if feature not in df.columns:
+                df[feature] = rng.normal(size=n)
+    df[nfl_training.TARGET] = 10 * df["epa_diff"] + rng.normal(size=n)
+    return df
+
+
+@pytest.mark.parametrize("name", ["point_diff", "qb_point_diff"])
+def test_train_default_spec(tmp_path, name):
+    spec = next(s for s in nfl_training.default_model_specs() if s["name"] == name)
+    assert "is_playoff" in spec["features"]
+    params = {**nfl_training.MODEL_PARAMS, "iterations": 20}
+
+    results = nfl_training.train_models(synthetic_games(), specs=[spec], params=params,
+                                        thread_budget=1, cache_dir=str(tmp_path))
+    meta = results[name]
+    assert np.isfinite(meta["eval_mae"]) and meta["eval_rmse"] >= meta["eval_mae"]
+    assert 0.0 <= meta["eval_direction_accuracy"] <= 1.0
+
+    # Second run loads the cached quantized pools and reuses the model
+    again = nfl_training.train_models(synthetic_games(), specs=[spec], params=params,
+                                      thread_budget=1, cache_dir=str(tmp_path))
+    assert again[name]["eval_mae"] == meta["eval_mae"]
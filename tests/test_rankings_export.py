@@ -0,0 +1,31 @@
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+import rankings_export  # noqa: E402
+from conftest import ROOT  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def artifacts():
+    df = pd.read_csv(os.path.join(ROOT, "final_df_transform.csv"))
+    with open(os.path.join(ROOT, "models_by_cluster.pkl"), "rb") as f:
+        return df, pickle.load(f)
+
+
+def read_arrow(df, models, **query):
+    export = rankings_export.RankingsExport(df, models, **query)
+    return pa.ipc.open_stream(b"".join(rankings_export.encode_arrow(export))).read_all()
+
+
+def test_empty_arrow_export_has_the_same_schema(artifacts):
+    df, models = artifacts
+    full = read_arrow(df, models, contributions=True)
+    empty = read_arrow(df, models, contributions=True, picks=(1000, None))
+    assert full.num_rows == len(df) and empty.num_rows == 0
+    assert empty.schema.equals(full.schema)
+    assert empty.schema.field("Name").type != pa.float64()
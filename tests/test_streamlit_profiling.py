@@ -0,0 +1,18 @@
+import sys
+
+import streamlit_profiling
+
+
+def test_pyinstrument_missing_falls_back_to_timing(monkeypatch, tmp_path):
+    # A None entry makes `from pyinstrument import Profiler` raise ImportError
+    monkeypatch.setitem(sys.modules, "pyinstrument", None)
+    log = tmp_path / "profile.jsonl"
+
+    with streamlit_profiling.RerunProfiler("pyinstrument", log_path=str(log)) as profiler:
+        with profiler.section("About"):
+            pass
+
+    assert profiler.mode == "timing" and "pyinstrument" in profiler.warning
+    assert profiler.record["warning"] == profiler.warning and "About" in profiler.record["sections"]
+    assert log.read_text().count("\n") == 1
+    assert getattr(streamlit_profiling._active, "profiler", None) is None